@@ -0,0 +1,356 @@
+"""
+Write-behind audit log sink.
+
+crud.create_audit_log enqueues entries on a bounded in-process queue instead
+of committing each one. A flusher thread writes them with one bulk INSERT per
+batch, when AUDIT_FLUSH_BATCH_SIZE entries are waiting or
+AUDIT_FLUSH_INTERVAL_SECONDS after the first one arrived. A failed batch is
+retried until it commits, in order. When the queue is full the caller writes
+its entry inline. Readers that must see this worker's latest entries (a leave
+request's history) call ``flush`` to wait for the batches queued so far.
+
+Entries still queued at shutdown are spilled to an append-only JSON lines file
+in AUDIT_SPILL_DIR. With AUDIT_DURABLE on, every entry is appended to that
+file before it is queued and each committed batch is marked, so entries
+survive a crash too. Leftover files are replayed into audit_logs when a worker
+starts. Replay is at-least-once: a crash between a commit and its marker can
+write that batch twice.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.cache import VersionedCache
+from app.config import settings
+from app.database import SessionLocal
+from app.models import AuditLog
+from app.utils import get_current_time, normalize_audit_details, audit_detail_columns
+
+try:
+    import fcntl
+except ImportError:  # Windows: spill files are replayed without locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class AuditTotalsCache(VersionedCache):
+    """
+    Per-worker cache of audit log row counts, keyed by the log filters.
+
+    Counting a large audit_logs table is a full scan, so list totals are served
+    from here. Every key shares one scope: writers in this worker call
+    ``invalidate()``; writes from other workers and scripts show up once an
+    entry's TTL runs out.
+    """
+
+    def scope(self, key: tuple) -> None:
+        return None
+
+
+audit_totals = AuditTotalsCache(max_size=256, ttl_seconds=settings.AUDIT_TOTAL_CACHE_TTL_SECONDS)
+
+
+def write_audit_entries(entries: List[dict]) -> bool:
+    """
+    Bulk insert audit entries in one transaction.
+
+    Returns False if the database could not be written. Entries rejected by a
+    constraint (e.g. their user was deleted meanwhile) are logged and dropped.
+    """
+    if not entries:
+        return True
+    entries = [_prepare_entry(entry) for entry in entries]
+    db = SessionLocal()
+    try:
+        db.execute(insert(AuditLog), entries)
+        db.commit()
+        audit_totals.invalidate()
+        return True
+    except IntegrityError:
+        db.rollback()
+        for entry in entries:
+            try:
+                db.execute(insert(AuditLog), [entry])
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                logger.error(f"Dropping audit entry rejected by the database: {entry['action']} for user {entry['user_id']}")
+        audit_totals.invalidate()
+        return True
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception(f"Could not write {len(entries)} audit entries")
+        return False
+    finally:
+        db.close()
+
+
+def _prepare_entry(entry: dict) -> dict:
+    """Bring an entry (possibly from an older spill file with JSON text details) to the current columns."""
+    details = normalize_audit_details(entry.get("details"))
+    return {**entry, "details": details, **audit_detail_columns(details)}
+
+
+def _dump_entry(seq: int, entry: dict) -> str:
+    return json.dumps({"seq": seq, "entry": {**entry, "timestamp": entry["timestamp"].isoformat()}}) + "\n"
+
+
+def _load_entries(lines: List[str]) -> List[dict]:
+    """Parse a spill file, returning the entries that were never marked committed."""
+    entries = {}
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # Torn last line from a crash mid-write
+            continue
+        if "committed" in record:
+            entries = {seq: entry for seq, entry in entries.items() if seq > record["committed"]}
+        else:
+            entry = record["entry"]
+            entry["timestamp"] = datetime.fromisoformat(entry["timestamp"])
+            entries[record["seq"]] = entry
+    return [entries[seq] for seq in sorted(entries)]
+
+
+class AuditSink:
+    """Batches audit entries from request threads into bulk inserts on a daemon thread."""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, spill_dir: str, durable: bool):
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.spill_dir = Path(spill_dir)
+        self.durable = durable
+        self.owner = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._queue: "queue.Queue[Tuple[int, dict]]" = queue.Queue(maxsize=max(max_size, 1))
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._written = 0  # last seq committed to audit_logs
+        self._written_changed = threading.Condition(self._lock)
+        self._journal = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # set by submit and flush while the flusher fills a batch
+        self._flush_requested = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def spill_path(self) -> Path:
+        return self.spill_dir / f"audit-{self.owner}.jsonl"
+
+    def submit(self, user_id: int, action: str, description: str, details: Optional[dict] = None) -> Optional[dict]:
+        """
+        Queue an audit entry for the next batch.
+
+        Returns the queued entry, or None when the sink is not running or the
+        queue is full, in which case the caller should write the entry itself.
+        """
+        entry = {
+            "user_id": user_id,
+            "action": action,
+            "description": description,
+            "details": details,
+            **audit_detail_columns(details),
+            "timestamp": get_current_time()
+        }
+        with self._lock:
+            if not self.running or self._queue.full():
+                return None
+            self._seq += 1
+            if self._journal is not None:
+                self._journal.write(_dump_entry(self._seq, entry))
+                self._journal.flush()
+            self._queue.put_nowait((self._seq, entry))
+        self._wake.set()
+        return entry
+
+    def _next_batch(self) -> List[Tuple[int, dict]]:
+        """Wait for a batch that is full, whose first entry is flush_interval old, or that a reader flushes."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            if self._flush_requested.is_set():
+                self._flush_requested.clear()
+                # Entries queued before the flush was requested are all in the queue by now
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wake.wait(remaining)
+            self._wake.clear()
+        return batch
+
+    def _drain(self) -> List[Tuple[int, dict]]:
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _committed(self, last_seq: int) -> None:
+        """Mark entries up to `last_seq` as written; truncate the journal once nothing is pending."""
+        with self._lock:
+            self._written = last_seq
+            self._written_changed.notify_all()
+            if self._journal is None:
+                # Not durable, or stop() closed the journal while this batch was being written
+                return
+            if self._queue.empty():
+                self._journal.seek(0)
+                self._journal.truncate()
+            else:
+                self._journal.write(json.dumps({"committed": last_seq}) + "\n")
+            self._journal.flush()
+
+    def flush(self, timeout: float) -> bool:
+        """Wait until the entries queued so far are written; False if that takes longer than `timeout`."""
+        with self._lock:
+            if not self.running or self._written >= self._seq:
+                return True
+            target = self._seq
+            self._flush_requested.set()
+            self._wake.set()
+            return self._written_changed.wait_for(lambda: self._written >= target, timeout)
+
+    def _loop(self):
+        retry_delay = self.flush_interval
+        while not self._stop.is_set():
+            batch = self._next_batch()
+            # Retry in place so batches always commit in order
+            while batch and not write_audit_entries([entry for _, entry in batch]):
+                if self._stop.wait(retry_delay):
+                    self._spill(batch + self._drain())
+                    return
+                retry_delay = min(retry_delay * 2, 60)
+            if batch:
+                retry_delay = self.flush_interval
+                self._committed(batch[-1][0])
+
+        remaining = self._drain()
+        if write_audit_entries([entry for _, entry in remaining]):
+            if remaining:
+                self._committed(remaining[-1][0])
+        else:
+            self._spill(remaining)
+
+    def _spill(self, batch: List[Tuple[int, dict]]) -> None:
+        """Save entries that could not be written so the next worker start replays them."""
+        if not batch or self.durable:
+            # The journal already holds every uncommitted entry
+            return
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as spill_file:
+            for seq, entry in batch:
+                spill_file.write(_dump_entry(seq, entry))
+            spill_file.flush()
+            os.fsync(spill_file.fileno())
+        logger.warning(f"Spilled {len(batch)} audit entries to {self.spill_path}")
+
+    def replay(self) -> int:
+        """Write entries left in spill files by stopped or crashed workers; returns how many."""
+        if not self.spill_dir.is_dir():
+            return 0
+        replayed = 0
+        for path in sorted(self.spill_dir.glob("audit-*.jsonl")):
+            if path == self.spill_path:
+                continue
+            try:
+                spill_file = open(path, "r+", encoding="utf-8")
+            except FileNotFoundError:
+                continue
+            with spill_file:
+                if fcntl is not None:
+                    try:
+                        # Live workers hold a lock on their journal
+                        fcntl.flock(spill_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except OSError:
+                        continue
+                    if os.fstat(spill_file.fileno()).st_nlink == 0:
+                        # Another worker replayed and removed it while we waited
+                        continue
+                entries = _load_entries(spill_file.readlines())
+                for start in range(0, len(entries), self.batch_size):
+                    if not write_audit_entries(entries[start:start + self.batch_size]):
+                        logger.error(f"Could not replay {path}, leaving it for the next start")
+                        break
+                else:
+                    path.unlink()
+                    replayed += len(entries)
+        if replayed:
+            logger.info(f"Replayed {replayed} spilled audit entries")
+        return replayed
+
+    def start(self) -> None:
+        if self.running:
+            return
+        try:
+            self.replay()
+        except Exception:
+            logger.exception("Could not replay spilled audit entries")
+        if self.durable:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.spill_path, "a+", encoding="utf-8")
+            if fcntl is not None:
+                fcntl.flock(self._journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="audit-sink", daemon=True)
+        self._thread.start()
+        logger.info(f"Started audit sink (batch {self.batch_size}, every {self.flush_interval}s, durable={self.durable})")
+
+    def stop(self, timeout: float = 10) -> None:
+        """Flush what is queued, spilling it if the database is unavailable."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        # Anything queued after the flusher's last drain, or left while it is stuck writing.
+        # A flusher still stuck after the timeout finds the journal gone and skips its marker.
+        self._spill(self._drain())
+        if self._journal is not None:
+            with self._lock:
+                empty = self._journal.tell() == 0
+                self._journal.close()
+                self._journal = None
+            if empty:
+                self.spill_path.unlink(missing_ok=True)
+
+
+audit_sink = AuditSink(
+    max_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    batch_size=settings.AUDIT_FLUSH_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    spill_dir=settings.AUDIT_SPILL_DIR,
+    durable=settings.AUDIT_DURABLE,
+)
+atexit.register(audit_sink.stop)
@@ -1,29 +1,53 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.cache import VersionedCache
 from app.config import settings
-from app.database import get_db
+from app.database import get_primary_read_db, get_async_db
+from app.hashing import password_hasher
 from app.models import User, UserRole
 from app.schemas import TokenData
 from app.utils import get_current_time
 
-# Password hashing (use pbkdf2_sha256 to avoid bcrypt backend issues)
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
 # JWT token scheme
 security = HTTPBearer()
 
+class UserCache(VersionedCache):
+    """Bounded, TTL'd in-process cache of authenticated users.
+
+    Entries are detached snapshots of the ``users`` row keyed by user id and
+    stamped with the user's version at load time. Any write to the row must
+    call ``invalidate`` which bumps the version, so a snapshot loaded before
+    the write can never be served after it.
+    """
+
+    def put(self, user: User, version: int) -> None:
+        """Store a snapshot of ``user`` if nothing changed since ``version`` was read."""
+        if not self.enabled:
+            return
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        super().put(user.id, snapshot, version)
+
+user_cache = UserCache(max_size=settings.USER_CACHE_MAX_SIZE, ttl_seconds=settings.USER_CACHE_TTL_SECONDS)
+
+def invalidate_user(user_id: int) -> None:
+    """Drop any cached identity for a user whose row has changed."""
+    user_cache.invalidate(user_id)
+
+# Password hashing (pbkdf2_sha256, offloaded to the hashing process pool)
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token with IST timezone."""
@@ -52,31 +76,70 @@ def verify_token(token: str, credentials_exception):
         raise credentials_exception
     return token_data
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    """Get the current authenticated user."""
-    credentials_exception = HTTPException(
+def get_token_subject(authorization: Optional[str]) -> Optional[int]:
+    """Best-effort user id from an Authorization header, without raising or touching the database."""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        return int(payload.get("sub"))
+    except (JWTError, ValueError, TypeError):
+        return None
+
+def _credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+def _user_id_from_credentials(credentials: HTTPAuthorizationCredentials, credentials_exception) -> int:
     token = credentials.credentials
     token_data = verify_token(token, credentials_exception)
     
     # Convert user_id to int for database query
     try:
-        user_id = int(token_data.user_id)
+        return int(token_data.user_id)
     except (ValueError, TypeError):
         raise credentials_exception
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_primary_read_db)):
+    """Get the current authenticated user (always from the primary, so new users and role changes are seen at once)."""
+    credentials_exception = _credentials_exception()
+    user_id = _user_id_from_credentials(credentials, credentials_exception)
+    
+    # Serve from the identity cache when possible; merge(load=False) attaches
+    # a copy of the snapshot to this session without emitting a SELECT.
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return db.merge(cached, load=False)
     
+    version = user_cache.version(user_id)
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
     
+    user_cache.put(user, version)
     return user
 
-def get_current_admin_user(current_user: User = Depends(get_current_user)):
-    """Get the current user and verify they are an admin."""
+async def get_current_user_async(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
+    """Get the current authenticated user on an async session."""
+    credentials_exception = _credentials_exception()
+    user_id = _user_id_from_credentials(credentials, credentials_exception)
+    
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return await db.merge(cached, load=False)
+    
+    version = user_cache.version(user_id)
+    user = await db.get(User, user_id)
+    if user is None:
+        raise credentials_exception
+    
+    user_cache.put(user, version)
+    return user
+
+def _ensure_admin(current_user: User) -> User:
     # Check both enum and string value for compatibility
     is_admin = (current_user.role == UserRole.ADMIN or 
                 current_user.role == "admin" or 
@@ -91,11 +154,44 @@ def get_current_admin_user(current_user: User = Depends(get_current_user)):
     
     return current_user
 
+def get_current_admin_user(current_user: User = Depends(get_current_user)):
+    """Get the current user and verify they are an admin."""
+    return _ensure_admin(current_user)
+
+async def get_current_admin_user_async(current_user: User = Depends(get_current_user_async)):
+    """Async variant of get_current_admin_user."""
+    return _ensure_admin(current_user)
+
+def _store_rehashed_password(db: Session, user: User, new_hash: str) -> None:
+    """Persist a password hash upgraded to the current work factor."""
+    from app.crud import VERSION_USERS, bump_versions
+
+    user.password_hash = new_hash
+    # The row's updated_at changes, which user responses include
+    bump_versions(db, VERSION_USERS)
+    db.commit()
+    invalidate_user(user.id)
+
 def authenticate_user(db: Session, email: str, password: str):
     """Authenticate a user with email and password."""
     user = db.query(User).filter(User.email == email).first()
     if not user:
         return False
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = password_hasher.verify_and_update(password, user.password_hash)
+    if not valid:
+        return False
+    if new_hash:
+        _store_rehashed_password(db, user, new_hash)
+    return user
+
+async def authenticate_user_async(db: Session, email: str, password: str):
+    """Authenticate a user without holding a worker thread during hashing."""
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
+    if not user:
+        return False
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.password_hash)
+    if not valid:
         return False
+    if new_hash:
+        await run_in_threadpool(_store_rehashed_password, db, user, new_hash)
     return user
@@ -0,0 +1,148 @@
+"""
+One-shot database bootstrap for LeaveXact.
+
+Creates/upgrades the schema and seeds demo data. Run it once per deploy
+(before starting the API workers) instead of on every worker import:
+
+    python -m app.bootstrap                 # migrate + seed
+    python -m app.bootstrap migrate         # schema only
+    python -m app.bootstrap seed            # default users + demo leaves
+    python -m app.bootstrap seed --no-demo-leaves
+    python -m app.bootstrap check           # exit 1 if the schema is out of date
+
+Tables are created from the models; changes to existing tables are Alembic
+revisions in migrations/versions, applied by `migrate`.
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+from sqlalchemy.exc import SQLAlchemyError
+from app.database import SessionLocal, engine, Base
+from app.models import SchemaVersion, LeaveRequest
+from app.utils import get_current_time
+from app.crud import rebuild_system_counters
+from app.search import install_audit_search
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the schema changes
+SCHEMA_VERSION = 11
+
+ALEMBIC_INI = Path(__file__).parent.parent / "alembic.ini"
+
+
+def get_schema_version() -> Optional[int]:
+    """Return the schema version recorded in the database, or None if not bootstrapped."""
+    db = SessionLocal()
+    try:
+        row = db.query(SchemaVersion).filter(SchemaVersion.id == 1).first()
+        return row.version if row else None
+    except SQLAlchemyError:
+        return None
+    finally:
+        db.close()
+
+
+def is_schema_current() -> bool:
+    return get_schema_version() == SCHEMA_VERSION
+
+
+def upgrade_database(revision: str = "head") -> None:
+    """Run the Alembic migrations in migrations/versions up to `revision`."""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+
+
+def migrate() -> None:
+    """Create missing tables, apply Alembic migrations, install the audit search index and record the schema version."""
+    Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist; changes to those are Alembic revisions
+    upgrade_database()
+    install_audit_search(engine)
+
+    db = SessionLocal()
+    try:
+        row = db.query(SchemaVersion).filter(SchemaVersion.id == 1).first()
+        if row is None:
+            row = SchemaVersion(id=1)
+            db.add(row)
+        row.version = SCHEMA_VERSION
+        row.applied_at = get_current_time()
+        rebuild_system_counters(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def seed_demo_leaves(leaves_per_employee: int = 5) -> None:
+    """Populate sample leave data if no leave requests exist."""
+    db = SessionLocal()
+    try:
+        if db.query(LeaveRequest).count() > 0:
+            logger.info("Leave requests already exist, skipping demo leaves")
+            return
+    finally:
+        db.close()
+
+    # Add the project root so scripts module is importable
+    project_root = str(Path(__file__).parent.parent)
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    from scripts.populate_realistic_leaves import populate_leaves
+    populate_leaves(leaves_per_employee=leaves_per_employee)
+
+
+def seed(demo_leaves: bool = True) -> None:
+    """Create default users and, optionally, demo leave data."""
+    from app.init_db import init_database
+    init_database()
+    if demo_leaves:
+        seed_demo_leaves()
+
+
+def _timed(phase: str, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    logger.info(f"bootstrap phase '{phase}' took {(time.perf_counter() - start) * 1000:.1f} ms")
+    return result
+
+
+def bootstrap(demo_leaves: bool = True) -> None:
+    """Run every bootstrap step: migrate, then seed."""
+    _timed("migrate", migrate)
+    _timed("seed", seed, demo_leaves=demo_leaves)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Bootstrap the LeaveXact database")
+    parser.add_argument("command", nargs="?", default="all", choices=["all", "migrate", "seed", "check"])
+    parser.add_argument("--no-demo-leaves", action="store_true", help="Do not generate sample leave requests")
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        version = get_schema_version()
+        if version != SCHEMA_VERSION:
+            logger.error(f"Schema version {version} is out of date (expected {SCHEMA_VERSION}), run `python -m app.bootstrap migrate`")
+            return 1
+        logger.info(f"Schema version {version} is current")
+        return 0
+
+    if args.command in ("all", "migrate"):
+        _timed("migrate", migrate)
+    if args.command in ("all", "seed"):
+        _timed("seed", seed, demo_leaves=not args.no_demo_leaves)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
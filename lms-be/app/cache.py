@@ -0,0 +1,99 @@
+"""
+Versioned in-process caches.
+
+The user, calendar tile and audit total caches share one structure: a
+bounded LRU of entries that expire after a TTL and are stamped with the
+version of their scope when read. ``invalidate(scope)`` bumps the scope's
+version, so an entry read before a write is never served after it, and a
+value read before the bump is never stored (``put`` takes the version read
+before the value was loaded). Writes made by other workers and scripts show
+up once an entry's TTL runs out.
+
+A subclass maps its keys to scopes with ``scope``: the key itself by default,
+or e.g. the user id of a (user, month) key. A subclass with
+``local_versions = False`` is versioned by the caller instead, typically
+with counters read from the database, which every worker sees: ``get`` and
+``put`` are given the version, and an entry is served only to a lookup made
+at the version it was stored with.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class VersionedCache:
+    """Bounded, TTL'd LRU cache whose entries are versioned per scope."""
+
+    local_versions = True
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (version, expires_at, value)
+        self._versions = {}  # scope -> version, bumped by invalidate
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def scope(self, key: Hashable) -> Hashable:
+        """The scope whose writes invalidate `key`."""
+        return key
+
+    def version(self, scope: Hashable = None) -> int:
+        with self._lock:
+            return self._versions.get(scope, 0)
+
+    def _current(self, key: Hashable, version: Optional[Hashable]) -> Hashable:
+        """The version `key` must be stamped with; called under the lock."""
+        return self._versions.get(self.scope(key), 0) if self.local_versions else version
+
+    def get(self, key: Hashable, version: Optional[Hashable] = None) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stamp, expires_at, value = entry
+                if stamp == self._current(key, version) and expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, version: Hashable) -> None:
+        """Store ``value`` if its scope did not change since ``version`` was read."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if version != self._current(key, version):
+                return
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, scope: Hashable = None) -> None:
+        """Bump the version of `scope`; stale entries are dropped as they are looked up or evicted."""
+        with self._lock:
+            self._versions[scope] = self._versions.get(scope, 0) + 1
+            self._entries.pop(scope, None)
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0
+            }
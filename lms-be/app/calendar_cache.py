@@ -0,0 +1,162 @@
+"""
+Per-user leave calendar tiles.
+
+The my-calendar and per-user calendar routes are built from the user's leave
+days and the leave requests overlapping the range. Both are cached per
+(user, month) tile: a range is assembled from the tiles of the months it
+touches and trimmed to its days, and only missing tiles are read from the
+database (one interval query and one request query covering all of them).
+The frontend moves a month at a time, so most navigation is served from tiles.
+
+Tiles are stamped with the database counters the routes' ETags are built
+from (``version:epoch`` and ``version:leaves:user:<id>``, see
+app/conditional.py), read before the tiles: every change to a user's leave
+requests bumps them in its transaction, on whichever worker or script made
+it, so a tile is served only while the counters it was read at are current.
+Missing tiles and their version are read from the primary even when the
+route reads from a replica. Tiles expire after CALENDAR_CACHE_TTL_SECONDS.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple, Tuple
+from sqlalchemy.orm import Session
+from app.cache import VersionedCache
+from app.config import settings
+from app.crud import VERSION_EPOCH, get_versions, user_leaves_version
+from app.database import primary_read_session, read_router
+from app.leave_calendar import expand, overlapping
+from app.models import LeaveInterval, LeaveRequest, LeaveStatus
+
+Month = Tuple[int, int]
+
+
+class MonthTile(NamedTuple):
+    """One user's leave data for one month."""
+    days: Dict[str, List[dict]]  # date -> [{"leave_type", "leave_request_id"}], in date order
+    leaves: Dict[int, Tuple[LeaveStatus, dict]]  # leave request id -> (status, leave data)
+
+
+def month_start(month: Month) -> date:
+    return date(month[0], month[1], 1)
+
+
+def month_end(month: Month) -> date:
+    year, number = month
+    return (date(year + 1, 1, 1) if number == 12 else date(year, number + 1, 1)) - timedelta(days=1)
+
+
+def months_between(start: date, end: date) -> List[Month]:
+    """The months touched by [start, end], in order."""
+    months = []
+    year, number = start.year, start.month
+    while (year, number) <= (end.year, end.month):
+        months.append((year, number))
+        year, number = (year + 1, 1) if number == 12 else (year, number + 1)
+    return months
+
+
+class CalendarCache(VersionedCache):
+    """Month tiles keyed by (user id, month), stamped with the user's leave version counters."""
+
+    local_versions = False
+
+
+calendar_cache = CalendarCache(max_size=settings.CALENDAR_CACHE_MAX_SIZE, ttl_seconds=settings.CALENDAR_CACHE_TTL_SECONDS)
+
+
+def leaves_version(db: Session, user_id: int) -> Tuple[int, int]:
+    """The counters a user's tiles are stamped with, as `db` sees them."""
+    names = [VERSION_EPOCH, user_leaves_version(user_id)]
+    versions = get_versions(db, names)
+    return tuple(versions[name] for name in names)
+
+
+def _leave_data(leave: LeaveRequest) -> dict:
+    return {
+        "id": leave.id,
+        "leave_type": leave.leave_type.value,
+        "start_date": leave.start_date.strftime("%Y-%m-%d"),
+        "end_date": leave.end_date.strftime("%Y-%m-%d"),
+        "duration": leave.duration,
+        "reason": leave.reason,
+        "admin_comment": leave.admin_comment,
+        "created_at": leave.created_at.isoformat()
+    }
+
+
+def build_tiles(db: Session, user_id: int, months: List[Month]) -> Dict[Month, MonthTile]:
+    """Read the tiles of `months` (in order) from the database."""
+    # One read spans all of `months`; cached months in between are skipped
+    tiles = {month: MonthTile({}, {}) for month in months}
+    first = datetime.combine(month_start(months[0]), datetime.min.time())
+    last = datetime.combine(month_end(months[-1]), datetime.min.time())
+
+    intervals = db.query(LeaveInterval).filter(
+        LeaveInterval.employee_id == user_id,
+        overlapping(first, last)
+    ).all()
+    for day in expand(intervals, first, last):
+        tile = tiles.get((day.leave_date.year, day.leave_date.month))
+        if tile is not None:
+            tile.days.setdefault(day.leave_date.strftime("%Y-%m-%d"), []).append({
+                "leave_type": day.leave_type.value,
+                "leave_request_id": day.leave_request_id
+            })
+
+    leave_requests = db.query(LeaveRequest).filter(
+        LeaveRequest.employee_id == user_id,
+        LeaveRequest.start_date < last + timedelta(days=1),
+        LeaveRequest.end_date >= first
+    ).order_by(LeaveRequest.id).all()
+    for leave in leave_requests:
+        entry = (leave.status, _leave_data(leave))
+        for month in months_between(max(leave.start_date.date(), first.date()), min(leave.end_date.date(), last.date())):
+            if month in tiles:
+                tiles[month].leaves[leave.id] = entry
+    return tiles
+
+
+def get_calendar_range(db: Session, user_id: int, start: date, end: date) -> Tuple[Dict[str, List[dict]], List[Tuple[LeaveStatus, dict]]]:
+    """
+    A user's leave days and overlapping leave requests for [start, end].
+
+    Returns (calendar days by date, [(status, leave data)] by leave id),
+    assembled from cached month tiles; missing tiles are built from the
+    primary and cached.
+    """
+    months = months_between(start, end)
+    if not months:
+        return {}, []
+
+    # On the route's session, so tiles match the ETag computed on it
+    version = leaves_version(db, user_id)
+    tiles = {}
+    missing = []
+    for month in months:
+        tile = calendar_cache.get((user_id, month), version)
+        if tile is None:
+            missing.append(month)
+        else:
+            tiles[month] = tile
+    if missing:
+        if read_router.has_replicas:
+            with primary_read_session() as primary:
+                version = leaves_version(primary, user_id)
+                built = build_tiles(primary, user_id, missing)
+        else:
+            built = build_tiles(db, user_id, missing)
+        for month in missing:
+            calendar_cache.put((user_id, month), built[month], version)
+        tiles.update(built)
+
+    start_str, end_str = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+    days = {}
+    leaves = {}
+    for month in months:
+        tile = tiles[month]
+        for day, entries in tile.days.items():
+            if start_str <= day <= end_str:
+                days[day] = entries
+        for leave_id, (status, leave_data) in tile.leaves.items():
+            if leave_data["start_date"] <= end_str and leave_data["end_date"] >= start_str:
+                leaves[leave_id] = (status, leave_data)
+    return days, [leaves[leave_id] for leave_id in sorted(leaves)]
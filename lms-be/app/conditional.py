@@ -0,0 +1,128 @@
+"""
+Conditional GETs from version counters.
+
+Every write path in crud bumps version counters for the scopes it changes
+(``version:leaves``, ``version:users`` and ``version:leaves:user:<id>``, kept
+in system_counters and committed with the write); bulk rewrites by the
+bootstrap and data scripts bump ``version:epoch``, which every ETag includes.
+A GET route declares the scopes its response depends on:
+
+    cache_headers: dict = Depends(conditional_get("leaves:user:{me}", "users"))
+
+``{me}`` is the caller's id and ``{name}`` a path parameter. The ETag hashes
+the path, query, Accept header, caller and the scopes' current versions, read
+in one primary-key lookup on the route's read session. A request whose
+If-None-Match matches gets 304 before the handler queries or serializes
+anything; otherwise the ETag is set on the response. Declare the dependency
+after the route's auth dependency so unauthorized callers still get 401/403.
+
+The async route variants (ASYNC_DB_ENABLED) declare ``conditional_get_async``
+with the same scopes; it reads the versions on the async session.
+
+Two scopes are not counters: ``holidays`` (changes with the calendar files)
+and ``today`` (for responses that default to the current date or year).
+"""
+import hashlib
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import auth, crud
+from app.database import get_async_db, get_read_db
+from app.holidays import HOLIDAYS_VERSION
+from app.models import User
+from app.utils import get_current_time
+
+STATIC_SCOPES = {"holidays", "today"}
+
+
+def _static_version(scope: str) -> str:
+    if scope == "holidays":
+        return HOLIDAYS_VERSION
+    return get_current_time().strftime("%Y-%m-%d")
+
+
+def _make_etag(request: Request, user_id: Optional[int], versions: list) -> str:
+    key = "|".join([
+        request.url.path,
+        "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items())),
+        request.headers.get("accept", ""),
+        str(user_id),
+        *versions
+    ])
+    return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", opaque):
+            return True
+    return False
+
+
+def _respond(request: Request, response: Response, etag: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(request.headers.get("if-none-match"), etag):
+        # Starlette sends a 304 without a body
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
+def _scope_etag(db: Session, request: Request, user_id: int, scopes: tuple) -> str:
+    names = [
+        None if scope in STATIC_SCOPES else f"version:{scope.format(me=user_id, **request.path_params)}"
+        for scope in scopes
+    ]
+    current = crud.get_versions(db, [crud.VERSION_EPOCH] + [name for name in names if name])
+    versions = [str(current[crud.VERSION_EPOCH])] + [
+        _static_version(scope) if name is None else str(current[name])
+        for scope, name in zip(scopes, names)
+    ]
+    return _make_etag(request, user_id, versions)
+
+
+def conditional_get(*scopes: str):
+    """Dependency answering If-None-Match from the versions of `scopes` (for authenticated routes)."""
+    def check(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_read_db),
+        current_user: User = Depends(auth.get_current_user)
+    ) -> dict:
+        return _respond(request, response, _scope_etag(db, request, current_user.id, scopes))
+
+    return check
+
+
+def conditional_get_async(*scopes: str):
+    """conditional_get for the async route variants, reading the versions on the async session."""
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: User = Depends(auth.get_current_user_async)
+    ) -> dict:
+        etag = await db.run_sync(lambda session: _scope_etag(session, request, current_user.id, scopes))
+        return _respond(request, response, etag)
+
+    return check
+
+
+def public_conditional_get(*scopes: str):
+    """Dependency answering If-None-Match for unauthenticated routes; only static scopes are allowed."""
+    if any(scope not in STATIC_SCOPES for scope in scopes):
+        raise ValueError(f"Public routes can only depend on {sorted(STATIC_SCOPES)}")
+
+    def check(request: Request, response: Response) -> dict:
+        return _respond(request, response, _make_etag(request, None, [_static_version(scope) for scope in scopes]))
+
+    return check
+
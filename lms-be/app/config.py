@@ -9,11 +9,95 @@ class Settings(BaseSettings):
     # Support both PostgreSQL and SQLite
     DATABASE_URL: str = "sqlite:///./data/leavexact.db"
     
+    # SQLite production profile (WAL + pragmas, single writer connection, read-only reader pool)
+    SQLITE_PRODUCTION_PROFILE: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB, i.e. 64 MB per connection
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_WRITER_POOL_SIZE: int = 1
+    SQLITE_READ_POOL_SIZE: int = 8
+    
+    # Read replicas for read-only GET handlers (round-robin), e.g. ["postgresql://replica1/leavexact"].
+    # A user's reads stay on the primary for REPLICA_STICKY_SECONDS after their own write
+    # (tracked per worker process: read-your-writes only holds with a single worker).
+    # Authentication always reads the primary.
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: int = 5
+    
+    # Serve the hot leave/admin/auth paths from async handlers on an async engine
+    # (aiosqlite for SQLite, asyncpg for PostgreSQL). ASYNC_DATABASE_URL defaults to DATABASE_URL with the async driver.
+    # Not allowed with SQLITE_PRODUCTION_PROFILE, whose single writer connection the async engine would bypass.
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: str = ""
+    
     # JWT settings
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     
+    # Password hashing (pbkdf2_sha256 rounds; hashes with other rounds are upgraded on login)
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 2  # size of the hashing process pool, 0 hashes without a pool
+    PASSWORD_HASH_TIMEOUT_SECONDS: float = 10  # longest a request waits for a hash (503 after), 0 waits forever
+    
+    # Authenticated user cache (set USER_CACHE_MAX_SIZE=0 to disable)
+    USER_CACHE_MAX_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 60
+    
+    # Per-user leave calendar month tiles (set CALENDAR_CACHE_MAX_SIZE=0 to disable)
+    CALENDAR_CACHE_MAX_SIZE: int = 4096
+    CALENDAR_CACHE_TTL_SECONDS: int = 60
+    
+    # Serve leave request counts on the admin summary from the system_counters table
+    # (kept up to date by the leave lifecycle) instead of counting leave_requests
+    USE_SYSTEM_COUNTERS: bool = True
+    
+    # Background jobs (one worker runs each job per interval, coordinated through job_locks)
+    SCHEDULER_ENABLED: bool = True
+    LEAVE_EXPIRY_INTERVAL_MINUTES: int = 15
+    
+    # Longest date range (in days) the admin calendar serves in one request
+    ADMIN_CALENDAR_MAX_DAYS: int = 731
+    # Longest date range (in days) a calendar streams as NDJSON; streaming keeps memory flat, but the read session and day sweep still grow with the range
+    CALENDAR_STREAM_MAX_DAYS: int = 3660
+    
+    # Longest leave request in calendar days; calendar range queries look back this far for leaves reaching into the range
+    MAX_LEAVE_SPAN_DAYS: int = 366
+    
+    # Leave duration counts working days only (weekends and public holidays are not charged);
+    # False charges every calendar day in the range
+    CHARGE_WORKING_DAYS_ONLY: bool = True
+    
+    # Regional holiday calendars: <region>.csv or <region>.ics files in app/holiday_calendars plus
+    # HOLIDAY_CALENDAR_DIR (whose files win). Users without a region use DEFAULT_HOLIDAY_REGION.
+    # Compiled calendars are cached in HOLIDAY_CACHE_DIR (empty disables the cache).
+    DEFAULT_HOLIDAY_REGION: str = "gujarat"
+    HOLIDAY_CALENDAR_DIR: str = ""
+    HOLIDAY_CACHE_DIR: str = "./data/holiday_cache"
+    
+    # Write-behind audit log: entries are queued and bulk inserted per batch by a background thread.
+    # Queued entries are spilled to AUDIT_SPILL_DIR on shutdown and replayed on start; AUDIT_DURABLE
+    # journals every entry there before queueing so they also survive a crash.
+    AUDIT_SINK_ENABLED: bool = True
+    AUDIT_QUEUE_MAX_SIZE: int = 10000
+    AUDIT_FLUSH_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_SPILL_DIR: str = "./data/audit_spill"
+    AUDIT_DURABLE: bool = False
+    # Audit log list totals are cached per worker for this long (writes in the same worker invalidate them)
+    AUDIT_TOTAL_CACHE_TTL_SECONDS: int = 30
+    
+    # Audit log retention: entries older than AUDIT_RETENTION_DAYS (0 keeps everything in the table) are
+    # moved by a background job into monthly gzip segments in AUDIT_ARCHIVE_DIR, in short batches
+    AUDIT_RETENTION_DAYS: int = 365
+    AUDIT_ARCHIVE_DIR: str = "./data/audit_archive"
+    AUDIT_RETENTION_INTERVAL_MINUTES: int = 60
+    AUDIT_RETENTION_BATCH_SIZE: int = 1000
+    AUDIT_RETENTION_MAX_BATCHES: int = 100  # per run; the rest waits for the next run
+    AUDIT_RETENTION_PAUSE_MS: int = 50
+    
     # CORS settings
     ALLOWED_ORIGINS: List[str] = ["*"]  # Allow all origins for development
     
@@ -21,6 +105,10 @@ class Settings(BaseSettings):
     APP_NAME: str = "LeaveXact API"
     DEBUG: bool = True
     
+    # Run `python -m app.bootstrap` automatically when a worker finds the schema out of date.
+    # Leave off in production so N workers don't all migrate and seed on start.
+    AUTO_BOOTSTRAP: bool = False
+    
     # Timezone settings
     TIMEZONE: str = "Asia/Kolkata"  # Indian Standard Time (IST)
     TZ: str = "Asia/Kolkata"
@@ -1,11 +1,19 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, case, select, true, update, insert
 from typing import List, Optional
-from app.models import User, LeaveRequest, AuditLog, LeaveStatus, LeaveType, LeaveCalendar, UserRole
+from app.models import User, LeaveRequest, AuditLog, LeaveStatus, LeaveType, LeaveInterval, UserRole, SystemCounter
 from app.schemas import UserCreate, UserUpdate, LeaveRequestCreate, LeaveRequestUpdate
-from app.auth import get_password_hash
+from app.auth import get_password_hash, invalidate_user
 from datetime import datetime, timedelta
-from app.utils import get_current_time
+from app.utils import get_current_time, make_aware
+from app.config import settings
+from app.audit import audit_sink, audit_totals
+from app.search import search_audit_logs
+from app.leave_calendar import CalendarDay, leave_interval, overlapping, expand, sweep
+from app.working_days import leave_duration
+from app.serialization import USER_FIELDS, LEAVE_REQUEST_FIELDS
+import base64
+import binascii
 import json
 
 # User CRUD operations
@@ -31,10 +39,12 @@ def create_user(db: Session, user: UserCreate) -> User:
         role=user.role,
         department=user.department,
         gender=user.gender,
+        region=user.region,
         maternity_leave=maternity_leave,
         paternity_leave=paternity_leave
     )
     db.add(db_user)
+    bump_versions(db, VERSION_USERS)
     db.commit()
     db.refresh(db_user)
     return db_user
@@ -47,10 +57,7 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get user by email."""
     return db.query(User).filter(User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100, search: str = None, department: str = None) -> List[User]:
-    """Get users with pagination and filtering."""
-    query = db.query(User)
-    
+def _filter_users(query, search: str = None, department: str = None):
     if search:
         query = query.filter(
             or_(
@@ -63,7 +70,16 @@ def get_users(db: Session, skip: int = 0, limit: int = 100, search: str = None,
     if department:
         query = query.filter(User.department == department)
     
-    return query.offset(skip).limit(limit).all()
+    return query
+
+def get_users(db: Session, skip: int = 0, limit: int = 100, search: str = None, department: str = None) -> List[User]:
+    """Get users with pagination and filtering."""
+    return _filter_users(db.query(User), search, department).offset(skip).limit(limit).all()
+
+def get_user_rows(db: Session, skip: int = 0, limit: int = 100, search: str = None, department: str = None) -> list:
+    """Like get_users, as row tuples of the USER_FIELDS columns (see app/serialization.py)."""
+    query = db.query(*(getattr(User, name) for name in USER_FIELDS))
+    return _filter_users(query, search, department).offset(skip).limit(limit).all()
 
 def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[User]:
     """Update user."""
@@ -75,7 +91,9 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
+    bump_versions(db, VERSION_USERS)
     db.commit()
+    invalidate_user(user_id)
     db.refresh(db_user)
     return db_user
 
@@ -86,18 +104,28 @@ def delete_user(db: Session, user_id: int) -> bool:
         return False
     
     # Delete related leave requests and audit logs
+    status_counts = db.query(LeaveRequest.status, func.count(LeaveRequest.id)).filter(
+        LeaveRequest.employee_id == user_id
+    ).group_by(LeaveRequest.status).all()
+    deltas = {f"leave_requests_{status.value}": -count for status, count in status_counts}
+    deltas["leave_requests_total"] = -sum(count for _, count in status_counts)
+    bump_system_counters(db, deltas)
+    db.query(LeaveInterval).filter(LeaveInterval.employee_id == user_id).delete()
     db.query(LeaveRequest).filter(LeaveRequest.employee_id == user_id).delete()
     db.query(AuditLog).filter(AuditLog.user_id == user_id).delete()
     
     db.delete(db_user)
+    bump_versions(db, VERSION_USERS, VERSION_LEAVES, user_leaves_version(user_id))
     db.commit()
+    invalidate_user(user_id)
+    audit_totals.invalidate()
     return True
 
 # Leave request CRUD operations
-def create_leave_request(db: Session, leave_request: LeaveRequestCreate, user_id: int) -> LeaveRequest:
+def create_leave_request(db: Session, leave_request: LeaveRequestCreate, user_id: int, region: str = None) -> LeaveRequest:
     """Create a new leave request."""
-    # Calculate duration
-    duration = (leave_request.end_date - leave_request.start_date).days + 1
+    # Calculate duration (working days in the employee's holiday region)
+    duration = leave_duration(leave_request.start_date, leave_request.end_date, region)
     
     db_leave_request = LeaveRequest(
         employee_id=user_id,
@@ -108,6 +136,8 @@ def create_leave_request(db: Session, leave_request: LeaveRequestCreate, user_id
         reason=leave_request.reason
     )
     db.add(db_leave_request)
+    bump_system_counters(db, {"leave_requests_total": 1, "leave_requests_pending": 1})
+    bump_versions(db, VERSION_LEAVES, user_leaves_version(user_id))
     db.commit()
     db.refresh(db_leave_request)
     
@@ -119,17 +149,27 @@ def get_leave_request(db: Session, request_id: int) -> Optional[LeaveRequest]:
     """Get leave request by ID."""
     return db.query(LeaveRequest).options(joinedload(LeaveRequest.employee)).filter(LeaveRequest.id == request_id).first()
 
-def get_leave_requests(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, status: str = None) -> List[LeaveRequest]:
-    """Get leave requests with filtering."""
-    query = db.query(LeaveRequest).options(joinedload(LeaveRequest.employee))
-    
+def _filter_leave_requests(query, user_id: int = None, status: str = None):
     if user_id:
         query = query.filter(LeaveRequest.employee_id == user_id)
     
     if status:
         query = query.filter(LeaveRequest.status == status)
     
-    return query.order_by(LeaveRequest.id.desc()).offset(skip).limit(limit).all()
+    return query.order_by(LeaveRequest.id.desc())
+
+def get_leave_requests(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, status: str = None) -> List[LeaveRequest]:
+    """Get leave requests with filtering."""
+    query = db.query(LeaveRequest).options(joinedload(LeaveRequest.employee))
+    return _filter_leave_requests(query, user_id, status).offset(skip).limit(limit).all()
+
+def get_leave_request_rows(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, status: str = None) -> list:
+    """Like get_leave_requests, as row tuples of the LEAVE_REQUEST_FIELDS then USER_FIELDS columns."""
+    query = db.query(
+        *(getattr(LeaveRequest, name) for name in LEAVE_REQUEST_FIELDS),
+        *(getattr(User, name) for name in USER_FIELDS)
+    ).join(User, LeaveRequest.employee_id == User.id)
+    return _filter_leave_requests(query, user_id, status).offset(skip).limit(limit).all()
 
 def update_leave_request(db: Session, request_id: int, leave_update: LeaveRequestUpdate) -> Optional[LeaveRequest]:
     """Update leave request."""
@@ -143,9 +183,11 @@ def update_leave_request(db: Session, request_id: int, leave_update: LeaveReques
     
     # Recalculate duration if dates changed
     if leave_update.start_date or leave_update.end_date:
-        duration = (db_leave_request.end_date - db_leave_request.start_date).days + 1
-        db_leave_request.duration = duration
+        db_leave_request.duration = leave_duration(
+            db_leave_request.start_date, db_leave_request.end_date, db_leave_request.employee.region
+        )
     
+    bump_versions(db, VERSION_LEAVES, user_leaves_version(db_leave_request.employee_id))
     db.commit()
     db.refresh(db_leave_request)
     return db_leave_request
@@ -157,6 +199,8 @@ def delete_leave_request(db: Session, request_id: int) -> bool:
         return False
     
     db.delete(db_leave_request)
+    bump_system_counters(db, {"leave_requests_total": -1, "leave_requests_pending": -1})
+    bump_versions(db, VERSION_LEAVES, user_leaves_version(db_leave_request.employee_id))
     db.commit()
     return True
 
@@ -183,8 +227,12 @@ def approve_leave_request(db: Session, request_id: int, admin_comment: str = Non
     
     # Update leave calendar
     update_leave_calendar(db, db_leave_request)
+    bump_system_counters(db, {"leave_requests_pending": -1, "leave_requests_approved": 1})
+    # Balances changed too
+    bump_versions(db, VERSION_LEAVES, VERSION_USERS, user_leaves_version(user.id))
     
     db.commit()
+    invalidate_user(user.id)
     db.refresh(db_leave_request)
     return db_leave_request
 
@@ -197,6 +245,8 @@ def reject_leave_request(db: Session, request_id: int, admin_comment: str = None
     # Update request status
     db_leave_request.status = LeaveStatus.REJECTED
     db_leave_request.admin_comment = admin_comment
+    bump_system_counters(db, {"leave_requests_pending": -1, "leave_requests_rejected": 1})
+    bump_versions(db, VERSION_LEAVES, user_leaves_version(db_leave_request.employee_id))
     
     db.commit()
     db.refresh(db_leave_request)
@@ -204,18 +254,36 @@ def reject_leave_request(db: Session, request_id: int, admin_comment: str = None
 
 # Audit log operations
 def create_audit_log(db: Session, user_id: int, action: str, description: str, details: dict = None) -> AuditLog:
-    """Create an audit log entry."""
+    """
+    Create an audit log entry.
+    
+    While the audit sink runs the entry is queued for a batched insert and the
+    returned AuditLog is not yet persisted (it has no id). Otherwise, or when
+    the queue is full, it is committed immediately.
+    """
+    details = details or None
+    queued = audit_sink.submit(user_id, action, description, details)
+    if queued is not None:
+        return AuditLog(**queued)
+    
     db_audit_log = AuditLog(
         user_id=user_id,
         action=action,
         description=description,
-        details=json.dumps(details) if details else None
+        details=details
     )
     db.add(db_audit_log)
     db.commit()
+    audit_totals.invalidate()
     db.refresh(db_audit_log)
     return db_audit_log
 
+def get_leave_request_history(db: Session, request_id: int) -> List[AuditLog]:
+    """Audit entries about one leave request, oldest first (served by ix_audit_logs_leave_request_timestamp)."""
+    return db.query(AuditLog).options(joinedload(AuditLog.user)).filter(
+        AuditLog.leave_request_id == request_id
+    ).order_by(AuditLog.timestamp, AuditLog.id).all()
+
 def get_audit_logs(db: Session, skip: int = 0, limit: int = 100, user_id: int = None, action: str = None) -> List[AuditLog]:
     """Get audit logs with filtering."""
     query = db.query(AuditLog).options(joinedload(AuditLog.user))
@@ -228,19 +296,18 @@ def get_audit_logs(db: Session, skip: int = 0, limit: int = 100, user_id: int =
     
     return query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
 
-def get_audit_logs_paginated(db: Session, skip: int = 0, limit: int = 100, search: str = None, action: str = None, date: datetime = None):
-    """Get audit logs with pagination, search, and filtering."""
-    query = db.query(AuditLog).options(joinedload(AuditLog.user))
+def _filter_audit_logs(db: Session, query, search: str = None, action: str = None, date: datetime = None):
+    """
+    Apply the audit log list filters (search, action, day) to `query`.
+    
+    Returns (query, rank) where rank orders full-text matches by relevance,
+    or None when there is no search.
+    """
+    rank = None
     
-    # Search filter (search in user name, email, or description)
+    # Search filter (full-text over description, user name/email and details)
     if search:
-        query = query.join(User).filter(
-            or_(
-                User.name.ilike(f"%{search}%"),
-                User.email.ilike(f"%{search}%"),
-                AuditLog.description.ilike(f"%{search}%")
-            )
-        )
+        query, rank = search_audit_logs(db, query, search)
     
     # Action filter
     if action and action.lower() != "all":
@@ -252,66 +319,259 @@ def get_audit_logs_paginated(db: Session, skip: int = 0, limit: int = 100, searc
         end_of_day = date.replace(hour=23, minute=59, second=59, microsecond=999999)
         query = query.filter(and_(AuditLog.timestamp >= start_of_day, AuditLog.timestamp <= end_of_day))
     
+    return query, rank
+
+def count_audit_logs(db: Session, search: str = None, action: str = None, date: datetime = None) -> int:
+    """Count audit logs matching the filters, served from the per-worker totals cache when fresh."""
+    key = (search or None, action if action and action.lower() != "all" else None, date.isoformat() if date else None)
+    total = audit_totals.get(key)
+    if total is None:
+        version = audit_totals.version()
+        query, _ = _filter_audit_logs(db, db.query(func.count(AuditLog.id)), search, action, date)
+        total = query.scalar()
+        audit_totals.put(key, total, version)
+    return total
+
+def get_audit_logs_paginated(db: Session, skip: int = 0, limit: int = 100, search: str = None, action: str = None, date: datetime = None):
+    """Get audit logs with pagination, search, and filtering. Search results come best match first."""
+    query, rank = _filter_audit_logs(db, db.query(AuditLog).options(joinedload(AuditLog.user)), search, action, date)
+    
     # Get total count
-    total = query.count()
+    total = count_audit_logs(db, search=search, action=action, date=date)
     
     # Get paginated results
-    audit_logs = query.order_by(AuditLog.timestamp.desc()).offset(skip).limit(limit).all()
+    order = [AuditLog.timestamp.desc(), AuditLog.id.desc()]
+    if rank is not None:
+        order.insert(0, rank)
+    audit_logs = query.order_by(*order).offset(skip).limit(limit).all()
     
     return audit_logs, total
 
-# Analytics functions
-def get_system_summary(db: Session) -> dict:
-    """Get system summary statistics."""
-    total_employees = db.query(User).count()
-    total_departments = db.query(User.department).distinct().count()
-    total_requests = db.query(LeaveRequest).count()
-    pending_requests = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.PENDING).count()
-    approved_requests = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.APPROVED).count()
-    rejected_requests = db.query(LeaveRequest).filter(LeaveRequest.status == LeaveStatus.REJECTED).count()
-    
-    # Calculate average leave balance
-    users = db.query(User).all()
-    if users:
-        total_balance = sum(
-            user.annual_leave + user.sick_leave + user.personal_leave + 
-            user.emergency_leave + user.maternity_leave for user in users
-        )
-        average_balance = total_balance / len(users)
+def get_all_audit_logs(db: Session, search: str = None, action: str = None, date: datetime = None) -> List[AuditLog]:
+    """Get every audit log matching the filters, newest first (for bounded filters such as one day)."""
+    query, _ = _filter_audit_logs(db, db.query(AuditLog).options(joinedload(AuditLog.user)), search, action, date)
+    return query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).all()
+
+def encode_audit_cursor(direction: str, log: AuditLog) -> str:
+    """Opaque cursor pointing before ("next") or after ("prev") `log` in the newest-first order."""
+    payload = json.dumps([direction, log.timestamp.isoformat(), log.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_audit_cursor(cursor: str):
+    """Return (direction, timestamp, id) from a cursor; raises ValueError if it is malformed."""
+    try:
+        direction, timestamp, log_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return direction, datetime.fromisoformat(timestamp), int(log_id)
+    except (TypeError, ValueError, binascii.Error) as error:
+        raise ValueError("Invalid cursor") from error
+
+def get_audit_logs_keyset(db: Session, limit: int = 100, cursor: str = None, search: str = None, action: str = None, date: datetime = None):
+    """
+    Get a page of audit logs, newest first, by keyset on (timestamp, id).
+    
+    Each page costs an index range scan regardless of depth. Search results
+    keep this order rather than relevance. Returns (audit_logs, next_cursor,
+    prev_cursor); a cursor is None when there is nothing further in that
+    direction.
+    """
+    query, _ = _filter_audit_logs(db, db.query(AuditLog).options(joinedload(AuditLog.user)), search, action, date)
+    direction = "next"
+    
+    if cursor:
+        direction, timestamp, log_id = decode_audit_cursor(cursor)
+        if direction == "next":
+            query = query.filter(or_(
+                AuditLog.timestamp < timestamp,
+                and_(AuditLog.timestamp == timestamp, AuditLog.id < log_id)
+            ))
+        else:
+            query = query.filter(or_(
+                AuditLog.timestamp > timestamp,
+                and_(AuditLog.timestamp == timestamp, AuditLog.id > log_id)
+            ))
+    
+    if direction == "next":
+        query = query.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc())
     else:
-        average_balance = 0
+        query = query.order_by(AuditLog.timestamp.asc(), AuditLog.id.asc())
     
-    return {
-        "total_employees": total_employees,
-        "total_departments": total_departments,
-        "total_leave_requests": total_requests,
-        "pending_requests": pending_requests,
-        "approved_requests": approved_requests,
-        "rejected_requests": rejected_requests,
-        "average_leave_balance": round(average_balance, 2)
-    }
+    # One extra row tells whether another page exists
+    return _keyset_page(query.limit(limit + 1).all(), limit, direction, bool(cursor))
 
-def get_employee_analytics(db: Session, employee_id: int) -> dict:
-    """Get analytics for a specific employee."""
-    user = db.query(User).filter(User.id == employee_id).first()
-    if not user:
-        return None
+def paginate_audit_logs(audit_logs: list, limit: int = 100, cursor: str = None):
+    """Keyset-paginate an in-memory, newest-first list of audit logs like get_audit_logs_keyset."""
+    direction = "next"
+    if cursor:
+        direction, timestamp, log_id = decode_audit_cursor(cursor)
+        if direction == "next":
+            audit_logs = [log for log in audit_logs if (log.timestamp, log.id) < (timestamp, log_id)]
+        else:
+            audit_logs = [log for log in reversed(audit_logs) if (log.timestamp, log.id) > (timestamp, log_id)]
+    return _keyset_page(audit_logs[:limit + 1], limit, direction, bool(cursor))
+
+def _keyset_page(audit_logs: list, limit: int, direction: str, has_cursor: bool):
+    """Turn up to limit + 1 rows fetched in `direction` order into (page, next_cursor, prev_cursor)."""
+    has_more = len(audit_logs) > limit
+    audit_logs = audit_logs[:limit]
     
-    requests = db.query(LeaveRequest).filter(LeaveRequest.employee_id == employee_id).all()
-    total_requests = len(requests)
-    approved_requests = len([r for r in requests if r.status == LeaveStatus.APPROVED])
-    rejected_requests = len([r for r in requests if r.status == LeaveStatus.REJECTED])
-    pending_requests = len([r for r in requests if r.status == LeaveStatus.PENDING])
+    if direction == "next":
+        has_next, has_prev = has_more, has_cursor
+    else:
+        audit_logs.reverse()
+        has_next, has_prev = True, has_more
     
-    approval_rate = (approved_requests / total_requests * 100) if total_requests > 0 else 0
+    next_cursor = encode_audit_cursor("next", audit_logs[-1]) if has_next and audit_logs else None
+    prev_cursor = encode_audit_cursor("prev", audit_logs[0]) if has_prev and audit_logs else None
+    return audit_logs, next_cursor, prev_cursor
+
+# System counters
+SYSTEM_COUNTER_NAMES = ["leave_requests_total"] + [f"leave_requests_{status.value}" for status in LeaveStatus]
+
+def bump_system_counters(db: Session, deltas: dict) -> None:
+    """Adjust system counters inside the caller's transaction (committed with it)."""
+    for name, delta in deltas.items():
+        if delta:
+            db.query(SystemCounter).filter(SystemCounter.name == name).update(
+                {SystemCounter.value: SystemCounter.value + delta}, synchronize_session=False
+            )
+
+# Version counters: system_counters rows bumped by every write to a scope, for ETags (see app/conditional.py)
+VERSION_LEAVES = "version:leaves"
+VERSION_USERS = "version:users"
+VERSION_EPOCH = "version:epoch"  # bumped by bulk rewrites (rebuild_system_counters); part of every ETag
+
+def user_leaves_version(user_id: int) -> str:
+    """Version counter of one employee's leave requests."""
+    return f"version:leaves:user:{user_id}"
+
+def bump_versions(db: Session, *names: str) -> None:
+    """Increment version counters inside the caller's transaction, creating missing ones."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as upsert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as upsert
+    for name in sorted(set(names)):
+        statement = upsert(SystemCounter).values(name=name, value=1)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[SystemCounter.name],
+            set_={"value": SystemCounter.value + 1}
+        ))
+
+def get_versions(db: Session, names: List[str]) -> dict:
+    """Current values of version counters in one primary-key lookup; missing ones are 0."""
+    versions = dict(db.query(SystemCounter.name, SystemCounter.value).filter(SystemCounter.name.in_(names)).all())
+    return {name: versions.get(name, 0) for name in names}
+
+def get_system_counters(db: Session) -> Optional[dict]:
+    """Return all system counters, or None if they have not been built yet."""
+    counters = dict(db.query(SystemCounter.name, SystemCounter.value).all())
+    if any(name not in counters for name in SYSTEM_COUNTER_NAMES):
+        return None
+    return counters
+
+def rebuild_system_counters(db: Session) -> dict:
+    """Recount system counters from leave_requests (does not commit)."""
+    db.flush()
+    status_counts = dict(
+        db.query(LeaveRequest.status, func.count(LeaveRequest.id)).group_by(LeaveRequest.status).all()
+    )
+    values = {f"leave_requests_{status.value}": status_counts.get(status, 0) for status in LeaveStatus}
+    values["leave_requests_total"] = sum(status_counts.values())
+    
+    for name, value in values.items():
+        counter = db.query(SystemCounter).filter(SystemCounter.name == name).first()
+        if counter is None:
+            db.add(SystemCounter(name=name, value=value))
+        else:
+            counter.value = value
+    bump_versions(db, VERSION_EPOCH)
+    return values
+
+# Analytics functions
+def get_system_summary(db: Session) -> dict:
+    """Get system summary statistics in a single aggregate query."""
+    user_totals = select(
+        func.count(User.id).label("total_employees"),
+        func.count(func.distinct(User.department)).label("total_departments"),
+        func.avg(
+            User.annual_leave + User.sick_leave + User.personal_leave +
+            User.emergency_leave + User.maternity_leave
+        ).label("average_balance")
+    ).subquery()
+    
+    counters = get_system_counters(db) if settings.USE_SYSTEM_COUNTERS else None
+    if counters is None:
+        # Count leave requests by status with conditional counts in the same statement
+        leave_totals = select(
+            func.count(LeaveRequest.id).label("leave_requests_total"),
+            *[
+                func.count(case((LeaveRequest.status == status, 1))).label(f"leave_requests_{status.value}")
+                for status in LeaveStatus
+            ]
+        ).subquery()
+        row = db.execute(
+            select(user_totals, leave_totals).select_from(user_totals.join(leave_totals, true()))
+        ).mappings().one()
+        counters = row
+    else:
+        row = db.execute(select(user_totals)).mappings().one()
     
     return {
-        "employee_id": employee_id,
+        "total_employees": row["total_employees"],
+        "total_departments": row["total_departments"],
+        "total_leave_requests": counters["leave_requests_total"],
+        "pending_requests": counters["leave_requests_pending"],
+        "approved_requests": counters["leave_requests_approved"],
+        "rejected_requests": counters["leave_requests_rejected"],
+        "average_leave_balance": round(float(row["average_balance"] or 0), 2)
+    }
+
+EMPLOYEE_ANALYTICS_SORTS = ["approval_rate", "days_taken", "total_requests", "name", "employee_id"]
+
+def _employee_analytics_query():
+    """Per-employee request counts and approved days, one row per user."""
+    leaves = select(
+        LeaveRequest.employee_id.label("employee_id"),
+        func.count(LeaveRequest.id).label("total_requests"),
+        *[
+            func.count(case((LeaveRequest.status == status, 1))).label(f"{status.value}_requests")
+            for status in (LeaveStatus.APPROVED, LeaveStatus.REJECTED, LeaveStatus.PENDING)
+        ],
+        func.sum(case((LeaveRequest.status == LeaveStatus.APPROVED, LeaveRequest.duration), else_=0)).label("days_taken")
+    ).group_by(LeaveRequest.employee_id).subquery()
+    
+    total_requests = func.coalesce(leaves.c.total_requests, 0)
+    approval_rate = case(
+        (total_requests > 0, func.coalesce(leaves.c.approved_requests, 0) * 100.0 / total_requests),
+        else_=0.0
+    )
+    columns = {
         "total_requests": total_requests,
-        "approved_requests": approved_requests,
-        "rejected_requests": rejected_requests,
-        "pending_requests": pending_requests,
-        "approval_rate": round(approval_rate, 2),
+        "approved_requests": func.coalesce(leaves.c.approved_requests, 0),
+        "rejected_requests": func.coalesce(leaves.c.rejected_requests, 0),
+        "pending_requests": func.coalesce(leaves.c.pending_requests, 0),
+        "days_taken": func.coalesce(leaves.c.days_taken, 0),
+        "approval_rate": approval_rate,
+    }
+    query = select(
+        User,
+        *[column.label(name) for name, column in columns.items()]
+    ).outerjoin(leaves, leaves.c.employee_id == User.id)
+    return query, columns
+
+def _employee_analytics_row(row) -> dict:
+    user = row.User
+    return {
+        "employee_id": user.id,
+        "total_requests": row.total_requests,
+        "approved_requests": row.approved_requests,
+        "rejected_requests": row.rejected_requests,
+        "pending_requests": row.pending_requests,
+        "approval_rate": round(float(row.approval_rate), 2),
+        "days_taken": row.days_taken,
         "leave_balance": {
             "annual": user.annual_leave,
             "sick": user.sick_leave,
@@ -322,83 +582,125 @@ def get_employee_analytics(db: Session, employee_id: int) -> dict:
         }
     }
 
-def get_department_analytics(db: Session) -> List[dict]:
-    """Get analytics by department."""
-    departments = db.query(User.department).distinct().all()
-    analytics = []
+def get_employee_analytics(db: Session, employee_id: int) -> dict:
+    """Get analytics for a specific employee."""
+    query, _ = _employee_analytics_query()
+    row = db.execute(query.where(User.id == employee_id)).first()
+    if not row:
+        return None
+    return _employee_analytics_row(row)
+
+def get_employees_analytics(db: Session, skip: int = 0, limit: int = 50, sort_by: str = "approval_rate",
+                            order: str = "desc", department: str = None):
+    """Get analytics for many employees in one grouped query, sorted and paginated in SQL."""
+    query, columns = _employee_analytics_query()
+    count_query = select(func.count(User.id))
+    if department:
+        query = query.where(User.department == department)
+        count_query = count_query.where(User.department == department)
     
-    for dept in departments:
-        dept_name = dept[0]
-        users = db.query(User).filter(User.department == dept_name).all()
-        employee_count = len(users)
-        
-        total_requests = db.query(LeaveRequest).join(User).filter(User.department == dept_name).count()
-        
-        if users:
-            total_balance = sum(
-                user.annual_leave + user.sick_leave + user.personal_leave + 
-                user.emergency_leave + user.maternity_leave + user.paternity_leave for user in users
-            )
-            average_balance = total_balance / len(users)
-        else:
-            average_balance = 0
-        
-        analytics.append({
-            "department": dept_name,
-            "employee_count": employee_count,
-            "total_requests": total_requests,
-            "average_leave_balance": round(average_balance, 2)
-        })
+    sort_column = columns.get(sort_by) if sort_by in columns else getattr(User, sort_by)
+    sort_column = sort_column.asc() if order == "asc" else sort_column.desc()
+    rows = db.execute(query.order_by(sort_column, User.id).offset(skip).limit(limit)).all()
+    total = db.execute(count_query).scalar()
     
-    return analytics
+    return [_employee_analytics_row(row) for row in rows], total
+
+def get_department_analytics(db: Session, start_date: datetime = None, end_date: datetime = None) -> List[dict]:
+    """
+    Get analytics by department in a single grouped query.
+    
+    Request counts and approved days cover leave requests overlapping the
+    optional date range; headcount and balances are always current.
+    """
+    employees = select(
+        User.department.label("department"),
+        func.count(User.id).label("employee_count"),
+        func.avg(
+            User.annual_leave + User.sick_leave + User.personal_leave +
+            User.emergency_leave + User.maternity_leave + User.paternity_leave
+        ).label("average_balance")
+    ).group_by(User.department).subquery()
+    
+    leave_columns = [
+        func.count(LeaveRequest.id).label("total_requests"),
+        *[
+            func.count(case((LeaveRequest.status == status, 1))).label(f"{status.value}_requests")
+            for status in (LeaveStatus.APPROVED, LeaveStatus.PENDING, LeaveStatus.REJECTED)
+        ],
+        *[
+            func.sum(case(
+                (and_(LeaveRequest.status == LeaveStatus.APPROVED, LeaveRequest.leave_type == leave_type), LeaveRequest.duration),
+                else_=0
+            )).label(f"{leave_type.value}_days")
+            for leave_type in LeaveType
+        ]
+    ]
+    leaves = select(User.department.label("department"), *leave_columns).join(
+        User, LeaveRequest.employee_id == User.id
+    )
+    if start_date:
+        leaves = leaves.where(LeaveRequest.end_date >= start_date)
+    if end_date:
+        leaves = leaves.where(LeaveRequest.start_date <= end_date)
+    leaves = leaves.group_by(User.department).subquery()
+    
+    rows = db.execute(
+        select(employees, *[leaves.c[column.name] for column in leave_columns])
+        .select_from(employees.outerjoin(leaves, leaves.c.department == employees.c.department))
+        .order_by(employees.c.department)
+    ).mappings().all()
+    
+    return [
+        {
+            "department": row["department"],
+            "employee_count": row["employee_count"],
+            "total_requests": row["total_requests"] or 0,
+            "average_leave_balance": round(float(row["average_balance"] or 0), 2),
+            "approved_requests": row["approved_requests"] or 0,
+            "pending_requests": row["pending_requests"] or 0,
+            "rejected_requests": row["rejected_requests"] or 0,
+            "days_by_leave_type": {
+                leave_type.value: row[f"{leave_type.value}_days"] or 0 for leave_type in LeaveType
+            }
+        }
+        for row in rows
+    ]
 
 # Leave Calendar operations
 def update_leave_calendar(db: Session, leave_request: LeaveRequest) -> None:
     """Update leave calendar when a leave request is approved."""
-    # Remove existing calendar entries for this leave request
-    db.query(LeaveCalendar).filter(LeaveCalendar.leave_request_id == leave_request.id).delete()
-    
-    # Add calendar entries for each day of the leave
-    current_date = leave_request.start_date
-    while current_date <= leave_request.end_date:
-        calendar_entry = LeaveCalendar(
-            employee_id=leave_request.employee_id,
-            leave_request_id=leave_request.id,
-            leave_date=current_date,
-            leave_type=leave_request.leave_type
-        )
-        db.add(calendar_entry)
-        current_date += timedelta(days=1)
+    # Replace the interval of this leave request
+    db.query(LeaveInterval).filter(LeaveInterval.leave_request_id == leave_request.id).delete()
+    db.add(leave_interval(leave_request))
 
-def get_employee_calendar(db: Session, employee_id: int, start_date: datetime, end_date: datetime) -> List[LeaveCalendar]:
-    """Get leave calendar entries for an employee within a date range."""
-    return db.query(LeaveCalendar).filter(
-        LeaveCalendar.employee_id == employee_id,
-        LeaveCalendar.leave_date >= start_date,
-        LeaveCalendar.leave_date <= end_date
-    ).order_by(LeaveCalendar.leave_date).all()
+def get_employee_calendar(db: Session, employee_id: int, start_date: datetime, end_date: datetime) -> List[CalendarDay]:
+    """Get leave calendar days for an employee within a date range."""
+    intervals = db.query(LeaveInterval).filter(
+        LeaveInterval.employee_id == employee_id,
+        overlapping(start_date, end_date)
+    ).all()
+    return expand(intervals, start_date, end_date)
 
 def get_all_employees_calendar(db: Session, start_date: datetime, end_date: datetime) -> List[dict]:
     """Get leave calendar for all employees within a date range."""
-    calendar_entries = db.query(LeaveCalendar).options(
-        joinedload(LeaveCalendar.employee),
-        joinedload(LeaveCalendar.leave_request)
-    ).filter(
-        LeaveCalendar.leave_date >= start_date,
-        LeaveCalendar.leave_date <= end_date
-    ).order_by(LeaveCalendar.leave_date, LeaveCalendar.employee_id).all()
+    intervals = db.query(LeaveInterval).options(
+        joinedload(LeaveInterval.employee)
+    ).filter(overlapping(start_date, end_date)).all()
+    employees = {interval.employee_id: interval.employee for interval in intervals}
     
     # Group by employee
     employees_calendar = {}
-    for entry in calendar_entries:
+    for entry in expand(intervals, start_date, end_date):
         emp_id = entry.employee_id
         if emp_id not in employees_calendar:
+            employee = employees[emp_id]
             employees_calendar[emp_id] = {
                 "employee": {
-                    "id": entry.employee.id,
-                    "name": entry.employee.name,
-                    "employee_id": entry.employee.employee_id,
-                    "department": entry.employee.department
+                    "id": employee.id,
+                    "name": employee.name,
+                    "employee_id": employee.employee_id,
+                    "department": employee.department
                 },
                 "leaves": []
             }
@@ -413,44 +715,77 @@ def get_all_employees_calendar(db: Session, start_date: datetime, end_date: date
 
 def remove_leave_calendar_entries(db: Session, leave_request_id: int) -> None:
     """Remove calendar entries for a leave request (when rejected or deleted)."""
-    db.query(LeaveCalendar).filter(LeaveCalendar.leave_request_id == leave_request_id).delete()
+    db.query(LeaveInterval).filter(LeaveInterval.leave_request_id == leave_request_id).delete()
 
 def expire_old_pending_leaves(db: Session) -> int:
-    """Mark pending leave requests as expired if their end date has passed."""
-    current_date = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
+    """
+    Mark pending leave requests as expired if their end date has passed.
     
-    # Find all pending leave requests where end_date has passed
-    expired_requests = db.query(LeaveRequest).filter(
-        LeaveRequest.status == LeaveStatus.PENDING,
-        LeaveRequest.end_date < current_date
-    ).all()
+    Uses one bulk UPDATE and one batched audit log insert, committed together.
+    """
+    current_date = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
+    expired_filter = and_(LeaveRequest.status == LeaveStatus.PENDING, LeaveRequest.end_date < current_date)
+    expired_columns = (LeaveRequest.id, LeaveRequest.employee_id, LeaveRequest.leave_type, LeaveRequest.start_date, LeaveRequest.end_date)
+    values = {"status": LeaveStatus.EXPIRED, "admin_comment": "Automatically expired - end date has passed"}
+    
+    if db.get_bind().dialect.update_returning:
+        expired_requests = db.execute(
+            update(LeaveRequest).where(expired_filter).values(**values).returning(*expired_columns),
+            execution_options={"synchronize_session": False}
+        ).all()
+    else:
+        expired_requests = db.execute(select(*expired_columns).where(expired_filter)).all()
+        if expired_requests:
+            db.execute(
+                update(LeaveRequest)
+                .where(LeaveRequest.id.in_([request.id for request in expired_requests]), expired_filter)
+                .values(**values),
+                execution_options={"synchronize_session": False}
+            )
     
-    count = 0
-    for request in expired_requests:
-        request.status = LeaveStatus.EXPIRED
-        request.admin_comment = "Automatically expired - end date has passed"
-        count += 1
-        
-        # Log the expiration
-        create_audit_log(
-            db=db,
-            user_id=request.employee_id,
-            action="leave_expired",
-            description=f"Leave request #{request.id} automatically expired",
-            details={
+    count = len(expired_requests)
+    if count == 0:
+        return 0
+    
+    timestamp = get_current_time()
+    db.execute(insert(AuditLog), [
+        {
+            "user_id": request.employee_id,
+            "action": "leave_expired",
+            "description": f"Leave request #{request.id} automatically expired",
+            "details": {
                 "leave_request_id": request.id,
                 "leave_type": request.leave_type.value,
                 "start_date": request.start_date.isoformat(),
                 "end_date": request.end_date.isoformat(),
                 "reason": "End date has passed without approval"
-            }
-        )
-    
-    if count > 0:
-        db.commit()
+            },
+            "leave_request_id": request.id,
+            "employee_id": request.employee_id,
+            "timestamp": timestamp
+        }
+        for request in expired_requests
+    ])
+    bump_system_counters(db, {"leave_requests_pending": -count, "leave_requests_expired": count})
+    bump_versions(db, VERSION_LEAVES, *(user_leaves_version(request.employee_id) for request in expired_requests))
+    db.commit()
+    audit_totals.invalidate()
     
     return count
 
+def _employee_on_leave(leave: LeaveRequest) -> dict:
+    return {
+        "employee_id": leave.employee.id,
+        "employee_name": leave.employee.name,
+        "employee_code": leave.employee.employee_id,
+        "department": leave.employee.department,
+        "leave_type": leave.leave_type,
+        "leave_request_id": leave.id,
+        "start_date": leave.start_date,
+        "end_date": leave.end_date,
+        "duration": leave.duration
+    }
+
 def get_employees_on_leave_by_date(db: Session, target_date: datetime) -> List[dict]:
     """Get all employees on leave for a specific date."""
     import pytz
@@ -469,25 +804,33 @@ def get_employees_on_leave_by_date(db: Session, target_date: datetime) -> List[d
         LeaveRequest.end_date >= target_date
     ).all()
     
-    employees_on_leave = []
-    for leave in leave_requests:
-        employees_on_leave.append({
-            "employee_id": leave.employee.id,
-            "employee_name": leave.employee.name,
-            "employee_code": leave.employee.employee_id,
-            "department": leave.employee.department,
-            "leave_type": leave.leave_type,
-            "leave_request_id": leave.id,
-            "start_date": leave.start_date,
-            "end_date": leave.end_date,
-            "duration": leave.duration
-        })
+    return [_employee_on_leave(leave) for leave in leave_requests]
+
+def group_leaves_by_date(leave_requests: List[LeaveRequest], start_date: datetime, end_date: datetime) -> dict:
+    """
+    Map each day in [start_date, end_date] ("YYYY-MM-DD") to the employees on leave that day.
+    
+    Each leave is added to the days it covers within the range, so the cost is
+    the number of leave days in the range plus the number of days, not days x
+    leaves. Days are compared on the dates' own calendar days.
+    """
+    first, last = start_date.date(), end_date.date()
+    days = [first + timedelta(days=offset) for offset in range((last - first).days + 1)]
+    on_leave = [[] for _ in days]
     
-    return employees_on_leave
+    for leave in leave_requests:
+        begin = max((leave.start_date.date() - first).days, 0)
+        stop = min((leave.end_date.date() - first).days, len(days) - 1)
+        if begin > stop:
+            continue
+        entry = _employee_on_leave(leave)
+        for offset in range(begin, stop + 1):
+            on_leave[offset].append(entry)
+    
+    return {day.strftime("%Y-%m-%d"): employees for day, employees in zip(days, on_leave)}
 
 def get_employees_on_leave_by_date_range(db: Session, start_date: datetime, end_date: datetime) -> dict:
     """Get all employees on leave grouped by date for a date range."""
-    from app.utils import get_current_time
     import pytz
     
     # Ensure start_date and end_date are timezone-aware
@@ -506,49 +849,32 @@ def get_employees_on_leave_by_date_range(db: Session, start_date: datetime, end_
         LeaveRequest.status == LeaveStatus.APPROVED,
         LeaveRequest.start_date <= end_date,
         LeaveRequest.end_date >= start_date
-    ).all()
-    
-    # Group by date
-    calendar_data = {}
-    current_date = start_date
+    ).order_by(LeaveRequest.start_date, LeaveRequest.id).all()
     
-    while current_date <= end_date:
-        date_str = current_date.strftime("%Y-%m-%d")
-        calendar_data[date_str] = []
-        
-        for leave in leave_requests:
-            # Ensure leave dates are timezone-aware for comparison
-            leave_start = leave.start_date
-            leave_end = leave.end_date
-            
-            if leave_start.tzinfo is None:
-                tz = pytz.timezone('Asia/Kolkata')
-                leave_start = tz.localize(leave_start)
-            if leave_end.tzinfo is None:
-                tz = pytz.timezone('Asia/Kolkata')
-                leave_end = tz.localize(leave_end)
-            
-            # Check if this leave includes the current date (compare dates only, ignore time)
-            current_date_only = current_date.date()
-            leave_start_only = leave_start.date()
-            leave_end_only = leave_end.date()
-            
-            if leave_start_only <= current_date_only <= leave_end_only:
-                calendar_data[date_str].append({
-                    "employee_id": leave.employee.id,
-                    "employee_name": leave.employee.name,
-                    "employee_code": leave.employee.employee_id,
-                    "department": leave.employee.department,
-                    "leave_type": leave.leave_type,
-                    "leave_request_id": leave.id,
-                    "start_date": leave.start_date,
-                    "end_date": leave.end_date,
-                    "duration": leave.duration
-                })
-        
-        current_date += timedelta(days=1)
+    return group_leaves_by_date(leave_requests, start_date, end_date)
+
+def iter_employees_on_leave_by_date_range(db: Session, start_date: datetime, end_date: datetime, batch_size: int = 500):
+    """
+    Yield ("YYYY-MM-DD", employees on leave) for each day in the range, in order.
+    
+    Streaming counterpart of get_employees_on_leave_by_date_range: leaves are
+    read in start date order from a server-side cursor and swept over the days,
+    so only the leaves covering the current day are held in memory.
+    """
+    start_date, end_date = make_aware(start_date), make_aware(end_date)
+    leave_requests = db.query(LeaveRequest).options(
+        joinedload(LeaveRequest.employee)
+    ).filter(
+        LeaveRequest.status == LeaveStatus.APPROVED,
+        LeaveRequest.start_date <= end_date,
+        LeaveRequest.end_date >= start_date
+    ).order_by(LeaveRequest.start_date, LeaveRequest.id).yield_per(batch_size)
     
-    return calendar_data
+    rows = ((leave.start_date.date(), leave.end_date.date(), _employee_on_leave(leave)) for leave in leave_requests)
+    for day, covering in sweep(rows, start_date.date(), end_date.date(),
+                               span=lambda row: (row[0], row[1]),
+                               order=lambda row: (row[0], row[2]["leave_request_id"])):
+        yield day.strftime("%Y-%m-%d"), [row[2] for row in covering]
 
 def get_upcoming_leaves(db: Session, days: int = 30) -> List[dict]:
     """Get all upcoming approved leaves starting from today."""
@@ -1,24 +1,141 @@
-from sqlalchemy import create_engine
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from app.config import settings
 
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+
+# Production SQLite profile: WAL, tuned pragmas, one writer connection and a
+# separate read-only pool. Not applied to in-memory databases.
+use_sqlite_profile = (
+    is_sqlite
+    and settings.SQLITE_PRODUCTION_PROFILE
+    and make_url(settings.DATABASE_URL).database not in (None, "", ":memory:")
+)
+
+def _set_sqlite_pragmas(dbapi_connection, read_only: bool = False):
+    cursor = dbapi_connection.cursor()
+    if not read_only:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    else:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+    cursor.close()
+
+def _create_sqlite_read_engine(url: str):
+    """Create a pooled, read-only engine on a SQLite database file."""
+    read_engine = create_engine(
+        f"sqlite:///file:{make_url(url).database}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        pool_pre_ping=True,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=settings.SQLITE_READ_POOL_SIZE
+    )
+    event.listen(read_engine, "connect", lambda dbapi_connection, record: _set_sqlite_pragmas(dbapi_connection, read_only=True))
+    return read_engine
+
 # Create SQLAlchemy engine
 # Remove SQLite-specific connect_args for PostgreSQL
 connect_args = {}
-if "sqlite" in settings.DATABASE_URL:
+if is_sqlite:
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_size=10,  # Connection pool size
-    max_overflow=20  # Max overflow connections
-)
+if use_sqlite_profile:
+    # SQLite allows a single writer at a time; queue writers on one pooled
+    # connection instead of letting them fail with "database is locked".
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args=connect_args,
+        pool_pre_ping=True,
+        pool_size=settings.SQLITE_WRITER_POOL_SIZE,
+        max_overflow=0
+    )
+    event.listen(engine, "connect", lambda dbapi_connection, record: _set_sqlite_pragmas(dbapi_connection))
+    
+    # Readers never block the writer under WAL; give them their own read-only pool
+    read_engine = _create_sqlite_read_engine(settings.DATABASE_URL)
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        connect_args=connect_args,
+        pool_pre_ping=True,  # Verify connections before using them
+        pool_size=10,  # Connection pool size
+        max_overflow=20  # Max overflow connections
+    )
+    read_engine = engine
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+def _create_replica_engine(url: str):
+    if url.startswith("sqlite"):
+        return _create_sqlite_read_engine(url)
+    return create_engine(url, pool_pre_ping=True, pool_size=10, max_overflow=20)
+
+class ReadRouter:
+    """Routes read-only sessions to replicas.
+
+    Replicas are picked round-robin. A user who has just written is pinned to
+    the primary for REPLICA_STICKY_SECONDS so they read their own writes while
+    replicas catch up.
+
+    Stickiness is tracked per worker process, so read-your-writes only holds
+    with a single worker: under several gunicorn workers a read served by
+    another worker can still hit a lagging replica.
+    """
+
+    def __init__(self, primary_factory, replica_factories, sticky_seconds: float):
+        self.primary_factory = primary_factory
+        self.replica_factories = replica_factories
+        self.sticky_seconds = sticky_seconds
+        self._counter = itertools.count()
+        self._recent_writes = {}  # user_id -> sticky until (monotonic)
+        self._lock = threading.Lock()
+
+    @property
+    def has_replicas(self) -> bool:
+        return bool(self.replica_factories)
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        if user_id is None or not self.has_replicas:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._recent_writes[user_id] = now + self.sticky_seconds
+            if len(self._recent_writes) > 10000:
+                self._recent_writes = {key: until for key, until in self._recent_writes.items() if until > now}
+
+    def is_sticky(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        with self._lock:
+            until = self._recent_writes.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    def session(self, user_id: Optional[int] = None) -> Session:
+        if not self.has_replicas or self.is_sticky(user_id):
+            return self.primary_factory()
+        index = next(self._counter) % len(self.replica_factories)
+        return self.replica_factories[index]()
+
+replica_engines = [_create_replica_engine(url) for url in settings.DATABASE_REPLICA_URLS]
+read_router = ReadRouter(
+    ReadSessionLocal,
+    [sessionmaker(autocommit=False, autoflush=False, bind=replica) for replica in replica_engines],
+    sticky_seconds=settings.REPLICA_STICKY_SECONDS
+)
 
 # Create Base class
 Base = declarative_base()
@@ -30,3 +147,81 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to get a read-only database session for GET handlers that never write.
+# Served by a replica when DATABASE_REPLICA_URLS is set (see ReadRouter).
+def get_read_db(request: Request):
+    db = read_router.session(getattr(request.state, "user_id", None))
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency for reads that must never lag, such as authentication: the
+# primary database (on its read-only pool under the SQLite profile), never a replica.
+def get_primary_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@contextmanager
+def primary_read_session():
+    """Read-only session on the primary, for code outside a request dependency."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@contextmanager
+def read_session(user_id: Optional[int] = None):
+    """Read-only session for code running outside a request dependency."""
+    db = read_router.session(user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL to its async driver (aiosqlite / asyncpg)."""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    scheme, _, rest = url.partition("://")
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme.startswith("postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    return url
+
+# Optional async engine, used by the async route variants when ASYNC_DB_ENABLED is set
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB_ENABLED and use_sqlite_profile:
+    # The async engine would be a second, independent writer pool next to the
+    # profile's single writer connection, bringing back "database is locked"
+    raise RuntimeError(
+        "ASYNC_DB_ENABLED cannot be combined with the SQLite production profile; "
+        "set SQLITE_PRODUCTION_PROFILE=false or use PostgreSQL"
+    )
+
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    
+    async_url = get_async_database_url(settings.DATABASE_URL)
+    async_engine_args = {"pool_pre_ping": True}
+    if not async_url.startswith("sqlite"):
+        async_engine_args.update(pool_size=10, max_overflow=20)
+    async_engine = create_async_engine(async_url, **async_engine_args)
+    
+    # Objects stay usable after commit so responses can be built without lazy IO
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Dependency to get an async database session
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database access is disabled; set ASYNC_DB_ENABLED=true")
+    async with AsyncSessionLocal() as db:
+        yield db
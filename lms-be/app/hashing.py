@@ -0,0 +1,142 @@
+"""
+Password hashing service.
+
+pbkdf2 is deliberately CPU-bound, so hashing and verification run in a
+bounded process pool instead of the request thread. This keeps the Starlette
+threadpool free and avoids GIL contention during login storms. Set
+PASSWORD_HASH_WORKERS=0 to hash without a pool (useful for scripts): blocking
+calls then hash inline and async calls in the event loop's default executor,
+never on the loop itself.
+
+A request waits at most PASSWORD_HASH_TIMEOUT_SECONDS for the pool and then
+gets PasswordHashTimeout (503 from the API) instead of holding its thread.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_contexts = {}
+
+
+class PasswordHashTimeout(Exception):
+    """The hashing pool did not answer within the timeout."""
+
+
+def build_context(rounds: int) -> CryptContext:
+    """Build a CryptContext whose hashes are out of date unless they use ``rounds``."""
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+def _context(rounds: int) -> CryptContext:
+    context = _contexts.get(rounds)
+    if context is None:
+        context = _contexts[rounds] = build_context(rounds)
+    return context
+
+
+# Worker entry points (module level so they can be pickled)
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> Tuple[bool, Optional[str]]:
+    try:
+        return _context(rounds).verify_and_update(password, hashed_password)
+    except ValueError:
+        # Unknown or malformed hash
+        return False, None
+
+
+class PasswordHasher:
+    """Runs pbkdf2 work in a lazily started, bounded process pool."""
+
+    def __init__(self, rounds: int, workers: int, timeout: Optional[float] = None):
+        self.rounds = rounds
+        self.workers = workers
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn avoids forking a process that already runs threads
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    logger.info(f"Started password hashing pool with {self.workers} worker(s)")
+        return self._pool
+
+    def _run(self, fn, *args):
+        pool = self._executor()
+        if pool is None:
+            return fn(*args)
+        future = pool.submit(fn, *args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHashTimeout(f"Password hashing did not finish within {self.timeout}s")
+
+    async def _run_async(self, fn, *args):
+        pool = self._executor()
+        if pool is None:
+            # Keep CPU-bound hashing off the event loop
+            future = asyncio.get_running_loop().run_in_executor(None, fn, *args)
+        else:
+            future = asyncio.wrap_future(pool.submit(fn, *args))
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            raise PasswordHashTimeout(f"Password hashing did not finish within {self.timeout}s")
+
+    # Blocking API (waits on the pool without holding the GIL)
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self.verify_and_update(password, hashed_password)[0]
+
+    def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password. Returns (valid, new_hash) where new_hash is set when the stored cost is outdated."""
+        return self._run(_verify_and_update, password, hashed_password, self.rounds)
+
+    # Async API
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(_hash, password, self.rounds)
+
+    async def verify_async(self, password: str, hashed_password: str) -> bool:
+        return (await self.verify_and_update_async(password, hashed_password))[0]
+
+    async def verify_and_update_async(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await self._run_async(_verify_and_update, password, hashed_password, self.rounds)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_HASH_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS or None
+)
@@ -1,86 +1,276 @@
 """
-Public holidays data for Gujarat, India (2020-2030)
+Regional public holiday calendars.
+
+Each region's holidays are read from a data file named after the region in
+app/holiday_calendars (or HOLIDAY_CALENDAR_DIR, whose files take precedence):
+``<region>.csv`` with date,name,type columns, or ``<region>.ics`` with one
+all-day VEVENT per holiday (CATEGORIES gives the type). A user's region picks
+their calendar; users without one get DEFAULT_HOLIDAY_REGION.
+
+Every calendar is compiled once at import into a HolidayIndex:
+
+- one 366-bit set per year (bit n is day n of the year) for holiday tests;
+- a date-keyed map and sorted ordinals for listings and bisect range queries;
+- each covered day's date string, weekday name and holiday, precomputed.
+
+Compiled calendars are cached as JSON in HOLIDAY_CACHE_DIR, keyed by the
+SHA-256 of the source file, so a restart with unchanged files parses nothing.
 """
-from datetime import datetime, timedelta
-from typing import List, Dict
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from app.config import settings
 from app.utils import get_current_time
 
-# Gujarat public holidays
-HOLIDAYS = [
-    # 2025
-    {"date": "2025-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2025-03-14", "name": "Holi", "type": "religious"},
-    {"date": "2025-03-31", "name": "Eid ul-Fitr", "type": "religious"},
-    {"date": "2025-04-10", "name": "Mahavir Jayanti", "type": "religious"},
-    {"date": "2025-04-14", "name": "Ambedkar Jayanti", "type": "national"},
-    {"date": "2025-04-18", "name": "Good Friday", "type": "religious"},
-    {"date": "2025-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2025-05-12", "name": "Buddha Purnima", "type": "religious"},
-    {"date": "2025-06-07", "name": "Eid ul-Adha", "type": "religious"},
-    {"date": "2025-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2025-08-16", "name": "Parsi New Year", "type": "religious"},
-    {"date": "2025-08-27", "name": "Janmashtami", "type": "religious"},
-    {"date": "2025-09-06", "name": "Ganesh Chaturthi", "type": "religious"},
-    {"date": "2025-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2025-10-02", "name": "Dussehra", "type": "religious"},
-    {"date": "2025-10-21", "name": "Diwali", "type": "religious"},
-    {"date": "2025-10-22", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2025-11-05", "name": "Guru Nanak Jayanti", "type": "religious"},
-    {"date": "2025-12-25", "name": "Christmas", "type": "religious"},
+logger = logging.getLogger(__name__)
+
+BUNDLED_CALENDAR_DIR = Path(__file__).parent / "holiday_calendars"
+YEAR_BYTES = 46  # 366 bits
+CACHE_VERSION = 1
+
+
+class DayInfo(NamedTuple):
+    """Calendar metadata for one day."""
+    date: str
+    day_of_week: str
+    holiday: Optional[Dict]  # {"name", "type"} of the day's first holiday
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _year_start(year: int) -> int:
+    return date(year, 1, 1).toordinal()
+
+
+def compile_bits(ordinals: List[int]) -> Dict[int, bytearray]:
+    """Per-year bitsets with the bit of each holiday's day of the year set."""
+    bits: Dict[int, bytearray] = {}
+    for ordinal in ordinals:
+        year = date.fromordinal(ordinal).year
+        offset = ordinal - _year_start(year)
+        bits.setdefault(year, bytearray(YEAR_BYTES))[offset >> 3] |= 1 << (offset & 7)
+    return bits
+
+
+class HolidayIndex:
+    """One region's holidays as per-year bitsets, a date map, sorted ordinals and per-day metadata."""
     
-    # 2026
-    {"date": "2026-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2026-03-03", "name": "Holi", "type": "religious"},
-    {"date": "2026-03-21", "name": "Eid ul-Fitr", "type": "religious"},
-    {"date": "2026-03-30", "name": "Mahavir Jayanti", "type": "religious"},
-    {"date": "2026-04-03", "name": "Good Friday", "type": "religious"},
-    {"date": "2026-04-14", "name": "Ambedkar Jayanti", "type": "national"},
-    {"date": "2026-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2026-05-31", "name": "Buddha Purnima", "type": "religious"},
-    {"date": "2026-05-28", "name": "Eid ul-Adha", "type": "religious"},
-    {"date": "2026-08-05", "name": "Parsi New Year", "type": "religious"},
-    {"date": "2026-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2026-08-15", "name": "Janmashtami", "type": "religious"},
-    {"date": "2026-08-25", "name": "Ganesh Chaturthi", "type": "religious"},
-    {"date": "2026-09-21", "name": "Dussehra", "type": "religious"},
-    {"date": "2026-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2026-10-09", "name": "Diwali", "type": "religious"},
-    {"date": "2026-10-10", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2026-11-24", "name": "Guru Nanak Jayanti", "type": "religious"},
-    {"date": "2026-12-25", "name": "Christmas", "type": "religious"},
-]
-
-
-def get_holidays(start_date: datetime, end_date: datetime) -> List[Dict]:
-    """Get holidays within a date range."""
-    start_str = start_date.strftime("%Y-%m-%d")
-    end_str = end_date.strftime("%Y-%m-%d")
+    def __init__(self, region: str, entries: List[Tuple[int, Dict]], bits: Optional[Dict[int, bytearray]] = None):
+        # entries are (ordinal, holiday) pairs sorted by ordinal
+        self.region = region
+        self.digest: Optional[str] = None  # SHA-256 of the source file
+        self._holidays = [holiday for _, holiday in entries]
+        self._ordinals = [ordinal for ordinal, _ in entries]
+        self._by_date: Dict[int, List[Dict]] = {}
+        for ordinal, holiday in entries:
+            self._by_date.setdefault(ordinal, []).append(holiday)
+        self._bits = bits if bits is not None else compile_bits(self._ordinals)
+        self._year_starts = {year: _year_start(year) for year in self._bits}
+        
+        # Whole years covered by the calendar, one DayInfo per day
+        self._first = _year_start(date.fromordinal(self._ordinals[0]).year) if entries else 0
+        last = _year_start(date.fromordinal(self._ordinals[-1]).year + 1) - 1 if entries else -1
+        self._days = [self._describe(date.fromordinal(ordinal)) for ordinal in range(self._first, last + 1)]
+    
+    def _describe(self, day: date) -> DayInfo:
+        holidays = self._by_date.get(day.toordinal())
+        holiday = {"name": holidays[0]["name"], "type": holidays[0]["type"]} if holidays else None
+        return DayInfo(day.strftime("%Y-%m-%d"), day.strftime("%A"), holiday)
+    
+    def is_holiday(self, day) -> bool:
+        """Bit test for a date (or a datetime's date)."""
+        day = _as_date(day)
+        bits = self._bits.get(day.year)
+        if bits is None:
+            return False
+        offset = day.toordinal() - self._year_starts[day.year]
+        return bool(bits[offset >> 3] >> (offset & 7) & 1)
+    
+    @property
+    def first_day(self) -> date:
+        """First day of the years the calendar covers."""
+        return date.fromordinal(self._first)
+    
+    @property
+    def last_day(self) -> date:
+        """Last day of the years the calendar covers."""
+        return date.fromordinal(self._first + len(self._days) - 1)
+    
+    def on(self, day) -> List[Dict]:
+        """Holidays falling on a date (or a datetime's date)."""
+        return self._by_date.get(_as_date(day).toordinal(), [])
     
-    filtered_holidays = [
-        h for h in HOLIDAYS
-        if start_str <= h["date"] <= end_str
+    def between(self, start, end) -> List[Dict]:
+        """Holidays from start to end inclusive, in date order."""
+        first = bisect_left(self._ordinals, _as_date(start).toordinal())
+        last = bisect_right(self._ordinals, _as_date(end).toordinal())
+        return self._holidays[first:last]
+    
+    def day(self, value) -> DayInfo:
+        """Date string, weekday name and holiday of a day."""
+        offset = _as_date(value).toordinal() - self._first
+        if 0 <= offset < len(self._days):
+            return self._days[offset]
+        return self._describe(_as_date(value))
+
+
+def _read_csv(text: str) -> List[Dict]:
+    return [
+        {"date": date.fromisoformat(row["date"].strip()).isoformat(), "name": row["name"].strip(),
+         "type": (row.get("type") or "public").strip()}
+        for row in csv.DictReader(io.StringIO(text)) if (row.get("date") or "").strip()
     ]
+
+
+def _ics_text(value: str) -> str:
+    return value.replace("\\,", ",").replace("\\;", ";").replace("\\n", " ").replace("\\\\", "\\")
+
+
+def _read_ics(text: str) -> List[Dict]:
+    holidays, event = [], None
+    for line in re.sub(r"\r?\n[ \t]", "", text).splitlines():
+        if line == "BEGIN:VEVENT":
+            event = {}
+        elif line == "END:VEVENT":
+            if event and "DTSTART" in event:
+                start = datetime.strptime(event["DTSTART"][:8], "%Y%m%d").date()
+                # All-day DTEND is exclusive
+                end = datetime.strptime(event["DTEND"][:8], "%Y%m%d").date() if "DTEND" in event else start
+                name = _ics_text(event.get("SUMMARY", "Holiday"))
+                kind = _ics_text(event.get("CATEGORIES", "")).split(",")[0].strip().lower() or "public"
+                holidays.extend(
+                    {"date": (start + timedelta(days=offset)).isoformat(), "name": name, "type": kind}
+                    for offset in range(max((end - start).days, 1))
+                )
+            event = None
+        elif event is not None and ":" in line:
+            key, value = line.split(":", 1)
+            event[key.split(";", 1)[0].upper()] = value.strip()
+    return holidays
+
+
+PARSERS = {".csv": _read_csv, ".ics": _read_ics}
+
+
+def _read_cache(path: Optional[Path], digest: str, region: str) -> Optional[HolidayIndex]:
+    if path is None or not path.exists():
+        return None
+    try:
+        cached = json.loads(path.read_text())
+        if cached.get("version") != CACHE_VERSION or cached.get("sha256") != digest:
+            return None
+        entries = [(ordinal, {"date": day, "name": name, "type": kind}) for ordinal, day, name, kind in cached["holidays"]]
+        bits = {int(year): bytearray.fromhex(value) for year, value in cached["years"].items()}
+        return HolidayIndex(region, entries, bits)
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Ignoring holiday calendar cache {path}: {e}")
+        return None
+
+
+def _write_cache(path: Optional[Path], digest: str, index: HolidayIndex) -> None:
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps({
+            "version": CACHE_VERSION,
+            "sha256": digest,
+            "holidays": [
+                [ordinal, holiday["date"], holiday["name"], holiday["type"]]
+                for ordinal, holiday in zip(index._ordinals, index._holidays)
+            ],
+            "years": {str(year): bits.hex() for year, bits in index._bits.items()}
+        }))
+        os.replace(temporary, path)
+    except OSError as e:
+        logger.warning(f"Could not cache holiday calendar {path}: {e}")
+
+
+def load_calendar(region: str, path: Path) -> HolidayIndex:
+    """Compile a region's calendar file, or reuse its cached compilation."""
+    source = path.read_bytes()
+    digest = hashlib.sha256(source).hexdigest()
+    cache_path = Path(settings.HOLIDAY_CACHE_DIR) / f"{region}.json" if settings.HOLIDAY_CACHE_DIR else None
+    index = _read_cache(cache_path, digest, region)
+    if index is None:
+        holidays = PARSERS[path.suffix.lower()](source.decode("utf-8-sig"))
+        entries = sorted(((date.fromisoformat(holiday["date"]).toordinal(), holiday) for holiday in holidays), key=lambda entry: entry[0])
+        index = HolidayIndex(region, entries)
+        _write_cache(cache_path, digest, index)
+    index.digest = digest
+    return index
+
+
+def _load_calendars() -> Dict[str, HolidayIndex]:
+    files: Dict[str, Path] = {}
+    directories = [BUNDLED_CALENDAR_DIR] + ([Path(settings.HOLIDAY_CALENDAR_DIR)] if settings.HOLIDAY_CALENDAR_DIR else [])
+    for directory in directories:
+        if directory.is_dir():
+            for path in sorted(directory.iterdir()):
+                if path.suffix.lower() in PARSERS:
+                    files[path.stem.lower()] = path
     
-    return filtered_holidays
+    calendars = {region: load_calendar(region, path) for region, path in files.items()}
+    if settings.DEFAULT_HOLIDAY_REGION.lower() not in calendars:
+        raise RuntimeError(f"No holiday calendar file for DEFAULT_HOLIDAY_REGION '{settings.DEFAULT_HOLIDAY_REGION}'")
+    return calendars
+
+
+CALENDARS = _load_calendars()
+
+# Changes whenever a calendar file does; part of holiday-dependent ETags
+HOLIDAYS_VERSION = hashlib.sha256(
+    "".join(f"{region}:{CALENDARS[region].digest};" for region in sorted(CALENDARS)).encode()
+).hexdigest()[:16]
+
 
+def regions() -> List[str]:
+    """Regions with a holiday calendar."""
+    return sorted(CALENDARS)
 
-def get_upcoming_holidays(days: int = 90) -> List[Dict]:
+
+def has_region(region: str) -> bool:
+    return region.lower() in CALENDARS
+
+
+def get_calendar(region: Optional[str] = None) -> HolidayIndex:
+    """A region's calendar; no region (or one whose file was removed) gets the default region's."""
+    calendar = CALENDARS.get(region.lower()) if region else None
+    return calendar or CALENDARS[settings.DEFAULT_HOLIDAY_REGION.lower()]
+
+
+# Default region's calendar
+HOLIDAY_INDEX = get_calendar()
+
+
+def get_holidays(start_date: datetime, end_date: datetime, region: Optional[str] = None) -> List[Dict]:
+    """Get holidays within a date range."""
+    return get_calendar(region).between(start_date, end_date)
+
+
+def get_upcoming_holidays(days: int = 90, region: Optional[str] = None) -> List[Dict]:
     """Get upcoming holidays from today (IST timezone)."""
     today = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = today + timedelta(days=days)
     
-    return get_holidays(today, end_date)
+    return get_holidays(today, end_date, region)
 
 
-def is_holiday(date: datetime) -> tuple:
+def is_holiday(date: datetime, region: Optional[str] = None) -> tuple:
     """Check if a date is a holiday. Returns (is_holiday, holiday_name)."""
-    date_str = date.strftime("%Y-%m-%d")
-    
-    for holiday in HOLIDAYS:
-        if holiday["date"] == date_str:
-            return (True, holiday["name"])
+    calendar = get_calendar(region)
+    if calendar.is_holiday(date):
+        return (True, calendar.on(date)[0]["name"])
     
     return (False, None)
-
-
-from datetime import timedelta
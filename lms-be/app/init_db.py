@@ -2,7 +2,7 @@
 Initialize database with default admin user and employee users if not exists.
 """
 from sqlalchemy.orm import Session
-from app.database import SessionLocal, engine, Base
+from app.database import SessionLocal
 from app.models import User, UserRole, Gender
 from app.auth import get_password_hash
 import logging
@@ -29,10 +29,7 @@ EMPLOYEES = [
 ]
 
 def init_database():
-    """Initialize database with default data."""
-    # Create tables
-    Base.metadata.create_all(bind=engine)
-    
+    """Initialize database with default data (tables are created by app.bootstrap)."""
     # Create session
     db = SessionLocal()
     
@@ -102,5 +99,7 @@ def init_database():
         db.close()
 
 if __name__ == "__main__":
+    from app.bootstrap import migrate
     logging.basicConfig(level=logging.INFO)
+    migrate()
     init_database()
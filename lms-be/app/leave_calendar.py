@@ -0,0 +1,134 @@
+"""
+Interval-based leave calendar.
+
+Approving a leave used to insert one leave_calendar row per day, so a 90-day
+leave wrote 90 rows. Approved leaves are now stored once in leave_intervals
+as (start_date, end_date, days) and expanded to days only when a response is
+built.
+
+Overlap queries (intervals touching [start, end]) use the (start_date,
+end_date) indexes. ``start_date <= end`` alone would scan every interval that
+ever started before the range, so it is also bounded below by the longest
+allowed leave: nothing that starts more than MAX_LEAVE_SPAN_DAYS - 1 days
+before the range can reach into it. The leave routes reject longer requests.
+
+``leave_calendar`` stays available as a read-only view with the old per-day
+columns for reports and external readers (migration 0003 creates it).
+"""
+import heapq
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Tuple
+from sqlalchemy import and_
+from app.config import settings
+from app.models import LeaveInterval, LeaveType
+
+
+class CalendarDay(NamedTuple):
+    """One day of an approved leave, shaped like the old leave_calendar rows."""
+    employee_id: int
+    leave_request_id: int
+    leave_date: date
+    leave_type: LeaveType
+
+
+def day_start(value) -> datetime:
+    """Midnight of a datetime's (or a date's) day."""
+    if not isinstance(value, datetime):
+        return datetime.combine(value, time())
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def span_days(start, end) -> int:
+    """Calendar days from `start` to `end`, both inclusive."""
+    return (day_start(end) - day_start(start)).days + 1
+
+
+def leave_interval(leave_request) -> LeaveInterval:
+    """The calendar interval of an approved leave request."""
+    return LeaveInterval(
+        employee_id=leave_request.employee_id,
+        leave_request_id=leave_request.id,
+        leave_type=leave_request.leave_type,
+        start_date=day_start(leave_request.start_date),
+        end_date=day_start(leave_request.end_date),
+        days=span_days(leave_request.start_date, leave_request.end_date)
+    )
+
+
+def overlapping(start: datetime, end: datetime):
+    """Filter for intervals with at least one day in [start, end]."""
+    return and_(
+        LeaveInterval.start_date >= day_start(start) - timedelta(days=settings.MAX_LEAVE_SPAN_DAYS - 1),
+        LeaveInterval.start_date <= end,
+        LeaveInterval.end_date >= day_start(start)
+    )
+
+
+def interval_dates(interval: LeaveInterval, start: datetime, end: datetime) -> Iterator[date]:
+    """The days of `interval` that fall in [start, end]."""
+    day = max(interval.start_date.date(), start.date())
+    last = min(interval.end_date.date(), end.date())
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+def expand(intervals, start: datetime, end: datetime) -> List[CalendarDay]:
+    """Per-day entries of `intervals` within [start, end], by date then employee."""
+    days = [
+        CalendarDay(interval.employee_id, interval.leave_request_id, day, interval.leave_type)
+        for interval in intervals
+        for day in interval_dates(interval, start, end)
+    ]
+    days.sort(key=lambda entry: (entry.leave_date, entry.employee_id))
+    return days
+
+
+def sweep(rows: Iterable, first: date, last: date, span: Callable, order: Callable) -> Iterator[Tuple[date, list]]:
+    """
+    Yield (day, rows covering that day) for each day in [first, last].
+    
+    `rows` must arrive ordered by their first day and `span(row)` returns the
+    row's (first day, last day). Only rows covering the current day are held,
+    so memory is bounded by the busiest day, not by the range length. Each
+    day's rows are sorted by `order`.
+    """
+    rows = iter(rows)
+    upcoming = next(rows, None)
+    active = []  # heap of (last day, arrival, row)
+    arrival = 0
+    day = first
+    while day <= last:
+        while upcoming is not None and span(upcoming)[0] <= day:
+            ends = span(upcoming)[1]
+            if ends >= day:
+                heapq.heappush(active, (ends, arrival, upcoming))
+                arrival += 1
+            upcoming = next(rows, None)
+        while active and active[0][0] < day:
+            heapq.heappop(active)
+        yield day, sorted((row for _, _, row in active), key=order)
+        day += timedelta(days=1)
+
+
+# Read-only per-day view over leave_intervals with the old leave_calendar columns
+CALENDAR_VIEW_DDL = {
+    "sqlite": """CREATE VIEW IF NOT EXISTS leave_calendar AS
+    WITH RECURSIVE offsets(interval_id, n) AS (
+        SELECT id, 0 FROM leave_intervals
+        UNION ALL
+        SELECT offsets.interval_id, offsets.n + 1 FROM offsets
+        JOIN leave_intervals ON leave_intervals.id = offsets.interval_id
+        WHERE offsets.n + 1 < leave_intervals.days
+    )
+    SELECT row_number() OVER (ORDER BY i.id, o.n) AS id,
+        i.employee_id, i.leave_request_id,
+        datetime(i.start_date, '+' || o.n || ' days') AS leave_date,
+        i.leave_type, i.created_at
+    FROM leave_intervals i JOIN offsets o ON o.interval_id = i.id""",
+    "postgresql": """CREATE OR REPLACE VIEW leave_calendar AS
+    SELECT (row_number() OVER (ORDER BY i.id, d.leave_date))::integer AS id,
+        i.employee_id, i.leave_request_id, d.leave_date, i.leave_type, i.created_at
+    FROM leave_intervals i
+    CROSS JOIN LATERAL generate_series(i.start_date, i.end_date, interval '1 day') AS d(leave_date)""",
+}
@@ -1,49 +1,29 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from app.config import settings
-from app.database import engine, Base
+from app.hashing import password_hasher, PasswordHashTimeout
+from app.database import async_engine, read_router
+from app.auth import get_token_subject
+from app.scheduler import scheduler
+from app.audit import audit_sink
 from app.routes import auth_routes, employee_routes, leave_routes, admin_routes, log_routes, analytics_routes, holiday_routes
+from app import bootstrap
 import logging
 
-# Create database tables and seed default data if empty
-Base.metadata.create_all(bind=engine)
-
-# Initialize default users (admin + employees) if they don't exist
-from app.init_db import init_database
-init_database()
-
-# Populate sample leave data if no leave requests exist
-def _seed_leaves():
-    from app.database import SessionLocal
-    from app.models import LeaveRequest
-    db = SessionLocal()
-    try:
-        if db.query(LeaveRequest).count() == 0:
-            db.close()
-            import sys
-            from pathlib import Path
-            # Add the project root so scripts module is importable
-            project_root = str(Path(__file__).parent.parent)
-            if project_root not in sys.path:
-                sys.path.insert(0, project_root)
-            from scripts.populate_realistic_leaves import populate_leaves
-            populate_leaves(leaves_per_employee=5)
-        else:
-            db.close()
-    except Exception as e:
-        db.close()
-        logging.warning(f"Could not seed leave data: {e}")
-
-_seed_leaves()
+logger = logging.getLogger("app.startup")
 
 app = FastAPI(
     title="LeaveXact API",
     description="A comprehensive leave management system API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -53,15 +33,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Middleware for request processing
 @app.middleware("http")
 async def request_middleware(request: Request, call_next):
     """Process requests."""
+    # Track who is calling so read sessions can keep a user on the primary after their own writes
+    if read_router.has_replicas:
+        request.state.user_id = get_token_subject(request.headers.get("authorization"))
+    
     response = await call_next(request)
+    
+    if read_router.has_replicas and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        read_router.mark_write(request.state.user_id)
     return response
 
+# Async variants of the hot paths are registered first so they take precedence
+if settings.ASYNC_DB_ENABLED:
+    for prefix in ("/api/auth", "/auth"):
+        app.include_router(auth_routes.async_router, prefix=prefix, tags=["Authentication (Async)"])
+    for prefix in ("/api/leaves", "/api/leave", "/leaves"):
+        app.include_router(leave_routes.async_router, prefix=prefix, tags=["Leave Requests (Async)"])
+    for prefix in ("/api/admin", "/admin"):
+        app.include_router(admin_routes.async_router, prefix=prefix, tags=["Admin (Async)"])
+
 # Include routers
 app.include_router(auth_routes.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(auth_routes.router, prefix="/auth", tags=["Authentication (Legacy)"])
@@ -78,6 +75,41 @@ app.include_router(log_routes.router, prefix="/logs", tags=["Audit Logs (Legacy)
 app.include_router(analytics_routes.router, prefix="/api/analytics", tags=["Analytics"])
 app.include_router(holiday_routes.router, prefix="/api", tags=["Holidays"])
 
+@app.on_event("startup")
+def check_schema():
+    """Verify the schema version; migrations and seeding belong to `python -m app.bootstrap`."""
+    logger.info(f"startup phase 'import' took {(time.perf_counter() - _import_started) * 1000:.1f} ms")
+    
+    phase_started = time.perf_counter()
+    version = bootstrap.get_schema_version()
+    logger.info(f"startup phase 'schema_check' took {(time.perf_counter() - phase_started) * 1000:.1f} ms")
+    
+    if version != bootstrap.SCHEMA_VERSION:
+        if not settings.AUTO_BOOTSTRAP:
+            raise RuntimeError(
+                f"Database schema version is {version}, expected {bootstrap.SCHEMA_VERSION}. "
+                "Run `python -m app.bootstrap` before starting the API."
+            )
+        phase_started = time.perf_counter()
+        bootstrap.bootstrap()
+        logger.info(f"startup phase 'bootstrap' took {(time.perf_counter() - phase_started) * 1000:.1f} ms")
+    
+    if settings.AUDIT_SINK_ENABLED:
+        audit_sink.start()
+    
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
+    
+    logger.info(f"startup complete in {(time.perf_counter() - _import_started) * 1000:.1f} ms")
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    scheduler.stop()
+    audit_sink.stop()
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {"message": "LeaveXact API is running", "version": "1.0.0"}
@@ -104,6 +136,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": "Validation error", "errors": errors}
     )
 
+@app.exception_handler(PasswordHashTimeout)
+async def password_hash_timeout_handler(request: Request, exc: PasswordHashTimeout):
+    """Password hashing is saturated; ask the client to retry."""
+    logging.warning(f"{exc}")
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please try again"},
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Text, ForeignKey, Index, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
-from app.utils import get_current_time
+from app.utils import get_current_time, normalize_audit_details, audit_detail_columns
 
 class UserRole(str, enum.Enum):
     ADMIN = "admin"
@@ -37,8 +38,9 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     password_hash = Column(String(255), nullable=False)
     role = Column(Enum(UserRole), default=UserRole.EMPLOYEE, nullable=False)
-    department = Column(String(100), nullable=False)
+    department = Column(String(100), nullable=False, index=True)
     gender = Column(Enum(Gender), nullable=True)
+    region = Column(String(50), nullable=True)  # Holiday calendar region; None uses DEFAULT_HOLIDAY_REGION
     
     # Leave balances
     annual_leave = Column(Integer, default=20, nullable=False)
@@ -75,6 +77,19 @@ class LeaveRequest(Base):
     
     # Relationships
     employee = relationship("User", back_populates="leave_requests")
+    
+    __table_args__ = (
+        # Per-employee status rollups (department analytics, balances, my requests)
+        Index("ix_leave_requests_employee_status", "employee_id", "status"),
+        # Approved leaves overlapping a date or range (who's on leave, upcoming leaves)
+        Index("ix_leave_requests_status_dates", "status", "start_date", "end_date"),
+        # Pending requests past their end date (expiry job); stays small
+        Index(
+            "ix_leave_requests_pending_end_date", "end_date",
+            sqlite_where=text("status = 'PENDING'"),
+            postgresql_where=text("status = 'PENDING'")
+        ),
+    )
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
@@ -83,20 +98,46 @@ class AuditLog(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     action = Column(String(50), nullable=False)
     description = Column(Text, nullable=False)
-    details = Column(Text, nullable=True)  # JSON string for additional details
+    details = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)
+    # Copied out of details for lookups (no foreign keys: history outlives deleted leaves and users)
+    leave_request_id = Column(Integer, nullable=True)
+    employee_id = Column(Integer, nullable=True)
     timestamp = Column(DateTime(timezone=True), default=get_current_time)
     
     # Relationships
     user = relationship("User", back_populates="audit_logs")
+    
+    @validates("details")
+    def _fill_detail_columns(self, key, details):
+        details = normalize_audit_details(details)
+        for column, value in audit_detail_columns(details).items():
+            setattr(self, column, value)
+        return details
+    
+    __table_args__ = (
+        # Keyset pagination of the log, newest first
+        Index("ix_audit_logs_timestamp_id", "timestamp", "id"),
+        # Log filtered by action, newest first
+        Index("ix_audit_logs_action_timestamp", "action", "timestamp"),
+        # A user's log, newest first (and deleting a user's entries)
+        Index("ix_audit_logs_user_timestamp", "user_id", "timestamp"),
+        # History of one leave request / one employee's record
+        Index("ix_audit_logs_leave_request_timestamp", "leave_request_id", "timestamp"),
+        Index("ix_audit_logs_employee_timestamp", "employee_id", "timestamp"),
+    )
 
-class LeaveCalendar(Base):
-    __tablename__ = "leave_calendar"
+# Approved leaves on the calendar, one row per leave (leave_calendar is now a per-day view of these)
+class LeaveInterval(Base):
+    __tablename__ = "leave_intervals"
     
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     leave_request_id = Column(Integer, ForeignKey("leave_requests.id"), nullable=False)
-    leave_date = Column(DateTime(timezone=True), nullable=False, index=True)
     leave_type = Column(Enum(LeaveType), nullable=False)
+    # Midnight of the first and last day, both inclusive
+    start_date = Column(DateTime(timezone=True), nullable=False)
+    end_date = Column(DateTime(timezone=True), nullable=False)
+    days = Column(Integer, nullable=False)
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=get_current_time)
@@ -104,3 +145,32 @@ class LeaveCalendar(Base):
     # Relationships
     employee = relationship("User")
     leave_request = relationship("LeaveRequest")
+    
+    __table_args__ = (
+        # Overlap with a date range: start_date is bounded on both sides using MAX_LEAVE_SPAN_DAYS
+        Index("ix_leave_intervals_dates", "start_date", "end_date"),
+        # An employee's calendar over a date range
+        Index("ix_leave_intervals_employee_dates", "employee_id", "start_date", "end_date"),
+        # Rewriting or removing the interval of one leave request
+        Index("ix_leave_intervals_leave_request", "leave_request_id"),
+    )
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime(timezone=True), default=get_current_time)
+
+class SystemCounter(Base):
+    __tablename__ = "system_counters"
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, default=0, nullable=False)
+
+class JobLock(Base):
+    __tablename__ = "job_locks"
+    
+    name = Column(String(50), primary_key=True)
+    owner = Column(String(100), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
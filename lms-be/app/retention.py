@@ -0,0 +1,236 @@
+"""
+Tiered audit log retention.
+
+Audit rows older than AUDIT_RETENTION_DAYS move out of the audit_logs table
+into compressed monthly archive segments in AUDIT_ARCHIVE_DIR:
+
+    audit-2025-01.jsonl.gz   one JSON line per entry, as the API returns it
+                             (user snapshot included), one gzip member per batch
+    audit-2025-01.json       sidecar index: segment size, row count, id and
+                             timestamp range, rows per day and per action,
+                             ids of the last batch
+
+The scheduler runs ``archive_audit_logs`` periodically on one worker. It moves
+at most AUDIT_RETENTION_BATCH_SIZE rows per transaction: the batch is written
+and fsynced to its segments, the sidecars are updated, and only then are the
+rows deleted, so each write lock is brief and a crash never loses an entry.
+An unaccounted tail left by a crash is truncated on the next append. Rows
+archived but not yet deleted are selected again by the next run; an append
+skips ids of the segment's last batch, so they are neither written nor
+counted twice.
+
+``get_audit_logs_for_day`` serves /api/logs/ date filters that reach past the
+hot window by merging the day's archived entries with any still in the table.
+"""
+import gzip
+import io
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session, joinedload
+from app.config import settings
+from app.models import AuditLog
+from app.schemas import AuditLogResponse
+from app.search import SEARCH_DETAIL_KEYS, search_terms
+from app.utils import get_current_time, normalize_audit_details
+
+logger = logging.getLogger(__name__)
+
+
+def _month(timestamp: datetime) -> str:
+    return timestamp.strftime("%Y-%m")
+
+
+class AuditArchive:
+    """Monthly gzip JSONL segments of archived audit entries, each with a JSON sidecar index."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+
+    def segment_path(self, month: str) -> Path:
+        return self.directory / f"audit-{month}.jsonl.gz"
+
+    def index_path(self, month: str) -> Path:
+        return self.directory / f"audit-{month}.json"
+
+    def index(self, month: str) -> Optional[dict]:
+        try:
+            with open(self.index_path(month), "r", encoding="utf-8") as index_file:
+                return json.load(index_file)
+        except FileNotFoundError:
+            return None
+
+    def append(self, month: str, records: List[dict]) -> None:
+        """
+        Append `records` (API dicts) to the month's segment as one gzip member and update its sidecar.
+
+        Records already in the segment's last batch (archived by a run that
+        crashed before deleting them) are skipped.
+        """
+        if not records:
+            return
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            index = self.index(month) or {
+                "month": month, "size": 0, "count": 0,
+                "min_id": None, "max_id": None, "first_timestamp": None, "last_timestamp": None,
+                "days": {}, "actions": {}, "last_batch_ids": []
+            }
+            archived = set(index.get("last_batch_ids", []))
+            batch_ids = [record["id"] for record in records]
+            records = [record for record in records if record["id"] not in archived]
+            # Everything in this batch is in the segment from here on, skipped or not
+            index["last_batch_ids"] = batch_ids
+            if not records:
+                return
+            payload = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+
+            with open(self.segment_path(month), "ab") as segment:
+                # Drop a member written before a crash that never made it into the sidecar
+                segment.truncate(index["size"])
+                segment.seek(index["size"])
+                segment.write(gzip.compress(payload.encode("utf-8")))
+                segment.flush()
+                os.fsync(segment.fileno())
+                index["size"] = segment.tell()
+
+            ids = [record["id"] for record in records]
+            timestamps = sorted(record["timestamp"] for record in records)
+            index["count"] += len(records)
+            index["min_id"] = min(ids + ([index["min_id"]] if index["min_id"] is not None else []))
+            index["max_id"] = max(ids + ([index["max_id"]] if index["max_id"] is not None else []))
+            index["first_timestamp"] = min(filter(None, [index["first_timestamp"], timestamps[0]]))
+            index["last_timestamp"] = max(filter(None, [index["last_timestamp"], timestamps[-1]]))
+            for record in records:
+                day = record["timestamp"][:10]
+                index["days"][day] = index["days"].get(day, 0) + 1
+                index["actions"][record["action"]] = index["actions"].get(record["action"], 0) + 1
+
+            temporary = self.index_path(month).with_suffix(".json.tmp")
+            with open(temporary, "w", encoding="utf-8") as index_file:
+                json.dump(index, index_file, separators=(",", ":"))
+                index_file.flush()
+                os.fsync(index_file.fileno())
+            os.replace(temporary, self.index_path(month))
+
+    def read(self, month: str):
+        """Yield the archived records of a month, each id once."""
+        index = self.index(month)
+        if index is None:
+            return
+        with open(self.segment_path(month), "rb") as segment:
+            # Stop at the sidecar's size so a batch being appended is not read half-written
+            compressed = io.BytesIO(segment.read(index["size"]))
+        seen = set()
+        with gzip.GzipFile(fileobj=compressed) as lines:
+            for line in lines:
+                record = json.loads(line)
+                if record["id"] not in seen:
+                    seen.add(record["id"])
+                    yield record
+
+    def has_day(self, day: datetime) -> bool:
+        index = self.index(_month(day))
+        return bool(index and index["days"].get(day.strftime("%Y-%m-%d")))
+
+
+audit_archive = AuditArchive(settings.AUDIT_ARCHIVE_DIR)
+
+
+def retention_cutoff() -> Optional[datetime]:
+    """Start of the hot window; entries older than this belong in the archive. None if retention is off."""
+    if settings.AUDIT_RETENTION_DAYS <= 0:
+        return None
+    today = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+
+
+def archive_audit_logs(db: Session, batch_size: int = None, max_batches: int = None) -> int:
+    """Move audit rows older than the retention horizon into the archive; returns how many moved."""
+    from app.audit import audit_totals
+
+    cutoff = retention_cutoff()
+    if cutoff is None:
+        return 0
+    batch_size = batch_size or settings.AUDIT_RETENTION_BATCH_SIZE
+    max_batches = max_batches or settings.AUDIT_RETENTION_MAX_BATCHES
+
+    moved = 0
+    for _ in range(max_batches):
+        rows = db.query(AuditLog).options(joinedload(AuditLog.user)).filter(
+            AuditLog.timestamp < cutoff
+        ).order_by(AuditLog.timestamp, AuditLog.id).limit(batch_size).all()
+        if not rows:
+            break
+
+        by_month: Dict[str, List[dict]] = {}
+        for row in rows:
+            by_month.setdefault(_month(row.timestamp), []).append(
+                AuditLogResponse.model_validate(row).model_dump(mode="json")
+            )
+        for month, records in by_month.items():
+            audit_archive.append(month, records)
+
+        db.query(AuditLog).filter(AuditLog.id.in_([row.id for row in rows])).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+        audit_totals.invalidate()
+        moved += len(rows)
+
+        if len(rows) < batch_size:
+            break
+        # Let request writers in between batches
+        time.sleep(settings.AUDIT_RETENTION_PAUSE_MS / 1000)
+
+    if moved:
+        logger.info(f"Archived {moved} audit entries older than {cutoff.date()}")
+    return moved
+
+
+def reaches_archive(day: datetime) -> bool:
+    """Whether a date filter on `day` needs archived entries."""
+    cutoff = retention_cutoff()
+    if cutoff is not None and day.replace(tzinfo=None) < cutoff.replace(tzinfo=None):
+        return True
+    return audit_archive.has_day(day)
+
+
+def _record_matches(record: dict, terms: List[str]) -> bool:
+    """Match an archived record the way the full-text index does: every term prefixes an indexed word."""
+    user = record.get("user") or {}
+    fields = [record.get("description"), user.get("name"), user.get("email")]
+    details = normalize_audit_details(record.get("details"))
+    if details:
+        fields.extend(str(details[key]) for key in SEARCH_DETAIL_KEYS if details.get(key) is not None)
+    words = set(search_terms(" ".join(filter(None, fields))))
+    return all(any(word.startswith(term) for word in words) for term in terms)
+
+
+def get_audit_logs_for_day(db: Session, day: datetime, search: str = None, action: str = None) -> List[AuditLogResponse]:
+    """All entries of one day, hot and archived, newest first."""
+    from app.crud import get_all_audit_logs
+
+    records = {
+        log.id: AuditLogResponse.model_validate(log)
+        for log in get_all_audit_logs(db, search=search, action=action, date=day)
+    }
+
+    if audit_archive.has_day(day):
+        day_prefix = day.strftime("%Y-%m-%d")
+        terms = search_terms(search) if search else []
+        for record in audit_archive.read(_month(day)):
+            if record["id"] in records or not record["timestamp"].startswith(day_prefix):
+                continue
+            if action and action.lower() != "all" and record["action"] != action:
+                continue
+            if terms and not _record_matches(record, terms):
+                continue
+            records[record["id"]] = AuditLogResponse.model_validate(record)
+
+    return sorted(records.values(), key=lambda log: (log.timestamp, log.id), reverse=True)
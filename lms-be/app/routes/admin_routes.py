@@ -1,44 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, timedelta
-from app.database import get_db
+from app.database import get_db, get_read_db, get_async_db, read_session
 from app.schemas import LeaveRequestResponse, LeaveRequestApproval, UserResponse, AdminCalendarResponse, EmployeeOnLeave
 from app import crud, auth
+from app.config import settings
 from app.models import User, LeaveRequest, LeaveStatus
+from app.streaming import check_stream_range, wants_ndjson, ndjson_response
+from app.serialization import serialized_response, leave_request_items, user_items
+from app.calendar_cache import calendar_cache
+from app.conditional import conditional_get, conditional_get_async
 
 router = APIRouter()
 
+# Async variants of the hot paths, mounted ahead of `router` when ASYNC_DB_ENABLED is set
+async_router = APIRouter()
+
 @router.get("/employees", response_model=List[UserResponse])
 def get_all_employees(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("users"))
 ):
     """Get all employees (admin only)."""
-    employees = crud.get_users(db, skip=skip, limit=limit, search=search, department=department)
-    return employees
+    rows = crud.get_user_rows(db, skip=skip, limit=limit, search=search, department=department)
+    return serialized_response(request, user_items(rows), List[UserResponse], headers=cache_headers)
 
 @router.get("/leaves/", response_model=List[LeaveRequestResponse])
 def get_all_leave_requests(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
     employee_id: Optional[int] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
 ):
     """Get all leave requests (admin only)."""
-    # Automatically expire old pending leaves
-    crud.expire_old_pending_leaves(db)
-    
     # If employee_id is provided, filter by that employee
     user_id = employee_id if employee_id else None
-    leave_requests = crud.get_leave_requests(db, skip=skip, limit=limit, user_id=user_id, status=status)
-    return leave_requests
+    rows = crud.get_leave_request_rows(db, skip=skip, limit=limit, user_id=user_id, status=status)
+    return serialized_response(request, leave_request_items(rows), List[LeaveRequestResponse], headers=cache_headers)
 
 @router.put("/leaves/{request_id}/approve", response_model=LeaveRequestResponse)
 def approve_leave_request(
@@ -131,11 +141,13 @@ def reject_leave_request(
 
 @router.get("/calendar", response_model=List[AdminCalendarResponse])
 def get_admin_calendar(
+    request: Request,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     date: Optional[str] = Query(None, description="Single date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
 ):
     """
     Get admin calendar showing employees on leave.
@@ -162,6 +174,10 @@ def get_admin_calendar(
         ]
       }
     ]
+    
+    With `Accept: application/x-ndjson` a date range is streamed instead, one
+    day object per line, and is capped by CALENDAR_STREAM_MAX_DAYS instead of
+    ADMIN_CALENDAR_MAX_DAYS.
     """
     try:
         if date:
@@ -181,9 +197,13 @@ def get_admin_calendar(
             if start > end:
                 raise HTTPException(status_code=400, detail="Start date must be before end date")
             
-            # Limit to 90 days to prevent excessive queries
-            if (end - start).days > 90:
-                raise HTTPException(status_code=400, detail="Date range cannot exceed 90 days")
+            if wants_ndjson(request):
+                check_stream_range(start, end)
+                return ndjson_response(_stream_admin_calendar(start, end, current_user.id), headers=cache_headers)
+            
+            # Limit the range to keep responses bounded
+            if (end - start).days > settings.ADMIN_CALENDAR_MAX_DAYS:
+                raise HTTPException(status_code=400, detail=f"Date range cannot exceed {settings.ADMIN_CALENDAR_MAX_DAYS} days")
             
             calendar_data = crud.get_employees_on_leave_by_date_range(db, start, end)
             
@@ -207,20 +227,33 @@ def get_admin_calendar(
         raise HTTPException(status_code=400, detail=f"Invalid date format. Use YYYY-MM-DD: {str(e)}")
 
 
+def _stream_admin_calendar(start: datetime, end: datetime, user_id: int):
+    # Request dependencies are closed before a streamed body is sent
+    with read_session(user_id) as db:
+        for date_str, employees in crud.iter_employees_on_leave_by_date_range(db, start, end):
+            yield {
+                "date": date_str,
+                "employees_on_leave": employees,
+                "total_employees_on_leave": len(employees)
+            }
+
 
 @router.get("/calendar/holidays")
 def get_holidays(
     days: int = Query(90, ge=1, le=365, description="Number of days to look ahead"),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
-    current_user: User = Depends(auth.get_current_admin_user)
+    region: Optional[str] = Query(None, description="Holiday region (defaults to DEFAULT_HOLIDAY_REGION)"),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("holidays", "today"))
 ):
     """
-    Get public holidays for Gujarat, India.
+    Get public holidays of a region (Gujarat, India by default).
     
     Usage patterns:
     1. Upcoming holidays: ?days=90 (returns holidays for next 90 days)
     2. Date range: ?start_date=2025-11-01&end_date=2025-12-31 (returns holidays in range)
+    Add ?region=<name> for another region's calendar.
     
     Response format:
     {
@@ -234,7 +267,10 @@ def get_holidays(
       "total_count": 1
     }
     """
-    from app.holidays import get_holidays as get_holidays_data, get_upcoming_holidays
+    from app.holidays import get_holidays as get_holidays_data, get_upcoming_holidays, has_region
+    
+    if region and not has_region(region):
+        raise HTTPException(status_code=400, detail=f"Unknown holiday region: {region}")
     
     try:
         if start_date and end_date:
@@ -244,9 +280,9 @@ def get_holidays(
             if start > end:
                 raise HTTPException(status_code=400, detail="Start date must be before end date")
             
-            holidays = get_holidays_data(start, end)
+            holidays = get_holidays_data(start, end, region)
         else:
-            holidays = get_upcoming_holidays(days=days)
+            holidays = get_upcoming_holidays(days=days, region=region)
         
         return {
             "holidays": holidays,
@@ -254,3 +290,53 @@ def get_holidays(
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format. Use YYYY-MM-DD: {str(e)}")
+
+@router.get("/cache/stats")
+def get_cache_stats(current_user: User = Depends(auth.get_current_admin_user)):
+    """Get in-process cache statistics for this worker (admin only)."""
+    return {
+        "user_cache": auth.user_cache.stats(),
+        "calendar_cache": calendar_cache.stats()
+    }
+
+# Async handlers (see leave_routes): sync handlers run via run_sync on the async session
+@async_router.get("/leaves/", response_model=List[LeaveRequestResponse])
+async def get_all_leave_requests_async(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None),
+    employee_id: Optional[int] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_admin_user_async),
+    cache_headers: dict = Depends(conditional_get_async("leaves", "users"))
+):
+    """Get all leave requests (admin only)."""
+    rows = await db.run_sync(lambda session: crud.get_leave_request_rows(
+        session, skip=skip, limit=limit, user_id=employee_id or None, status=status
+    ))
+    return serialized_response(request, leave_request_items(rows), List[LeaveRequestResponse], headers=cache_headers)
+
+@async_router.put("/leaves/{request_id}/approve", response_model=LeaveRequestResponse)
+async def approve_leave_request_async(
+    request_id: int,
+    approval: LeaveRequestApproval,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_admin_user_async)
+):
+    """Approve a leave request (admin only)."""
+    return await db.run_sync(lambda session: LeaveRequestResponse.model_validate(
+        approve_leave_request(request_id, approval, db=session, current_user=current_user)
+    ))
+
+@async_router.put("/leaves/{request_id}/reject", response_model=LeaveRequestResponse)
+async def reject_leave_request_async(
+    request_id: int,
+    rejection: LeaveRequestApproval,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_admin_user_async)
+):
+    """Reject a leave request (admin only)."""
+    return await db.run_sync(lambda session: LeaveRequestResponse.model_validate(
+        reject_leave_request(request_id, rejection, db=session, current_user=current_user)
+    ))
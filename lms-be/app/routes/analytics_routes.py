@@ -1,17 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.database import get_db
-from app.schemas import SystemSummary, EmployeeAnalytics, DepartmentAnalytics
+from typing import List, Optional
+from datetime import datetime
+from app.database import get_db, get_read_db
+from app.schemas import SystemSummary, EmployeeAnalytics, EmployeeAnalyticsPage, DepartmentAnalytics
 from app import crud, auth
 from app.models import User
+from app.conditional import conditional_get
 
 router = APIRouter()
 
 @router.get("/summary", response_model=SystemSummary)
 def get_system_summary(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
 ):
     """Get system summary statistics (admin only)."""
     summary = crud.get_system_summary(db)
@@ -20,8 +23,9 @@ def get_system_summary(
 @router.get("/employee/{employee_id}", response_model=EmployeeAnalytics)
 def get_employee_analytics(
     employee_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
 ):
     """Get analytics for a specific employee (admin only)."""
     analytics = crud.get_employee_analytics(db, employee_id=employee_id)
@@ -29,13 +33,53 @@ def get_employee_analytics(
         raise HTTPException(status_code=404, detail="Employee not found")
     return analytics
 
+@router.get("/employees", response_model=EmployeeAnalyticsPage)
+def get_employees_analytics(
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    sort_by: str = Query("approval_rate", description="approval_rate, days_taken, total_requests, name or employee_id"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    department: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
+):
+    """Get analytics for all employees, paginated and sorted (admin only)."""
+    if sort_by not in crud.EMPLOYEE_ANALYTICS_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort_by. Use one of: {', '.join(crud.EMPLOYEE_ANALYTICS_SORTS)}"
+        )
+    
+    skip = (page - 1) * limit
+    items, total = crud.get_employees_analytics(
+        db, skip=skip, limit=limit, sort_by=sort_by, order=order, department=department
+    )
+    
+    return {
+        "items": items,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "total_pages": (total + limit - 1) // limit
+    }
+
 @router.get("/departments", response_model=List[DepartmentAnalytics])
 def get_department_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
 ):
-    """Get analytics by department (admin only)."""
-    analytics = crud.get_department_analytics(db)
+    """Get analytics by department, optionally limited to leaves in a date range (admin only)."""
+    try:
+        start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
+        end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    
+    analytics = crud.get_department_analytics(db, start_date=start_dt, end_date=end_dt)
     return analytics
 
 @router.post("/expire-old-leaves")
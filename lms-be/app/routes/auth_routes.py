@@ -7,6 +7,9 @@ from app.models import User
 
 router = APIRouter()
 
+# Async variants of the hot paths, mounted ahead of `router` when ASYNC_DB_ENABLED is set
+async_router = APIRouter()
+
 @router.post("/register", response_model=UserResponse)
 def register_user(user: UserCreate, db: Session = Depends(get_db)):
     """Register a new user (admin only)."""
@@ -23,9 +26,9 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/login", response_model=Token)
-def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login_user(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Login user and return JWT token."""
-    user = auth.authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await auth.authenticate_user_async(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -54,6 +57,9 @@ async def logout():
 @router.post("/change-password")
 def change_password(payload: ChangePasswordRequest, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
     """Change password for the currently authenticated user."""
+    # current_user is loaded on the read-only session; modify this session's copy
+    current_user = crud.get_user(db, user_id=current_user.id)
+    
     # Verify current password
     if not auth.verify_password(payload.current_password, current_user.password_hash):
         raise HTTPException(
@@ -64,7 +70,9 @@ def change_password(payload: ChangePasswordRequest, db: Session = Depends(get_db
     # Update to new password
     current_user.password_hash = auth.get_password_hash(payload.new_password)
     db.add(current_user)
+    crud.bump_versions(db, crud.VERSION_USERS)
     db.commit()
+    auth.invalidate_user(current_user.id)
     
     # Log the action
     crud.create_audit_log(
@@ -80,10 +88,15 @@ def change_password(payload: ChangePasswordRequest, db: Session = Depends(get_db
 @router.put("/profile", response_model=UserResponse)
 def update_own_profile(profile_update: UpdateOwnProfileRequest, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
     """Update current user's own name."""
+    # current_user is loaded on the read-only session; modify this session's copy
+    current_user = crud.get_user(db, user_id=current_user.id)
+    
     # Update name
     current_user.name = profile_update.name
     db.add(current_user)
+    crud.bump_versions(db, crud.VERSION_USERS)
     db.commit()
+    auth.invalidate_user(current_user.id)
     db.refresh(current_user)
     
     # Log the action
@@ -100,6 +113,9 @@ def update_own_profile(profile_update: UpdateOwnProfileRequest, db: Session = De
 @router.post("/change-email")
 def change_email(payload: ChangeEmailRequest, db: Session = Depends(get_db), current_user: User = Depends(auth.get_current_user)):
     """Change email for the currently authenticated user."""
+    # current_user is loaded on the read-only session; modify this session's copy
+    current_user = crud.get_user(db, user_id=current_user.id)
+    
     # Verify password for security
     if not auth.verify_password(payload.password, current_user.password_hash):
         raise HTTPException(
@@ -128,7 +144,9 @@ def change_email(payload: ChangeEmailRequest, db: Session = Depends(get_db), cur
     # Update email
     current_user.email = payload.new_email.lower()
     db.add(current_user)
+    crud.bump_versions(db, crud.VERSION_USERS)
     db.commit()
+    auth.invalidate_user(current_user.id)
     
     # Log the action
     crud.create_audit_log(
@@ -148,6 +166,9 @@ def update_own_profile_full(profile_update: UpdateOwnProfileFullRequest, db: Ses
     This endpoint allows users (both employees and admins) to update their own profile information.
     If changing email, password is required for verification.
     """
+    # current_user is loaded on the read-only session; modify this session's copy
+    current_user = crud.get_user(db, user_id=current_user.id)
+    
     updates = {}
     old_values = {}
     
@@ -220,7 +241,9 @@ def update_own_profile_full(profile_update: UpdateOwnProfileFullRequest, db: Ses
     
     # Save changes
     db.add(current_user)
+    crud.bump_versions(db, crud.VERSION_USERS)
     db.commit()
+    auth.invalidate_user(current_user.id)
     db.refresh(current_user)
     
     # Log the action
@@ -237,3 +260,13 @@ def update_own_profile_full(profile_update: UpdateOwnProfileFullRequest, db: Ses
     )
     
     return current_user
+
+@async_router.get("/me", response_model=UserResponse)
+async def get_current_user_info_async(current_user: User = Depends(auth.get_current_user_async)):
+    """Get current user information."""
+    return current_user
+
+@async_router.get("/profile", response_model=UserResponse)
+async def get_user_profile_async(current_user: User = Depends(auth.get_current_user_async)):
+    """Get current user profile (alias for /me)."""
+    return current_user
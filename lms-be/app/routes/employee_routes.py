@@ -1,31 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.schemas import UserCreate, UserUpdate, UserResponse, PaginatedResponse
 from app import crud, auth
 from app.models import User
+from app.conditional import conditional_get
+from app.serialization import serialized_response, user_items
 
 router = APIRouter()
 
 @router.get("/", response_model=List[UserResponse])
 def get_employees(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("users"))
 ):
     """Get all employees with pagination and filtering (admin only)."""
-    employees = crud.get_users(db, skip=skip, limit=limit, search=search, department=department)
-    return employees
+    rows = crud.get_user_rows(db, skip=skip, limit=limit, search=search, department=department)
+    return serialized_response(request, user_items(rows), List[UserResponse], headers=cache_headers)
 
 @router.get("/{employee_id}", response_model=UserResponse)
 def get_employee(
     employee_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_admin_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_admin_user),
+    cache_headers: dict = Depends(conditional_get("users"))
 ):
     """Get employee by ID (admin only)."""
     employee = crud.get_user(db, user_id=employee_id)
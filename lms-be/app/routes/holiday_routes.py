@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException
 from typing import Optional
 from datetime import datetime
+from app.conditional import public_conditional_get
 
 router = APIRouter()
 
@@ -8,16 +9,22 @@ router = APIRouter()
 def get_holidays(
     days: int = Query(90, ge=1, le=365, description="Number of days to look ahead"),
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
-    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)")
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    region: Optional[str] = Query(None, description="Holiday region (defaults to DEFAULT_HOLIDAY_REGION)"),
+    cache_headers: dict = Depends(public_conditional_get("holidays", "today"))
 ):
     """
-    Get public holidays for Gujarat, India.
+    Get public holidays of a region (Gujarat, India by default).
     
     Usage patterns:
     1. Upcoming holidays: ?days=90 (returns holidays for next 90 days)
     2. Date range: ?start_date=2025-11-01&end_date=2025-12-31 (returns holidays in range)
+    Add ?region=<name> for another region's calendar.
     """
-    from app.holidays import get_holidays as get_holidays_data, get_upcoming_holidays
+    from app.holidays import get_holidays as get_holidays_data, get_upcoming_holidays, has_region
+    
+    if region and not has_region(region):
+        raise HTTPException(status_code=400, detail=f"Unknown holiday region: {region}")
     
     try:
         if start_date and end_date:
@@ -27,9 +34,9 @@ def get_holidays(
             if start > end:
                 raise HTTPException(status_code=400, detail="Start date must be before end date")
             
-            holidays = get_holidays_data(start, end)
+            holidays = get_holidays_data(start, end, region)
         else:
-            holidays = get_upcoming_holidays(days=days)
+            holidays = get_upcoming_holidays(days=days, region=region)
         
         return {
             "holidays": holidays,
@@ -37,3 +44,14 @@ def get_holidays(
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Invalid date format. Use YYYY-MM-DD: {str(e)}")
+
+@router.get("/holidays/regions")
+def get_holiday_regions(cache_headers: dict = Depends(public_conditional_get("holidays"))):
+    """List the regions with a holiday calendar and the default region."""
+    from app.config import settings
+    from app.holidays import regions
+    
+    return {
+        "regions": regions(),
+        "default_region": settings.DEFAULT_HOLIDAY_REGION.lower()
+    }
@@ -1,269 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime, date
-from app.database import get_db
-from app.schemas import LeaveRequestCreate, LeaveRequestUpdate, LeaveRequestResponse, LeaveRequestApproval
+from datetime import datetime, date, timedelta
+from app.database import get_db, get_read_db, get_async_db, read_session
+from app.schemas import LeaveRequestCreate, LeaveRequestUpdate, LeaveRequestResponse, LeaveRequestApproval, AuditLogResponse
 from app import crud, auth
+from app.audit import audit_sink
+from app.config import settings
 from app.utils import get_current_time
-from app.models import User, LeaveRequest, LeaveStatus
+from app.models import User, LeaveRequest, LeaveStatus, LeaveInterval
+from app.leave_calendar import overlapping, expand, span_days, sweep
+from app.streaming import check_stream_range, wants_ndjson, ndjson_response
+from app.serialization import serialized_response, leave_request_items
+from app.holidays import HolidayIndex, get_calendar, has_region
+from app.working_days import leave_duration
+from app.calendar_cache import get_calendar_range
+from app.conditional import conditional_get, conditional_get_async
 
 router = APIRouter()
 
-# Gujarat Public Holidays 2020-2030
-GUJARAT_HOLIDAYS = [
-    # 2020
-    {"date": "2020-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2020-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2020-03-10", "name": "Holi", "type": "public"},
-    {"date": "2020-04-02", "name": "Ram Navami", "type": "public"},
-    {"date": "2020-04-06", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2020-04-10", "name": "Good Friday", "type": "public"},
-    {"date": "2020-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2020-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2020-05-07", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2020-05-25", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2020-08-01", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2020-08-11", "name": "Janmashtami", "type": "public"},
-    {"date": "2020-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2020-08-22", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2020-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2020-10-25", "name": "Dussehra", "type": "public"},
-    {"date": "2020-11-14", "name": "Diwali", "type": "public"},
-    {"date": "2020-11-15", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2020-11-30", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2020-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2021
-    {"date": "2021-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2021-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2021-03-11", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2021-03-29", "name": "Holi", "type": "public"},
-    {"date": "2021-04-02", "name": "Good Friday", "type": "public"},
-    {"date": "2021-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2021-04-21", "name": "Ram Navami", "type": "public"},
-    {"date": "2021-04-25", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2021-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2021-05-13", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2021-05-26", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2021-07-21", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2021-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2021-08-30", "name": "Janmashtami", "type": "public"},
-    {"date": "2021-09-10", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2021-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2021-10-15", "name": "Dussehra", "type": "public"},
-    {"date": "2021-11-04", "name": "Diwali", "type": "public"},
-    {"date": "2021-11-05", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2021-11-19", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2021-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2022
-    {"date": "2022-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2022-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2022-03-01", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2022-03-18", "name": "Holi", "type": "public"},
-    {"date": "2022-04-10", "name": "Ram Navami", "type": "public"},
-    {"date": "2022-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2022-04-14", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2022-04-15", "name": "Good Friday", "type": "public"},
-    {"date": "2022-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2022-05-03", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2022-05-16", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2022-07-10", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2022-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2022-08-19", "name": "Janmashtami", "type": "public"},
-    {"date": "2022-08-31", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2022-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2022-10-05", "name": "Dussehra", "type": "public"},
-    {"date": "2022-10-24", "name": "Diwali", "type": "public"},
-    {"date": "2022-10-25", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2022-11-08", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2022-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2023
-    {"date": "2023-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2023-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2023-02-18", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2023-03-08", "name": "Holi", "type": "public"},
-    {"date": "2023-03-30", "name": "Ram Navami", "type": "public"},
-    {"date": "2023-04-04", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2023-04-07", "name": "Good Friday", "type": "public"},
-    {"date": "2023-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2023-04-22", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2023-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2023-05-05", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2023-06-29", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2023-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2023-09-07", "name": "Janmashtami", "type": "public"},
-    {"date": "2023-09-19", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2023-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2023-10-24", "name": "Dussehra", "type": "public"},
-    {"date": "2023-11-12", "name": "Diwali", "type": "public"},
-    {"date": "2023-11-13", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2023-11-27", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2023-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2024
-    {"date": "2024-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2024-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2024-03-08", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2024-03-25", "name": "Holi", "type": "public"},
-    {"date": "2024-03-29", "name": "Good Friday", "type": "public"},
-    {"date": "2024-04-11", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2024-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2024-04-17", "name": "Ram Navami", "type": "public"},
-    {"date": "2024-04-21", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2024-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2024-05-23", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2024-06-17", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2024-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2024-08-26", "name": "Janmashtami", "type": "public"},
-    {"date": "2024-09-07", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2024-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2024-10-12", "name": "Dussehra", "type": "public"},
-    {"date": "2024-10-31", "name": "Diwali", "type": "public"},
-    {"date": "2024-11-01", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2024-11-15", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2024-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2025
-    {"date": "2025-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2025-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2025-02-26", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2025-03-14", "name": "Holi", "type": "public"},
-    {"date": "2025-03-31", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2025-04-06", "name": "Ram Navami", "type": "public"},
-    {"date": "2025-04-10", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2025-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2025-04-18", "name": "Good Friday", "type": "public"},
-    {"date": "2025-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2025-05-12", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2025-06-07", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2025-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2025-08-16", "name": "Janmashtami", "type": "public"},
-    {"date": "2025-08-27", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2025-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2025-10-02", "name": "Dussehra", "type": "public"},
-    {"date": "2025-10-20", "name": "Diwali", "type": "public"},
-    {"date": "2025-10-21", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2025-11-05", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2025-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2026
-    {"date": "2026-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2026-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2026-02-16", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2026-03-04", "name": "Holi", "type": "public"},
-    {"date": "2026-03-21", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2026-03-27", "name": "Ram Navami", "type": "public"},
-    {"date": "2026-03-30", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2026-04-03", "name": "Good Friday", "type": "public"},
-    {"date": "2026-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2026-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2026-05-01", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2026-05-28", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2026-08-05", "name": "Janmashtami", "type": "public"},
-    {"date": "2026-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2026-09-16", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2026-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2026-10-21", "name": "Dussehra", "type": "public"},
-    {"date": "2026-11-08", "name": "Diwali", "type": "public"},
-    {"date": "2026-11-09", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2026-11-24", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2026-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2027
-    {"date": "2027-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2027-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2027-03-05", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2027-03-10", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2027-03-22", "name": "Holi", "type": "public"},
-    {"date": "2027-04-02", "name": "Good Friday", "type": "public"},
-    {"date": "2027-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2027-04-15", "name": "Ram Navami", "type": "public"},
-    {"date": "2027-04-19", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2027-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2027-05-17", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2027-05-20", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2027-07-26", "name": "Janmashtami", "type": "public"},
-    {"date": "2027-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2027-09-05", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2027-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2027-10-11", "name": "Dussehra", "type": "public"},
-    {"date": "2027-10-29", "name": "Diwali", "type": "public"},
-    {"date": "2027-10-30", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2027-11-14", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2027-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2028
-    {"date": "2028-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2028-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2028-02-23", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2028-02-28", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2028-03-11", "name": "Holi", "type": "public"},
-    {"date": "2028-04-03", "name": "Ram Navami", "type": "public"},
-    {"date": "2028-04-07", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2028-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2028-04-14", "name": "Good Friday", "type": "public"},
-    {"date": "2028-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2028-05-05", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2028-05-08", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2028-08-14", "name": "Janmashtami", "type": "public"},
-    {"date": "2028-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2028-09-24", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2028-09-30", "name": "Dussehra", "type": "public"},
-    {"date": "2028-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2028-10-17", "name": "Diwali", "type": "public"},
-    {"date": "2028-10-18", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2028-11-03", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2028-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2029
-    {"date": "2029-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2029-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2029-02-13", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2029-02-17", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2029-03-01", "name": "Holi", "type": "public"},
-    {"date": "2029-03-23", "name": "Ram Navami", "type": "public"},
-    {"date": "2029-03-27", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2029-03-30", "name": "Good Friday", "type": "public"},
-    {"date": "2029-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2029-04-25", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2029-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2029-05-27", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2029-08-03", "name": "Janmashtami", "type": "public"},
-    {"date": "2029-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2029-09-13", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2029-09-19", "name": "Dussehra", "type": "public"},
-    {"date": "2029-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2029-11-05", "name": "Diwali", "type": "public"},
-    {"date": "2029-11-06", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2029-11-22", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2029-12-25", "name": "Christmas", "type": "public"},
-    
-    # 2030
-    {"date": "2030-01-14", "name": "Makar Sankranti", "type": "public"},
-    {"date": "2030-01-26", "name": "Republic Day", "type": "national"},
-    {"date": "2030-02-06", "name": "Eid ul-Fitr", "type": "public"},
-    {"date": "2030-03-04", "name": "Maha Shivaratri", "type": "public"},
-    {"date": "2030-03-13", "name": "Holi", "type": "public"},
-    {"date": "2030-04-12", "name": "Ram Navami", "type": "public"},
-    {"date": "2030-04-14", "name": "Ambedkar Jayanti", "type": "public"},
-    {"date": "2030-04-14", "name": "Eid ul-Adha", "type": "public"},
-    {"date": "2030-04-16", "name": "Mahavir Jayanti", "type": "public"},
-    {"date": "2030-04-19", "name": "Good Friday", "type": "public"},
-    {"date": "2030-05-01", "name": "Gujarat Day", "type": "state"},
-    {"date": "2030-05-16", "name": "Buddha Purnima", "type": "public"},
-    {"date": "2030-07-24", "name": "Janmashtami", "type": "public"},
-    {"date": "2030-08-15", "name": "Independence Day", "type": "national"},
-    {"date": "2030-09-02", "name": "Ganesh Chaturthi", "type": "public"},
-    {"date": "2030-10-02", "name": "Gandhi Jayanti", "type": "national"},
-    {"date": "2030-10-08", "name": "Dussehra", "type": "public"},
-    {"date": "2030-10-26", "name": "Diwali", "type": "public"},
-    {"date": "2030-10-27", "name": "Gujarati New Year", "type": "state"},
-    {"date": "2030-11-12", "name": "Guru Nanak Jayanti", "type": "public"},
-    {"date": "2030-12-25", "name": "Christmas", "type": "public"},
-]
+# Async variants of the hot paths, mounted ahead of `router` when ASYNC_DB_ENABLED is set
+async_router = APIRouter()
+
+def _check_leave_span(start_date: datetime, end_date: datetime) -> None:
+    """Reject leaves longer than MAX_LEAVE_SPAN_DAYS, the lookback of calendar range queries."""
+    if span_days(start_date, end_date) > settings.MAX_LEAVE_SPAN_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A leave request can span at most {settings.MAX_LEAVE_SPAN_DAYS} days"
+        )
 
 @router.post("/", response_model=LeaveRequestResponse)
 def create_leave_request(
@@ -275,7 +42,11 @@ def create_leave_request(
     # Check leave balance
     leave_type = leave_request.leave_type.value
     available_balance = getattr(current_user, f"{leave_type}_leave", 0)
-    duration = (leave_request.end_date - leave_request.start_date).days + 1
+    _check_leave_span(leave_request.start_date, leave_request.end_date)
+    duration = leave_duration(leave_request.start_date, leave_request.end_date, current_user.region)
+    
+    if duration == 0:
+        raise HTTPException(status_code=400, detail="The selected dates contain no working days")
     
     if duration > available_balance:
         raise HTTPException(
@@ -284,7 +55,7 @@ def create_leave_request(
         )
     
     # Create leave request
-    db_leave_request = crud.create_leave_request(db=db, leave_request=leave_request, user_id=current_user.id)
+    db_leave_request = crud.create_leave_request(db=db, leave_request=leave_request, user_id=current_user.id, region=current_user.region)
     
     # Log the action
     crud.create_audit_log(
@@ -305,43 +76,41 @@ def create_leave_request(
 
 @router.get("/my-requests", response_model=List[LeaveRequestResponse])
 def get_my_leave_requests(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_user),
+    cache_headers: dict = Depends(conditional_get("leaves:user:{me}", "users"))
 ):
     """Get current user's leave requests."""
-    # Automatically expire old pending leaves
-    crud.expire_old_pending_leaves(db)
-    
-    leave_requests = crud.get_leave_requests(db, skip=skip, limit=limit, user_id=current_user.id, status=status)
-    return leave_requests
+    rows = crud.get_leave_request_rows(db, skip=skip, limit=limit, user_id=current_user.id, status=status)
+    return serialized_response(request, leave_request_items(rows), List[LeaveRequestResponse], headers=cache_headers)
 
 @router.get("/", response_model=List[LeaveRequestResponse])
 def get_leave_requests(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users"))
 ):
     """Get leave requests."""
-    # Automatically expire old pending leaves
-    crud.expire_old_pending_leaves(db)
-    
     # If user is admin, they can see all requests
     # If user is employee, they can only see their own requests
     from app.models import UserRole
     user_id = None if current_user.role == UserRole.ADMIN else current_user.id
     
-    leave_requests = crud.get_leave_requests(db, skip=skip, limit=limit, user_id=user_id, status=status)
-    return leave_requests
+    rows = crud.get_leave_request_rows(db, skip=skip, limit=limit, user_id=user_id, status=status)
+    return serialized_response(request, leave_request_items(rows), List[LeaveRequestResponse], headers=cache_headers)
 
 @router.get("/{request_id}", response_model=LeaveRequestResponse)
 def get_leave_request(
     request_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(auth.get_current_user)
 ):
     """Get leave request by ID."""
@@ -355,6 +124,36 @@ def get_leave_request(
     
     return leave_request
 
+@router.get("/{request_id}/history", response_model=List[AuditLogResponse])
+def get_leave_request_history(
+    request_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_user)
+):
+    """Get the audit trail of a leave request, oldest first.
+    
+    Deleted requests keep their history, visible to admins. Entries older than
+    the audit retention window are in the archive and not included.
+    
+    Audit entries are written behind the request that made them, so this
+    waits for the ones queued in this worker; entries queued by another worker
+    can still be up to AUDIT_FLUSH_INTERVAL_SECONDS from appearing.
+    """
+    leave_request = crud.get_leave_request(db, request_id=request_id)
+    if leave_request is None and current_user.role != "admin":
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    
+    # Check if user can access this request
+    if leave_request is not None and current_user.role != "admin" and leave_request.employee_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    
+    audit_sink.flush(timeout=settings.AUDIT_FLUSH_INTERVAL_SECONDS * 2)
+    history = crud.get_leave_request_history(db, request_id=request_id)
+    if leave_request is None and not history:
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    
+    return history
+
 @router.put("/{request_id}", response_model=LeaveRequestResponse)
 def update_leave_request(
     request_id: int,
@@ -389,9 +188,13 @@ def update_leave_request(
     # Validate dates
     if new_start_date > new_end_date:
         raise HTTPException(status_code=400, detail="Start date must be before or equal to end date")
+    _check_leave_span(new_start_date, new_end_date)
     
-    # Calculate new duration
-    new_duration = (new_end_date - new_start_date).days + 1
+    # Calculate new duration (working days)
+    new_duration = leave_duration(new_start_date, new_end_date, employee.region)
+    
+    if new_duration == 0:
+        raise HTTPException(status_code=400, detail="The selected dates contain no working days")
     
     # Check leave balance for the new configuration
     available_balance = getattr(employee, f"{new_leave_type}_leave", 0)
@@ -469,8 +272,9 @@ def get_my_leave_calendar(
     start_date: str = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: str = Query(..., description="End date (YYYY-MM-DD)"),
     include_holidays: bool = Query(True, description="Include public holidays"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_user),
+    cache_headers: dict = Depends(conditional_get("leaves:user:{me}", "users", "holidays"))
 ):
     """
     Get leave calendar for the authenticated employee.
@@ -487,134 +291,7 @@ def get_my_leave_calendar(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Get calendar entries for the user
-    calendar_entries = crud.get_employee_calendar(db, user_id, start_dt, end_dt)
-    
-    # Get leave requests for statistics
-    leave_requests = db.query(LeaveRequest).filter(
-        LeaveRequest.employee_id == user_id,
-        LeaveRequest.start_date <= end_dt,
-        LeaveRequest.end_date >= start_dt
-    ).all()
-    
-    # Organize calendar entries by date
-    calendar_dates = {}
-    for entry in calendar_entries:
-        date_str = entry.leave_date.strftime("%Y-%m-%d")
-        if date_str not in calendar_dates:
-            calendar_dates[date_str] = []
-        calendar_dates[date_str].append({
-            "leave_type": entry.leave_type.value,
-            "leave_request_id": entry.leave_request_id
-        })
-    
-    # Organize leaves by status
-    approved_leaves = []
-    pending_leaves = []
-    rejected_leaves = []
-    
-    for leave in leave_requests:
-        leave_data = {
-            "id": leave.id,
-            "leave_type": leave.leave_type.value,
-            "start_date": leave.start_date.strftime("%Y-%m-%d"),
-            "end_date": leave.end_date.strftime("%Y-%m-%d"),
-            "duration": leave.duration,
-            "reason": leave.reason,
-            "admin_comment": leave.admin_comment,
-            "created_at": leave.created_at.isoformat()
-        }
-        
-        if leave.status == LeaveStatus.APPROVED:
-            approved_leaves.append(leave_data)
-        elif leave.status == LeaveStatus.PENDING:
-            pending_leaves.append(leave_data)
-        elif leave.status == LeaveStatus.REJECTED:
-            rejected_leaves.append(leave_data)
-    
-    # Filter holidays within date range
-    holidays = []
-    if include_holidays:
-        for holiday in GUJARAT_HOLIDAYS:
-            holiday_date = datetime.strptime(holiday["date"], "%Y-%m-%d")
-            if start_dt <= holiday_date <= end_dt:
-                holidays.append(holiday)
-    
-    # Calculate leave statistics
-    total_approved_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.APPROVED)
-    total_pending_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.PENDING)
-    total_rejected_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.REJECTED)
-    total_expired_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.EXPIRED)
-    
-    # Organize expired leaves
-    expired_leaves = []
-    for leave in leave_requests:
-        if leave.status == LeaveStatus.EXPIRED:
-            expired_leaves.append({
-                "id": leave.id,
-                "leave_type": leave.leave_type.value,
-                "start_date": leave.start_date.strftime("%Y-%m-%d"),
-                "end_date": leave.end_date.strftime("%Y-%m-%d"),
-                "duration": leave.duration,
-                "reason": leave.reason,
-                "admin_comment": leave.admin_comment,
-                "created_at": leave.created_at.isoformat()
-            })
-    
-    return {
-        "user": {
-            "id": user.id,
-            "name": user.name,
-            "employee_id": user.employee_id,
-            "department": user.department
-        },
-        "date_range": {
-            "start_date": start_dt.strftime("%Y-%m-%d"),
-            "end_date": end_dt.strftime("%Y-%m-%d")
-        },
-        "leave_balance": {
-            "annual": user.annual_leave,
-            "sick": user.sick_leave,
-            "personal": user.personal_leave,
-            "emergency": user.emergency_leave,
-            "maternity": user.maternity_leave
-        },
-        "statistics": {
-            "total_approved_days": total_approved_days,
-            "total_pending_days": total_pending_days,
-            "total_requests": len(leave_requests),
-            "approved_count": len(approved_leaves),
-            "pending_count": len(pending_leaves),
-            "rejected_count": len(rejected_leaves)
-        },
-        "leave_durations": {
-            "pending": {
-                "total_days": total_pending_days,
-                "leaves": pending_leaves
-            },
-            "approved": {
-                "total_days": total_approved_days,
-                "leaves": approved_leaves
-            },
-            "rejected": {
-                "total_days": total_rejected_days,
-                "leaves": rejected_leaves
-            },
-            "expired": {
-                "total_days": total_expired_days,
-                "leaves": expired_leaves
-            },
-            "total_applied": total_pending_days + total_approved_days + total_rejected_days + total_expired_days
-        },
-        "calendar": calendar_dates,
-        "leaves": {
-            "approved": approved_leaves,
-            "pending": pending_leaves,
-            "rejected": rejected_leaves,
-            "expired": expired_leaves
-        },
-        "public_holidays": holidays
-    }
+    return _user_calendar(db, user, start_dt, end_dt, include_holidays)
 
 @router.get("/calendar/{user_id}")
 def get_leave_calendar(
@@ -622,8 +299,9 @@ def get_leave_calendar(
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     include_holidays: bool = Query(True, description="Include public holidays"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_user),
+    cache_headers: dict = Depends(conditional_get("leaves:user:{user_id}", "users", "holidays", "today"))
 ):
     """
     Get leave calendar for a specific user with public holidays (Admin only).
@@ -652,79 +330,29 @@ def get_leave_calendar(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Get calendar entries for the user
-    calendar_entries = crud.get_employee_calendar(db, user_id, start_dt, end_dt)
-    
-    # Get leave requests for statistics
-    leave_requests = db.query(LeaveRequest).filter(
-        LeaveRequest.employee_id == user_id,
-        LeaveRequest.start_date <= end_dt,
-        LeaveRequest.end_date >= start_dt
-    ).all()
-    
-    # Organize calendar entries by date
-    calendar_dates = {}
-    for entry in calendar_entries:
-        date_str = entry.leave_date.strftime("%Y-%m-%d")
-        if date_str not in calendar_dates:
-            calendar_dates[date_str] = []
-        calendar_dates[date_str].append({
-            "leave_type": entry.leave_type.value,
-            "leave_request_id": entry.leave_request_id
-        })
+    return _user_calendar(db, user, start_dt, end_dt, include_holidays)
+
+def _user_calendar(db: Session, user: User, start_dt: datetime, end_dt: datetime, include_holidays: bool) -> dict:
+    """Calendar payload of one user, assembled from cached month tiles."""
+    calendar_dates, leave_requests = get_calendar_range(db, user.id, start_dt.date(), end_dt.date())
     
     # Organize leaves by status
-    approved_leaves = []
-    pending_leaves = []
-    rejected_leaves = []
-    
-    for leave in leave_requests:
-        leave_data = {
-            "id": leave.id,
-            "leave_type": leave.leave_type.value,
-            "start_date": leave.start_date.strftime("%Y-%m-%d"),
-            "end_date": leave.end_date.strftime("%Y-%m-%d"),
-            "duration": leave.duration,
-            "reason": leave.reason,
-            "admin_comment": leave.admin_comment,
-            "created_at": leave.created_at.isoformat()
-        }
-        
-        if leave.status == LeaveStatus.APPROVED:
-            approved_leaves.append(leave_data)
-        elif leave.status == LeaveStatus.PENDING:
-            pending_leaves.append(leave_data)
-        elif leave.status == LeaveStatus.REJECTED:
-            rejected_leaves.append(leave_data)
-    
-    # Filter holidays within date range
-    holidays = []
-    if include_holidays:
-        for holiday in GUJARAT_HOLIDAYS:
-            holiday_date = datetime.strptime(holiday["date"], "%Y-%m-%d")
-            if start_dt <= holiday_date <= end_dt:
-                holidays.append(holiday)
+    leaves_by_status = {status: [] for status in LeaveStatus}
+    for status, leave_data in leave_requests:
+        leaves_by_status[status].append(leave_data)
+    approved_leaves = leaves_by_status[LeaveStatus.APPROVED]
+    pending_leaves = leaves_by_status[LeaveStatus.PENDING]
+    rejected_leaves = leaves_by_status[LeaveStatus.REJECTED]
+    expired_leaves = leaves_by_status[LeaveStatus.EXPIRED]
+    
+    # Holidays of the user's region within date range
+    holidays = get_calendar(user.region).between(start_dt, end_dt) if include_holidays else []
     
     # Calculate leave statistics
-    total_approved_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.APPROVED)
-    total_pending_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.PENDING)
-    total_rejected_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.REJECTED)
-    total_expired_days = sum(leave.duration for leave in leave_requests if leave.status == LeaveStatus.EXPIRED)
-    
-    # Organize expired leaves
-    expired_leaves = []
-    for leave in leave_requests:
-        if leave.status == LeaveStatus.EXPIRED:
-            expired_leaves.append({
-                "id": leave.id,
-                "leave_type": leave.leave_type.value,
-                "start_date": leave.start_date.strftime("%Y-%m-%d"),
-                "end_date": leave.end_date.strftime("%Y-%m-%d"),
-                "duration": leave.duration,
-                "reason": leave.reason,
-                "admin_comment": leave.admin_comment,
-                "created_at": leave.created_at.isoformat()
-            })
+    total_approved_days = sum(leave["duration"] for leave in approved_leaves)
+    total_pending_days = sum(leave["duration"] for leave in pending_leaves)
+    total_rejected_days = sum(leave["duration"] for leave in rejected_leaves)
+    total_expired_days = sum(leave["duration"] for leave in expired_leaves)
     
     return {
         "user": {
@@ -783,15 +411,21 @@ def get_leave_calendar(
 
 @router.get("/calendar/all/employees")
 def get_all_employees_calendar(
+    request: Request,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     include_holidays: bool = Query(True, description="Include public holidays"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth.get_current_user)
+    region: Optional[str] = Query(None, description="Holiday region (defaults to DEFAULT_HOLIDAY_REGION)"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(auth.get_current_user),
+    cache_headers: dict = Depends(conditional_get("leaves", "users", "holidays", "today"))
 ):
     """
     Get leave calendar for all employees (Admin only).
     Returns an array of days, each containing users on leave that day.
+    With `Accept: application/x-ndjson` the response is streamed: a date_range
+    line, one line per day, then a statistics line (ranges up to
+    CALENDAR_STREAM_MAX_DAYS).
     """
     # Only admins can access this
     if current_user.role != "admin":
@@ -811,106 +445,199 @@ def get_all_employees_calendar(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
     
-    # Get all approved leave calendar entries for the date range
-    from sqlalchemy.orm import joinedload
-    calendar_entries = db.query(LeaveCalendar).options(
-        joinedload(LeaveCalendar.employee),
-        joinedload(LeaveCalendar.leave_request)
-    ).join(LeaveRequest).filter(
-        LeaveCalendar.leave_date >= start_dt,
-        LeaveCalendar.leave_date <= end_dt,
-        LeaveRequest.status == LeaveStatus.APPROVED
-    ).order_by(LeaveCalendar.leave_date, LeaveCalendar.employee_id).all()
+    if region and not has_region(region):
+        raise HTTPException(status_code=400, detail=f"Unknown holiday region: {region}")
+    calendar = get_calendar(region)
+    
+    if wants_ndjson(request):
+        check_stream_range(start_dt, end_dt)
+        return ndjson_response(_stream_all_employees_calendar(start_dt, end_dt, calendar, include_holidays, current_user.id), headers=cache_headers)
+    
+    # Get all approved leave intervals overlapping the date range
+    intervals = _approved_intervals(db, start_dt, end_dt).all()
+    intervals_by_request = {interval.leave_request_id: interval for interval in intervals}
     
     # Group by date
     days_map = {}
-    for entry in calendar_entries:
-        date_str = entry.leave_date.strftime("%Y-%m-%d")
-        
-        if date_str not in days_map:
-            days_map[date_str] = []
-        
-        # Add user leave record for this day
-        leave_record = {
-            "user": {
-                "id": entry.employee.id,
-                "name": entry.employee.name,
-                "employee_id": entry.employee.employee_id,
-                "email": entry.employee.email,
-                "department": entry.employee.department,
-                "role": entry.employee.role.value
-            },
-            "leave": {
-                "id": entry.leave_request.id,
-                "leave_type": entry.leave_request.leave_type.value,
-                "start_date": entry.leave_request.start_date.strftime("%Y-%m-%d"),
-                "end_date": entry.leave_request.end_date.strftime("%Y-%m-%d"),
-                "duration": entry.leave_request.duration,
-                "reason": entry.leave_request.reason,
-                "status": entry.leave_request.status.value,
-                "admin_comment": entry.leave_request.admin_comment,
-                "created_at": entry.leave_request.created_at.isoformat() if entry.leave_request.created_at else None
-            }
-        }
-        
-        days_map[date_str].append(leave_record)
+    for day in expand(intervals, start_dt, end_dt):
+        if day.leave_date not in days_map:
+            days_map[day.leave_date] = []
+        days_map[day.leave_date].append(_calendar_leave_record(intervals_by_request[day.leave_request_id]))
     
     # Convert to array format
     days = []
     current_date = start_dt
     while current_date <= end_dt:
-        date_str = current_date.strftime("%Y-%m-%d")
+        leaves = days_map.get(current_date.date(), [])
+        days.append(_calendar_day(current_date, leaves, calendar, include_holidays))
+        current_date += timedelta(days=1)
+    
+    total_leave_days = sum(day["leave_count"] for day in days)
+    days_with_leaves = sum(1 for day in days if day["leave_count"] > 0)
+    return {
+        "date_range": _calendar_date_range(start_dt, end_dt),
+        "days": days,
+        "statistics": _calendar_statistics(db, start_dt, end_dt, total_leave_days, days_with_leaves)
+    }
+
+def _stream_all_employees_calendar(start_dt: datetime, end_dt: datetime, calendar: HolidayIndex, include_holidays: bool, user_id: int):
+    """NDJSON lines of the all-employees calendar: the date range, one line per day, then the statistics."""
+    # Request dependencies are closed before a streamed body is sent
+    with read_session(user_id) as db:
+        yield {"date_range": _calendar_date_range(start_dt, end_dt)}
         
-        # Check if it's a holiday
-        holiday_info = None
-        if include_holidays:
-            for holiday in GUJARAT_HOLIDAYS:
-                if holiday["date"] == date_str:
-                    holiday_info = {
-                        "name": holiday["name"],
-                        "type": holiday["type"]
-                    }
-                    break
+        intervals = _approved_intervals(db, start_dt, end_dt).order_by(
+            LeaveInterval.start_date, LeaveInterval.id
+        ).yield_per(500)
+        rows = (
+            (interval.start_date.date(), interval.end_date.date(), interval.employee_id, _calendar_leave_record(interval))
+            for interval in intervals
+        )
+        total_leave_days = days_with_leaves = 0
+        for day, covering in sweep(rows, start_dt.date(), end_dt.date(),
+                                   span=lambda row: (row[0], row[1]),
+                                   order=lambda row: (row[2], row[3]["leave"]["id"])):
+            leaves = [row[3] for row in covering]
+            total_leave_days += len(leaves)
+            days_with_leaves += 1 if leaves else 0
+            yield _calendar_day(day, leaves, calendar, include_holidays)
         
-        day_data = {
-            "date": date_str,
-            "day_of_week": current_date.strftime("%A"),
-            "is_holiday": holiday_info is not None,
-            "holiday": holiday_info,
-            "leaves": days_map.get(date_str, []),
-            "leave_count": len(days_map.get(date_str, []))
+        yield {"statistics": _calendar_statistics(db, start_dt, end_dt, total_leave_days, days_with_leaves)}
+
+def _approved_intervals(db: Session, start_dt: datetime, end_dt: datetime):
+    """Approved leave intervals overlapping the range, with their employee and leave request."""
+    return db.query(LeaveInterval).options(
+        joinedload(LeaveInterval.employee),
+        joinedload(LeaveInterval.leave_request)
+    ).join(LeaveRequest).filter(
+        overlapping(start_dt, end_dt),
+        LeaveRequest.status == LeaveStatus.APPROVED
+    )
+
+def _calendar_leave_record(interval: LeaveInterval) -> dict:
+    """A user's leave as listed under each of its days."""
+    employee, leave_request = interval.employee, interval.leave_request
+    return {
+        "user": {
+            "id": employee.id,
+            "name": employee.name,
+            "employee_id": employee.employee_id,
+            "email": employee.email,
+            "department": employee.department,
+            "role": employee.role.value
+        },
+        "leave": {
+            "id": leave_request.id,
+            "leave_type": leave_request.leave_type.value,
+            "start_date": leave_request.start_date.strftime("%Y-%m-%d"),
+            "end_date": leave_request.end_date.strftime("%Y-%m-%d"),
+            "duration": leave_request.duration,
+            "reason": leave_request.reason,
+            "status": leave_request.status.value,
+            "admin_comment": leave_request.admin_comment,
+            "created_at": leave_request.created_at.isoformat() if leave_request.created_at else None
         }
-        
-        days.append(day_data)
-        current_date += timedelta(days=1)
+    }
+
+def _calendar_day(day, leaves: List[dict], calendar: HolidayIndex, include_holidays: bool) -> dict:
+    info = calendar.day(day)
+    holiday_info = info.holiday if include_holidays else None
     
-    # Get statistics
-    leave_requests = db.query(LeaveRequest).filter(
+    return {
+        "date": info.date,
+        "day_of_week": info.day_of_week,
+        "is_holiday": holiday_info is not None,
+        "holiday": holiday_info,
+        "leaves": leaves,
+        "leave_count": len(leaves)
+    }
+
+def _calendar_date_range(start_dt: datetime, end_dt: datetime) -> dict:
+    return {
+        "start_date": start_dt.strftime("%Y-%m-%d"),
+        "end_date": end_dt.strftime("%Y-%m-%d"),
+        "total_days": (end_dt - start_dt).days + 1
+    }
+
+def _calendar_statistics(db: Session, start_dt: datetime, end_dt: datetime, total_leave_days: int, days_with_leaves: int) -> dict:
+    # Days requested per status for leave requests overlapping the range
+    durations = dict(db.query(LeaveRequest.status, func.sum(LeaveRequest.duration)).filter(
         LeaveRequest.start_date <= end_dt,
         LeaveRequest.end_date >= start_dt
-    ).all()
+    ).group_by(LeaveRequest.status).all())
     
-    pending_duration = sum(req.duration for req in leave_requests if req.status == LeaveStatus.PENDING)
-    approved_duration = sum(req.duration for req in leave_requests if req.status == LeaveStatus.APPROVED)
-    rejected_duration = sum(req.duration for req in leave_requests if req.status == LeaveStatus.REJECTED)
-    expired_duration = sum(req.duration for req in leave_requests if req.status == LeaveStatus.EXPIRED)
+    pending_duration = durations.get(LeaveStatus.PENDING) or 0
+    approved_duration = durations.get(LeaveStatus.APPROVED) or 0
+    rejected_duration = durations.get(LeaveStatus.REJECTED) or 0
+    expired_duration = durations.get(LeaveStatus.EXPIRED) or 0
     
     return {
-        "date_range": {
-            "start_date": start_dt.strftime("%Y-%m-%d"),
-            "end_date": end_dt.strftime("%Y-%m-%d"),
-            "total_days": (end_dt - start_dt).days + 1
-        },
-        "days": days,
-        "statistics": {
-            "total_leave_days": sum(day["leave_count"] for day in days),
-            "days_with_leaves": sum(1 for day in days if day["leave_count"] > 0),
-            "leave_durations": {
-                "pending": pending_duration,
-                "approved": approved_duration,
-                "rejected": rejected_duration,
-                "expired": expired_duration,
-                "total_applied": pending_duration + approved_duration + rejected_duration + expired_duration
-            }
+        "total_leave_days": total_leave_days,
+        "days_with_leaves": days_with_leaves,
+        "leave_durations": {
+            "pending": pending_duration,
+            "approved": approved_duration,
+            "rejected": rejected_duration,
+            "expired": expired_duration,
+            "total_applied": pending_duration + approved_duration + rejected_duration + expired_duration
         }
     }
+
+# Async handlers: the sync handlers above run on the async session's sync facade via
+# run_sync, so database IO is awaited instead of holding a threadpool thread.
+# Responses are validated inside run_sync so no lazy load happens outside the greenlet.
+@async_router.post("/", response_model=LeaveRequestResponse)
+async def create_leave_request_async(
+    leave_request: LeaveRequestCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_user_async)
+):
+    """Submit a new leave request."""
+    return await db.run_sync(lambda session: LeaveRequestResponse.model_validate(
+        create_leave_request(leave_request, db=session, current_user=current_user)
+    ))
+
+@async_router.get("/my-requests", response_model=List[LeaveRequestResponse])
+async def get_my_leave_requests_async(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_user_async),
+    cache_headers: dict = Depends(conditional_get_async("leaves:user:{me}", "users"))
+):
+    """Get current user's leave requests."""
+    rows = await db.run_sync(lambda session: crud.get_leave_request_rows(
+        session, skip=skip, limit=limit, user_id=current_user.id, status=status
+    ))
+    return serialized_response(request, leave_request_items(rows), List[LeaveRequestResponse], headers=cache_headers)
+
+@async_router.get("/", response_model=List[LeaveRequestResponse])
+async def get_leave_requests_async(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_user_async),
+    cache_headers: dict = Depends(conditional_get_async("leaves", "users"))
+):
+    """Get leave requests."""
+    from app.models import UserRole
+    user_id = None if current_user.role == UserRole.ADMIN else current_user.id
+    rows = await db.run_sync(lambda session: crud.get_leave_request_rows(
+        session, skip=skip, limit=limit, user_id=user_id, status=status
+    ))
+    return serialized_response(request, leave_request_items(rows), List[LeaveRequestResponse], headers=cache_headers)
+
+@async_router.get("/{request_id}", response_model=LeaveRequestResponse)
+async def get_leave_request_async(
+    request_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(auth.get_current_user_async)
+):
+    """Get leave request by ID."""
+    return await db.run_sync(lambda session: LeaveRequestResponse.model_validate(
+        get_leave_request(request_id, db=session, current_user=current_user)
+    ))
@@ -1,28 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional, Union
 from datetime import datetime
-from app.database import get_db
+from app.database import get_read_db
 from app.schemas import AuditLogResponse
 from app import crud, auth
 from app.models import User
+from app.retention import reaches_archive, get_audit_logs_for_day
+from app.serialization import serialized_response, audit_log_item
 
 router = APIRouter()
 
 @router.get("/", response_model=Union[dict, List[AuditLogResponse]])
 def get_audit_logs(
+    request: Request,
     page: int = Query(1, ge=1),
     limit: int = Query(5, ge=1, le=100),
     search: Optional[str] = Query(None),
     action: Optional[str] = Query(None),
     date: Optional[str] = Query(None),
     paginated: bool = Query(True),
-    db: Session = Depends(get_db),
+    pagination: str = Query("page", pattern="^(page|cursor)$"),
+    cursor: Optional[str] = Query(None, description="next_cursor or prev_cursor from a previous cursor page"),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(auth.get_current_admin_user)
 ):
     """Get audit logs with pagination, search, and filtering (admin only).
     
     Set paginated=false to get a simple array response (backward compatible).
+    Set pagination=cursor (or pass a cursor) for keyset pages that stay fast at
+    any depth: {items, next_cursor, prev_cursor, limit, total}. Totals come from
+    a short-lived per-worker cache and may briefly lag other workers' writes.
+    A date older than the retention window is also read from the archive.
     """
     skip = (page - 1) * limit
     
@@ -34,27 +43,68 @@ def get_audit_logs(
         except:
             pass
     
-    # Get audit logs with filters
-    audit_logs, total = crud.get_audit_logs_paginated(
-        db, 
-        skip=skip, 
-        limit=limit, 
-        search=search,
-        action=action,
-        date=filter_date
-    )
+    use_cursor = pagination == "cursor" or bool(cursor)
+    next_cursor = prev_cursor = None
+    if cursor:
+        try:
+            crud.decode_audit_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    if filter_date and reaches_archive(filter_date):
+        # One day of hot and archived entries, paginated in memory
+        day_logs = get_audit_logs_for_day(db, filter_date, search=search, action=action)
+        total = len(day_logs)
+        if use_cursor:
+            items, next_cursor, prev_cursor = crud.paginate_audit_logs(day_logs, limit=limit, cursor=cursor)
+        else:
+            items = day_logs[skip:skip + limit]
+    elif use_cursor:
+        audit_logs, next_cursor, prev_cursor = crud.get_audit_logs_keyset(
+            db,
+            limit=limit,
+            cursor=cursor,
+            search=search,
+            action=action,
+            date=filter_date
+        )
+        items = [audit_log_item(log) for log in audit_logs]
+        total = crud.count_audit_logs(db, search=search, action=action, date=filter_date)
+    else:
+        # Get audit logs with filters
+        audit_logs, total = crud.get_audit_logs_paginated(
+            db, 
+            skip=skip, 
+            limit=limit, 
+            search=search,
+            action=action,
+            date=filter_date
+        )
+        items = [audit_log_item(log) for log in audit_logs]
+    
+    if use_cursor:
+        return serialized_response(request, {
+            "items": items,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "limit": limit,
+            "total": total
+        }, dict)
     
     # Return simple array if paginated=false (backward compatible)
     if not paginated:
-        return [AuditLogResponse.from_orm(log) for log in audit_logs]
+        return serialized_response(request, items, List[AuditLogResponse])
     
     # Calculate total pages
     total_pages = (total + limit - 1) // limit
     
-    return {
-        "items": [AuditLogResponse.from_orm(log) for log in audit_logs],
+    return serialized_response(request, {
+        "items": items,
         "total": total,
         "page": page,
         "limit": limit,
         "total_pages": total_pages
-    }
+    }, dict)
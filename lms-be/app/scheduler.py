@@ -0,0 +1,134 @@
+"""
+In-process periodic job scheduler.
+
+Every API worker runs a scheduler thread, but each job is guarded by a lease
+row in the job_locks table: a worker only runs a job after taking (or
+renewing) its lease, and the lease lasts one interval. With several gunicorn
+workers a job therefore runs once per interval, and another worker takes over
+if the holder dies.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import timedelta
+from typing import Callable, List, Optional
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import JobLock
+from app.utils import get_current_time
+
+logger = logging.getLogger(__name__)
+
+
+def acquire_lease(name: str, owner: str, seconds: float) -> bool:
+    """Take or renew the lease on job `name` for `seconds`; False if another owner holds it."""
+    db = SessionLocal()
+    try:
+        now = get_current_time()
+        expires_at = now + timedelta(seconds=seconds)
+        taken = db.execute(
+            update(JobLock)
+            .where(JobLock.name == name, or_(JobLock.owner == owner, JobLock.expires_at <= now))
+            .values(owner=owner, expires_at=expires_at)
+        ).rowcount
+        if not taken:
+            if db.get(JobLock, name) is not None:
+                db.rollback()
+                return False
+            db.add(JobLock(name=name, owner=owner, expires_at=expires_at))
+        db.commit()
+        return True
+    except IntegrityError:
+        # Another worker inserted the lease first
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+class Job:
+    def __init__(self, name: str, interval_seconds: float, fn: Callable[[Session], Optional[int]]):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.fn = fn
+        self.next_run = 0.0
+
+
+class Scheduler:
+    """Runs registered jobs on a daemon thread, one lease-guarded run per interval."""
+
+    def __init__(self):
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.jobs: List[Job] = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_job(self, name: str, interval_seconds: float, fn: Callable[[Session], Optional[int]]) -> None:
+        self.jobs.append(Job(name, interval_seconds, fn))
+
+    def run_job(self, job: Job) -> bool:
+        """Run `job` if this worker gets its lease; returns whether it ran."""
+        if not acquire_lease(job.name, self.owner, job.interval_seconds):
+            return False
+
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            result = job.fn(db)
+            logger.info(f"job '{job.name}' finished in {(time.perf_counter() - started) * 1000:.1f} ms (result: {result})")
+        except Exception:
+            db.rollback()
+            logger.exception(f"job '{job.name}' failed")
+        finally:
+            db.close()
+        return True
+
+    def _loop(self):
+        while not self._stop.is_set():
+            now = time.monotonic()
+            for job in self.jobs:
+                if now >= job.next_run:
+                    job.next_run = now + job.interval_seconds
+                    try:
+                        self.run_job(job)
+                    except Exception:
+                        logger.exception(f"could not schedule job '{job.name}'")
+            next_run = min((job.next_run for job in self.jobs), default=now + 60)
+            self._stop.wait(max(next_run - time.monotonic(), 1))
+
+    def start(self) -> None:
+        if self._thread is not None or not self.jobs:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Started scheduler with {len(self.jobs)} job(s) as {self.owner}")
+
+    def stop(self, timeout: float = 5) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+
+def _expire_pending_leaves(db: Session) -> int:
+    from app.crud import expire_old_pending_leaves
+    return expire_old_pending_leaves(db)
+
+
+def _archive_audit_logs(db: Session) -> int:
+    from app.retention import archive_audit_logs
+    return archive_audit_logs(db)
+
+
+scheduler = Scheduler()
+scheduler.add_job("expire_pending_leaves", settings.LEAVE_EXPIRY_INTERVAL_MINUTES * 60, _expire_pending_leaves)
+if settings.AUDIT_RETENTION_DAYS > 0:
+    scheduler.add_job("archive_audit_logs", settings.AUDIT_RETENTION_INTERVAL_MINUTES * 60, _archive_audit_logs)
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, validator, EmailStr
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime, date
 from app.models import UserRole, LeaveType, LeaveStatus, Gender
+from app.utils import normalize_audit_details
+from app.holidays import has_region
 
 # Base schemas
 class TokenData(BaseModel):
@@ -18,6 +20,7 @@ class UserBase(BaseModel):
     department: str
     role: UserRole = UserRole.EMPLOYEE
     gender: Optional[Gender] = None
+    region: Optional[str] = None
     
     @validator('email')
     def validate_email(cls, v):
@@ -25,6 +28,12 @@ class UserBase(BaseModel):
         if not re.match(r'^[^@]+@[^@]+\.[^@]+$', v):
             raise ValueError('Invalid email format')
         return v
+    
+    @validator('region')
+    def validate_region(cls, v):
+        if v is not None and not has_region(v):
+            raise ValueError('Unknown holiday region')
+        return v.lower() if v else v
 
 class UserCreate(UserBase):
     password: str
@@ -41,6 +50,7 @@ class UserUpdate(BaseModel):
     department: Optional[str] = None
     employee_id: Optional[str] = None
     gender: Optional[Gender] = None
+    region: Optional[str] = None
     
     @validator('email')
     def validate_email(cls, v):
@@ -49,6 +59,12 @@ class UserUpdate(BaseModel):
             if not re.match(r'^[^@]+@[^@]+\.[^@]+$', v):
                 raise ValueError('Invalid email format')
         return v
+    
+    @validator('region')
+    def validate_region(cls, v):
+        if v is not None and not has_region(v):
+            raise ValueError('Unknown holiday region')
+        return v.lower() if v else v
 
 class UserResponse(UserBase):
     id: int
@@ -194,10 +210,15 @@ class AuditLogResponse(BaseModel):
     user_id: int
     action: str
     description: str
-    details: Optional[str] = None
+    details: Optional[dict] = None
     timestamp: datetime
     user: UserResponse
     
+    @validator('details', pre=True)
+    def parse_details(cls, v):
+        # Archived entries and older rows may still carry JSON text
+        return normalize_audit_details(v)
+    
     class Config:
         from_attributes = True
 
@@ -218,13 +239,25 @@ class EmployeeAnalytics(BaseModel):
     rejected_requests: int
     pending_requests: int
     approval_rate: float
+    days_taken: int = 0
     leave_balance: dict
 
+class EmployeeAnalyticsPage(BaseModel):
+    items: List[EmployeeAnalytics]
+    total: int
+    page: int
+    limit: int
+    total_pages: int
+
 class DepartmentAnalytics(BaseModel):
     department: str
     employee_count: int
     total_requests: int
     average_leave_balance: float
+    approved_requests: int = 0
+    pending_requests: int = 0
+    rejected_requests: int = 0
+    days_by_leave_type: Dict[str, int] = {}
 
 # Pagination schemas
 class PaginatedResponse(BaseModel):
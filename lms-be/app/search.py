@@ -0,0 +1,195 @@
+"""
+Full-text search over the audit log.
+
+The admin log search used to apply ILIKE '%term%' to the description and the
+actor's name and email, which no index can serve. Instead each audit row gets
+a search document of its description, its actor's name and email and a few
+``details`` fields (leave type, employee name, reason, comments):
+
+- SQLite: an FTS5 table ``audit_logs_fts`` keyed by the audit log id.
+- PostgreSQL: a ``search_vector`` tsvector column on ``audit_logs`` with a GIN
+  index.
+
+Triggers keep the documents current on insert, update and delete of audit
+rows and when a user's name or email changes, so bulk inserts and scripts are
+covered too. ``install_audit_search`` creates them and indexes existing rows;
+``python -m app.bootstrap migrate`` runs it. Every search term is matched as a
+prefix and all terms must match. Databases without the index fall back to
+ILIKE.
+"""
+import logging
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import func, inspect, literal_column, or_, table, column
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.models import AuditLog, User
+
+logger = logging.getLogger(__name__)
+
+# details keys worth searching; the rest are ids and dates
+SEARCH_DETAIL_KEYS = ["leave_type", "employee_name", "reason", "comment", "admin_comment"]
+
+
+def _sqlite_details(value: str) -> str:
+    fields = " || ' ' || ".join(f"coalesce(json_extract({value}, '$.{key}'), '')" for key in SEARCH_DETAIL_KEYS)
+    # Guards rows written outside the ORM with non-JSON details
+    return f"CASE WHEN json_valid({value}) THEN {fields} ELSE '' END"
+
+
+def _sqlite_document(row: str) -> str:
+    return (
+        f"{row}.id, {row}.description, "
+        f"(SELECT name FROM users WHERE id = {row}.user_id), "
+        f"(SELECT email FROM users WHERE id = {row}.user_id), "
+        f"{_sqlite_details(f'{row}.details')}"
+    )
+
+
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS audit_logs_fts USING fts5("
+    "description, user_name, user_email, details, tokenize = 'unicode61 remove_diacritics 2')",
+    # Weight matches in the description above the actor, and both above details
+    "INSERT INTO audit_logs_fts(audit_logs_fts, rank) VALUES ('rank', 'bm25(4.0, 2.0, 2.0, 1.0)')",
+    f"""CREATE TRIGGER IF NOT EXISTS audit_logs_fts_insert AFTER INSERT ON audit_logs BEGIN
+        INSERT INTO audit_logs_fts(rowid, description, user_name, user_email, details) VALUES ({_sqlite_document('new')});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS audit_logs_fts_delete AFTER DELETE ON audit_logs BEGIN
+        DELETE FROM audit_logs_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS audit_logs_fts_update AFTER UPDATE OF description, details, user_id ON audit_logs BEGIN
+        DELETE FROM audit_logs_fts WHERE rowid = old.id;
+        INSERT INTO audit_logs_fts(rowid, description, user_name, user_email, details) VALUES ({_sqlite_document('new')});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS audit_logs_fts_user_update AFTER UPDATE OF name, email ON users
+    WHEN old.name IS NOT new.name OR old.email IS NOT new.email BEGIN
+        UPDATE audit_logs_fts SET user_name = new.name, user_email = new.email
+        WHERE rowid IN (SELECT id FROM audit_logs WHERE user_id = new.id);
+    END""",
+    # Index rows written before the table existed
+    f"""INSERT INTO audit_logs_fts(rowid, description, user_name, user_email, details)
+        SELECT {_sqlite_document('audit_logs')} FROM audit_logs
+        WHERE audit_logs.id NOT IN (SELECT rowid FROM audit_logs_fts)""",
+]
+
+_POSTGRES_DETAILS = ", ".join(f"d->>'{key}'" for key in SEARCH_DETAIL_KEYS)
+
+POSTGRES_DDL = [
+    "ALTER TABLE audit_logs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    # details was a text column before migration 0002
+    "DROP FUNCTION IF EXISTS audit_log_search_document(text, text, integer)",
+    f"""CREATE OR REPLACE FUNCTION audit_log_search_document(p_description text, d jsonb, p_user_id integer)
+    RETURNS tsvector AS $$
+    DECLARE
+        actor text;
+        extra text := '';
+    BEGIN
+        SELECT concat_ws(' ', name, email) INTO actor FROM users WHERE id = p_user_id;
+        IF jsonb_typeof(d) = 'object' THEN
+            extra := concat_ws(' ', {_POSTGRES_DETAILS});
+        END IF;
+        RETURN setweight(to_tsvector('simple', regexp_replace(coalesce(p_description, ''), '[^[:alnum:]]+', ' ', 'g')), 'A')
+            || setweight(to_tsvector('simple', regexp_replace(coalesce(actor, ''), '[^[:alnum:]]+', ' ', 'g')), 'B')
+            || setweight(to_tsvector('simple', regexp_replace(extra, '[^[:alnum:]]+', ' ', 'g')), 'C');
+    END
+    $$ LANGUAGE plpgsql STABLE""",
+    """CREATE OR REPLACE FUNCTION audit_logs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := audit_log_search_document(NEW.description, NEW.details, NEW.user_id);
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS audit_logs_search_vector ON audit_logs",
+    """CREATE TRIGGER audit_logs_search_vector BEFORE INSERT OR UPDATE OF description, details, user_id ON audit_logs
+    FOR EACH ROW EXECUTE FUNCTION audit_logs_search_vector_update()""",
+    """CREATE OR REPLACE FUNCTION users_audit_search_update() RETURNS trigger AS $$
+    BEGIN
+        UPDATE audit_logs SET search_vector = audit_log_search_document(description, details, user_id)
+        WHERE user_id = NEW.id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS users_audit_search ON users",
+    """CREATE TRIGGER users_audit_search AFTER UPDATE OF name, email ON users
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.email IS DISTINCT FROM NEW.email)
+    EXECUTE FUNCTION users_audit_search_update()""",
+    "CREATE INDEX IF NOT EXISTS ix_audit_logs_search_vector ON audit_logs USING GIN (search_vector)",
+    # Index rows written before the column existed
+    """UPDATE audit_logs SET search_vector = audit_log_search_document(description, details, user_id)
+    WHERE search_vector IS NULL""",
+]
+
+_fts = table("audit_logs_fts", column("rowid"), column("rank"))
+_search_vector = literal_column("audit_logs.search_vector")
+
+# Whether the search index exists, per database URL
+_available = {}
+
+
+def install_audit_search(engine) -> bool:
+    """Create the search index and its triggers and index existing rows; False if unsupported."""
+    statements = {"sqlite": SQLITE_DDL, "postgresql": POSTGRES_DDL}.get(engine.dialect.name)
+    if statements is None:
+        logger.warning(f"No audit log full-text index for {engine.dialect.name}; search uses ILIKE")
+        return False
+    try:
+        with engine.begin() as connection:
+            for statement in statements:
+                # Raw: the PostgreSQL DDL contains [:alnum:], which text() would take for a bind parameter
+                connection.exec_driver_sql(statement)
+    except SQLAlchemyError:
+        # e.g. SQLite built without FTS5
+        logger.exception("Could not install the audit log full-text index; search uses ILIKE")
+        return False
+    _available.pop(str(engine.url), None)
+    return True
+
+
+def audit_search_available(db: Session) -> bool:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key not in _available:
+        try:
+            inspector = inspect(bind)
+            if bind.dialect.name == "sqlite":
+                _available[key] = "audit_logs_fts" in inspector.get_table_names()
+            elif bind.dialect.name == "postgresql":
+                _available[key] = any(col["name"] == "search_vector" for col in inspector.get_columns("audit_logs"))
+            else:
+                _available[key] = False
+        except SQLAlchemyError:
+            return False
+    return _available[key]
+
+
+def search_terms(search: str) -> List[str]:
+    """Split a search box value into the alphanumeric terms the index holds."""
+    return re.findall(r"[^\W_]+", search.lower())
+
+
+def search_audit_logs(db: Session, query, search: str) -> Tuple[object, Optional[object]]:
+    """
+    Restrict an AuditLog query to rows matching `search`.
+
+    Returns (query, rank) where `rank` orders the best matches first, or None
+    when the ILIKE fallback was used.
+    """
+    terms = search_terms(search)
+    if not terms or not audit_search_available(db):
+        query = query.join(User, User.id == AuditLog.user_id).filter(
+            or_(
+                User.name.ilike(f"%{search}%"),
+                User.email.ilike(f"%{search}%"),
+                AuditLog.description.ilike(f"%{search}%")
+            )
+        )
+        return query, None
+
+    if db.get_bind().dialect.name == "sqlite":
+        match = " ".join(f'"{term}"*' for term in terms)
+        query = query.join(_fts, _fts.c.rowid == AuditLog.id).filter(literal_column("audit_logs_fts").op("MATCH")(match))
+        return query, _fts.c.rank.asc()
+
+    tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+    query = query.filter(_search_vector.op("@@")(tsquery))
+    return query, func.ts_rank_cd(_search_vector, tsquery).desc()
@@ -0,0 +1,87 @@
+"""
+Fast serialization of large list responses.
+
+FastAPI validates everything a route returns against its response_model
+(reading ORM attributes, nested models included) before encoding it. For
+rows just read from our own database that re-checks what the schema already
+guarantees, and on large pages it costs more than the query.
+
+The list routes instead read row tuples (or ORM rows) and build their
+response models with ``model_construct``, which skips validation, then
+serialize the whole page in one call through a cached pydantic TypeAdapter.
+The JSON is the same as the validated path produces. Every other route goes
+through ORJSONResponse, the app's default response class.
+
+Clients sending ``Accept: application/msgpack`` get MessagePack instead when
+the optional ``msgpack`` package is installed.
+"""
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Type
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from app.schemas import AuditLogResponse, LeaveRequestResponse, UserResponse
+from app.utils import normalize_audit_details
+
+try:
+    import msgpack
+except ImportError:  # MessagePack responses are disabled
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
+def wants_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return msgpack is not None and (MSGPACK_MEDIA_TYPE in accept or "application/x-msgpack" in accept)
+
+
+@lru_cache(maxsize=None)
+def adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def serialized_response(request: Request, content: Any, response_type: Any, headers: Optional[dict] = None) -> Response:
+    """Encode `content` (of `response_type`, holding constructed models) as JSON or MessagePack."""
+    if wants_msgpack(request):
+        body = msgpack.packb(adapter(response_type).dump_python(content, mode="json"))
+        return Response(body, media_type=MSGPACK_MEDIA_TYPE, headers=headers)
+    return Response(adapter(response_type).dump_json(content), media_type="application/json", headers=headers)
+
+
+def row_fields(schema: Type[BaseModel], exclude: Sequence[str] = ()) -> List[str]:
+    """Field names of `schema` in declaration order; row queries select matching columns in this order."""
+    return [name for name in schema.model_fields if name not in exclude]
+
+
+USER_FIELDS = row_fields(UserResponse)
+LEAVE_REQUEST_FIELDS = row_fields(LeaveRequestResponse, exclude=("employee",))
+
+
+def user_items(rows) -> List[UserResponse]:
+    """UserResponse models from rows of the USER_FIELDS columns."""
+    return [UserResponse.model_construct(**dict(zip(USER_FIELDS, row))) for row in rows]
+
+
+def leave_request_items(rows) -> List[LeaveRequestResponse]:
+    """LeaveRequestResponse models from rows of the LEAVE_REQUEST_FIELDS then USER_FIELDS columns."""
+    split = len(LEAVE_REQUEST_FIELDS)
+    return [
+        LeaveRequestResponse.model_construct(
+            **dict(zip(LEAVE_REQUEST_FIELDS, row[:split])),
+            employee=UserResponse.model_construct(**dict(zip(USER_FIELDS, row[split:])))
+        )
+        for row in rows
+    ]
+
+
+def audit_log_item(log) -> AuditLogResponse:
+    """AuditLogResponse from an AuditLog loaded with its user."""
+    return AuditLogResponse.model_construct(
+        id=log.id,
+        user_id=log.user_id,
+        action=log.action,
+        description=log.description,
+        details=normalize_audit_details(log.details),
+        timestamp=log.timestamp,
+        user=UserResponse.model_construct(**{name: getattr(log.user, name) for name in USER_FIELDS})
+    )
@@ -0,0 +1,41 @@
+"""
+Newline-delimited JSON responses.
+
+Long calendar ranges can be requested with ``Accept: application/x-ndjson``.
+The route then returns a generator of JSON-able dicts, written one per line as
+they are produced, instead of building the whole response body in memory.
+
+FastAPI closes request dependencies before a streamed body is sent, so a
+generator that reads the database opens its own session
+(``app.database.read_session``). Streamed ranges are capped by
+CALENDAR_STREAM_MAX_DAYS: memory stays flat, but that session stays open and
+the day sweep runs for the whole range.
+"""
+import json
+from datetime import datetime
+from typing import Iterable, Optional
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.config import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def check_stream_range(start: datetime, end: datetime) -> None:
+    """Reject a streamed range longer than CALENDAR_STREAM_MAX_DAYS."""
+    if (end - start).days > settings.CALENDAR_STREAM_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Streamed date range cannot exceed {settings.CALENDAR_STREAM_MAX_DAYS} days")
+
+
+def ndjson_response(lines: Iterable[dict], headers: Optional[dict] = None) -> StreamingResponse:
+    """Stream `lines` as NDJSON; dates, datetimes and enums are encoded like regular responses."""
+    return StreamingResponse(
+        (json.dumps(jsonable_encoder(line), separators=(",", ":")) + "\n" for line in lines),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=headers
+    )
@@ -1,7 +1,10 @@
 """
 Utility functions for the application.
 """
+import ast
+import json
 from datetime import datetime
+from typing import Optional
 import pytz
 from app.config import settings, IST
 
@@ -32,3 +35,41 @@ def make_aware(dt):
         return IST.localize(dt)
     
     return dt
+
+
+# Audit details keys copied into their own indexed audit_logs columns
+AUDIT_DETAIL_COLUMNS = ("leave_request_id", "employee_id")
+
+
+def normalize_audit_details(details) -> Optional[dict]:
+    """
+    Coerce an audit log details value to a dict (or None).
+    
+    Accepts a dict, JSON text, or the str(dict) text older seed scripts wrote.
+    Anything else is kept under "value" (or "text" if it cannot be parsed).
+    """
+    if details is None or details == "":
+        return None
+    if isinstance(details, str):
+        try:
+            details = json.loads(details)
+        except ValueError:
+            try:
+                details = ast.literal_eval(details)
+            except (ValueError, TypeError, SyntaxError):
+                return {"text": details}
+    if not isinstance(details, dict):
+        return {"value": details}
+    return details
+
+
+def audit_detail_columns(details: Optional[dict]) -> dict:
+    """Values of the AUDIT_DETAIL_COLUMNS for an audit entry with these details."""
+    values = {}
+    for key in AUDIT_DETAIL_COLUMNS:
+        value = (details or {}).get(key)
+        try:
+            values[key] = int(value) if value is not None else None
+        except (TypeError, ValueError):
+            values[key] = None
+    return values
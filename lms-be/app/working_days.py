@@ -0,0 +1,90 @@
+"""
+Chargeable days of a leave.
+
+Weekends and the employee's regional public holidays inside a leave are not
+deducted from balances. Each region's WorkingDayCalendar keeps a prefix-sum
+array of non-working days over the years its holiday calendar covers
+(prefix[i] = non-working days before the i-th day), so the chargeable days of
+any range cost two array lookups. Days outside those years only have weekends
+taken off, which is also computed in O(1).
+"""
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Optional
+from app.config import settings
+from app.holidays import HolidayIndex, get_calendar
+
+# date.weekday() of Saturday and Sunday
+WEEKEND: FrozenSet[int] = frozenset({5, 6})
+
+
+def _ordinal(value) -> int:
+    return (value.date() if isinstance(value, datetime) else value).toordinal()
+
+
+def _weekday(ordinal: int) -> int:
+    # date.fromordinal(1) is a Monday
+    return (ordinal - 1) % 7
+
+
+class WorkingDayCalendar:
+    """Non-working day prefix sums for one holiday calendar."""
+    
+    def __init__(self, holidays: HolidayIndex, weekend: FrozenSet[int] = WEEKEND):
+        self.weekend = weekend
+        self._first = holidays.first_day.toordinal()
+        self._last = holidays.last_day.toordinal()
+        self._prefix = [0]
+        day = holidays.first_day
+        for ordinal in range(self._first, self._last + 1):
+            closed = _weekday(ordinal) in weekend or holidays.is_holiday(day)
+            self._prefix.append(self._prefix[-1] + closed)
+            day += timedelta(days=1)
+    
+    def _weekend_days(self, first: int, last: int) -> int:
+        weeks, rest = divmod(last - first + 1, 7)
+        return weeks * len(self.weekend) + sum(1 for offset in range(rest) if _weekday(first + offset) in self.weekend)
+    
+    def non_working_days(self, start, end) -> int:
+        """Weekend days and holidays from start to end inclusive."""
+        first, last = _ordinal(start), _ordinal(end)
+        if last < first:
+            return 0
+        count = 0
+        if first < self._first:
+            count += self._weekend_days(first, min(last, self._first - 1))
+        if last > self._last:
+            count += self._weekend_days(max(first, self._last + 1), last)
+        low, high = max(first, self._first), min(last, self._last)
+        if low <= high:
+            count += self._prefix[high - self._first + 1] - self._prefix[low - self._first]
+        return count
+    
+    def working_days(self, start, end) -> int:
+        """Days from start to end inclusive that are neither weekends nor holidays."""
+        first, last = _ordinal(start), _ordinal(end)
+        if last < first:
+            return 0
+        return last - first + 1 - self.non_working_days(start, end)
+
+
+_calendars: Dict[str, WorkingDayCalendar] = {}
+
+
+def working_calendar(region: Optional[str] = None) -> WorkingDayCalendar:
+    """The working-day calendar of a region (the default region if None)."""
+    holidays = get_calendar(region)
+    calendar = _calendars.get(holidays.region)
+    if calendar is None:
+        calendar = _calendars[holidays.region] = WorkingDayCalendar(holidays)
+    return calendar
+
+
+# Default region's calendar
+WORKING_DAYS = working_calendar()
+
+
+def leave_duration(start_date, end_date, region: Optional[str] = None) -> int:
+    """Days a leave from start_date to end_date (inclusive) is charged in a region."""
+    if settings.CHARGE_WORKING_DAYS_ONLY:
+        return working_calendar(region).working_days(start_date, end_date)
+    return max(_ordinal(end_date) - _ordinal(start_date) + 1, 0)
@@ -0,0 +1,72 @@
+"""
+Alembic environment for LeaveXact.
+
+Migrations run on the app's own engine (so the SQLite profile pragmas apply)
+or on a connection handed over by app.bootstrap through
+``config.attributes["connection"]``. New tables are still created by
+``Base.metadata.create_all`` in bootstrap; revisions here change existing
+tables and indexes.
+
+    alembic upgrade head                      # from lms-be/
+    alembic revision --autogenerate -m "..."  # diff models against the database
+"""
+from logging.config import fileConfig
+from alembic import context
+from app.config import settings
+from app.database import Base, engine
+import app.models  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Leave the trigger-maintained audit search index (app/search.py) out of autogenerate."""
+    if type_ == "table" and name.startswith("audit_logs_fts"):
+        return False
+    if type_ == "column" and name == "search_vector":
+        return False
+    if type_ == "index" and name == "ix_audit_logs_search_vector":
+        return False
+    return True
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite cannot ALTER most things in place; batch mode recreates the table
+        render_as_batch=settings.DATABASE_URL.startswith("sqlite"),
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without a database connection (alembic upgrade --sql)."""
+    _configure(url=settings.DATABASE_URL, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
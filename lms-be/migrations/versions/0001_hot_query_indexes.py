@@ -0,0 +1,64 @@
+"""Baseline: composite and partial indexes for the hot queries
+
+Databases created before Alembic got their tables from create_all, which skips
+indexes on tables that already exist. This revision adds every index declared
+since, and is a no-op on a fresh database where create_all already made them.
+
+SQLite plans (2,000 users, 100k leave requests, 500k audit rows, see
+scripts/bench_query_plans.py):
+
+    crud query                            before                          after
+    get_leave_requests(user, status)      SCAN leave_requests             SEARCH ix_leave_requests_employee_status
+    expire_old_pending_leaves             SCAN leave_requests             SEARCH ix_leave_requests_pending_end_date
+    get_employees_on_leave_by_date(range) SCAN leave_requests             SEARCH ix_leave_requests_status_dates
+    get_upcoming_leaves                   SCAN + temp b-tree sort         SEARCH ix_leave_requests_status_dates
+    audit logs filtered by action         SCAN ix_audit_logs_timestamp_id SEARCH ix_audit_logs_action_timestamp
+    get_audit_logs(user) / delete_user    SCAN audit_logs                 SEARCH ix_audit_logs_user_timestamp
+    get_employee_calendar                 SEARCH ix_leave_calendar_leave_date*
+                                                                          SEARCH ix_leave_calendar_employee_date
+    update/remove_leave_calendar_entries  SCAN leave_calendar             SEARCH ix_leave_calendar_leave_request
+
+    * reads the date range for every employee, then filters by employee
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_ONLY = sa.text("status = 'PENDING'")
+
+INDEXES = [
+    ("ix_users_department", "users", ["department"], {}),
+    ("ix_leave_requests_employee_status", "leave_requests", ["employee_id", "status"], {}),
+    ("ix_leave_requests_status_dates", "leave_requests", ["status", "start_date", "end_date"], {}),
+    ("ix_leave_requests_pending_end_date", "leave_requests", ["end_date"],
+     {"sqlite_where": PENDING_ONLY, "postgresql_where": PENDING_ONLY}),
+    ("ix_audit_logs_timestamp_id", "audit_logs", ["timestamp", "id"], {}),
+    ("ix_audit_logs_action_timestamp", "audit_logs", ["action", "timestamp"], {}),
+    ("ix_audit_logs_user_timestamp", "audit_logs", ["user_id", "timestamp"], {}),
+    ("ix_leave_calendar_employee_date", "leave_calendar", ["employee_id", "leave_date"], {}),
+    ("ix_leave_calendar_leave_request", "leave_calendar", ["leave_request_id"], {}),
+]
+
+
+def upgrade() -> None:
+    # leave_calendar is not created on fresh databases since revision 0003
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, table, columns, options in INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, if_not_exists=True, **options)
+
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, table, _, _ in reversed(INDEXES):
+        if table in tables:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,120 @@
+"""Store audit log details as JSON, with leave_request_id and employee_id columns
+
+audit_logs.details held json.dumps(...) text, or str(dict) text from the older
+seed scripts, so finding the entries about one leave request meant parsing
+every row. This revision:
+
+- rewrites every details value as a JSON object (str(dict) text is parsed,
+  anything else is wrapped) and copies its leave_request_id and employee_id
+  into new integer columns, in batches of BATCH_SIZE rows;
+- indexes the new columns together with the timestamp;
+- on PostgreSQL, changes details to jsonb. On SQLite the column keeps its TEXT
+  declaration (JSON is stored as text there anyway) so the table and its
+  full-text triggers are not rebuilt.
+
+Downgrading drops the new columns and indexes; details keeps its JSON type,
+which the older code reads and writes as text. The columns are dropped in place
+(SQLite 3.35+ has DROP COLUMN): rebuilding the table would break the full-text
+search triggers that reference it.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+import json
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from app.utils import normalize_audit_details, audit_detail_columns
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+INDEXES = [
+    ("ix_audit_logs_leave_request_timestamp", ["leave_request_id", "timestamp"]),
+    ("ix_audit_logs_employee_timestamp", ["employee_id", "timestamp"]),
+]
+
+audit_logs = sa.table(
+    "audit_logs",
+    sa.column("id", sa.Integer),
+    sa.column("details", sa.Text),
+    sa.column("leave_request_id", sa.Integer),
+    sa.column("employee_id", sa.Integer),
+)
+
+
+def _backfill(connection) -> None:
+    """Normalize details and fill the extracted columns, BATCH_SIZE rows at a time."""
+    update = audit_logs.update().where(audit_logs.c.id == sa.bindparam("row_id")).values(
+        details=sa.bindparam("new_details"),
+        leave_request_id=sa.bindparam("new_leave_request_id"),
+        employee_id=sa.bindparam("new_employee_id"),
+    )
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(audit_logs.c.id, sa.cast(audit_logs.c.details, sa.Text))
+            .where(audit_logs.c.id > last_id, audit_logs.c.details.isnot(None))
+            .order_by(audit_logs.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        changes = []
+        for row_id, raw in rows:
+            details = normalize_audit_details(raw)
+            columns = audit_detail_columns(details)
+            text = json.dumps(details) if details else None
+            if text != raw or any(value is not None for value in columns.values()):
+                changes.append({
+                    "row_id": row_id,
+                    "new_details": text,
+                    "new_leave_request_id": columns["leave_request_id"],
+                    "new_employee_id": columns["employee_id"],
+                })
+        if changes:
+            connection.execute(update, changes)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    columns = {column["name"]: column for column in inspector.get_columns("audit_logs")}
+
+    # Fresh databases get these from create_all
+    added = False
+    for name in ("leave_request_id", "employee_id"):
+        if name not in columns:
+            op.add_column("audit_logs", sa.Column(name, sa.Integer(), nullable=True))
+            added = True
+
+    is_json = isinstance(columns["details"]["type"], sa.JSON)
+    if added or not is_json:
+        _backfill(connection)
+
+    if connection.dialect.name == "postgresql" and not is_json:
+        # The search trigger names details in its column list, which blocks the type change
+        op.execute("DROP TRIGGER IF EXISTS audit_logs_search_vector ON audit_logs")
+        op.alter_column("audit_logs", "details", type_=JSONB(), postgresql_using="details::jsonb")
+        if "search_vector" in columns:
+            from app.search import POSTGRES_DDL
+            for statement in POSTGRES_DDL:
+                connection.exec_driver_sql(statement)
+
+    for name, index_columns in INDEXES:
+        op.create_index(name, "audit_logs", index_columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="audit_logs", if_exists=True)
+    # Not batch_alter_table: the table rebuild fails on the search triggers
+    op.drop_column("audit_logs", "employee_id")
+    op.drop_column("audit_logs", "leave_request_id")
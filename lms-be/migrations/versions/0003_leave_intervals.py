@@ -0,0 +1,143 @@
+"""Store approved leaves as intervals; leave_calendar becomes a view
+
+leave_calendar held one row per leave day. This revision collapses each leave
+request's consecutive days into one leave_intervals row (a request with gaps
+gets one row per run), drops the table and recreates leave_calendar as a
+read-only view that expands the intervals back to days with the same columns
+(see app/leave_calendar.py). Existing rows are read in order and written
+BATCH_SIZE intervals at a time.
+
+Downgrading expands the intervals into a leave_calendar table again and drops
+leave_intervals.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from app.leave_calendar import CALENDAR_VIEW_DDL, day_start
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+LEAVE_TYPE = sa.Enum("ANNUAL", "SICK", "PERSONAL", "EMERGENCY", "MATERNITY", "PATERNITY", name="leavetype", create_type=False)
+
+INTERVAL_INDEXES = [
+    ("ix_leave_intervals_id", ["id"]),
+    ("ix_leave_intervals_dates", ["start_date", "end_date"]),
+    ("ix_leave_intervals_employee_dates", ["employee_id", "start_date", "end_date"]),
+    ("ix_leave_intervals_leave_request", ["leave_request_id"]),
+    ("ix_leave_intervals_days", ["days"]),
+]
+
+CALENDAR_INDEXES = [
+    ("ix_leave_calendar_id", ["id"]),
+    ("ix_leave_calendar_leave_date", ["leave_date"]),
+    ("ix_leave_calendar_employee_date", ["employee_id", "leave_date"]),
+    ("ix_leave_calendar_leave_request", ["leave_request_id"]),
+]
+
+calendar_columns = ["employee_id", "leave_request_id", "leave_date", "leave_type", "created_at"]
+interval_columns = ["employee_id", "leave_request_id", "leave_type", "start_date", "end_date", "days", "created_at"]
+
+
+def _table(name, columns):
+    types = {"leave_date": sa.DateTime, "start_date": sa.DateTime, "end_date": sa.DateTime, "created_at": sa.DateTime,
+             "days": sa.Integer, "employee_id": sa.Integer, "leave_request_id": sa.Integer, "leave_type": sa.String}
+    return sa.table(name, *(sa.column(column, types[column]) for column in columns))
+
+
+def _create_table(name, date_columns, indexes):
+    op.create_table(
+        name,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("employee_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("leave_request_id", sa.Integer(), sa.ForeignKey("leave_requests.id"), nullable=False),
+        *date_columns,
+        sa.Column("leave_type", LEAVE_TYPE, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    for index, columns in indexes:
+        op.create_index(index, name, columns)
+
+
+def _collapse(connection) -> None:
+    """Turn the leave_calendar day rows into intervals, one per run of consecutive days."""
+    calendar = _table("leave_calendar", calendar_columns)
+    intervals = _table("leave_intervals", interval_columns)
+    rows = connection.execute(
+        sa.select(*calendar.c).order_by(calendar.c.leave_request_id, calendar.c.leave_date)
+    )
+    batch, current = [], None
+    for employee_id, leave_request_id, leave_date, leave_type, created_at in rows:
+        leave_date = day_start(leave_date)
+        if current and current["leave_request_id"] == leave_request_id and leave_date <= current["end_date"] + timedelta(days=1):
+            if leave_date > current["end_date"]:
+                current["end_date"] = leave_date
+                current["days"] += 1
+            continue
+        if current:
+            batch.append(current)
+        current = {
+            "employee_id": employee_id, "leave_request_id": leave_request_id, "leave_type": leave_type,
+            "start_date": leave_date, "end_date": leave_date, "days": 1, "created_at": created_at
+        }
+        if len(batch) >= BATCH_SIZE:
+            connection.execute(sa.insert(intervals), batch)
+            batch = []
+    if current:
+        batch.append(current)
+    if batch:
+        connection.execute(sa.insert(intervals), batch)
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    inspector = sa.inspect(connection)
+    tables = set(inspector.get_table_names())
+
+    # Fresh databases get leave_intervals from create_all
+    if "leave_intervals" not in tables:
+        _create_table("leave_intervals", [
+            sa.Column("start_date", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("end_date", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("days", sa.Integer(), nullable=False),
+        ], INTERVAL_INDEXES)
+
+    if "leave_calendar" in tables:
+        _collapse(connection)
+        op.drop_table("leave_calendar")
+
+    connection.exec_driver_sql(CALENDAR_VIEW_DDL[connection.dialect.name])
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    intervals = _table("leave_intervals", interval_columns)
+    rows = connection.execute(
+        sa.select(*intervals.c).order_by(intervals.c.leave_request_id, intervals.c.start_date)
+    ).all()
+
+    connection.exec_driver_sql("DROP VIEW IF EXISTS leave_calendar")
+    _create_table("leave_calendar", [
+        sa.Column("leave_date", sa.DateTime(timezone=True), nullable=False),
+    ], CALENDAR_INDEXES)
+
+    calendar = _table("leave_calendar", calendar_columns)
+    days = [
+        {"employee_id": employee_id, "leave_request_id": leave_request_id,
+         "leave_date": start_date + timedelta(days=offset), "leave_type": leave_type, "created_at": created_at}
+        for employee_id, leave_request_id, leave_type, start_date, _, count, created_at in rows
+        for offset in range(count)
+    ]
+    for first in range(0, len(days), BATCH_SIZE):
+        connection.execute(sa.insert(calendar), days[first:first + BATCH_SIZE])
+
+    op.drop_table("leave_intervals")
@@ -0,0 +1,30 @@
+"""Add users.region for regional holiday calendars
+
+NULL means the user follows DEFAULT_HOLIDAY_REGION, so existing users keep
+the Gujarat calendar.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fresh databases get the column from create_all
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("users")}
+    if "region" not in columns:
+        op.add_column("users", sa.Column("region", sa.String(length=50), nullable=True))
+
+
+def downgrade() -> None:
+    # Not batch_alter_table: rebuilding users fails on the audit search triggers
+    # that reference it; SQLite 3.35+ drops the column in place
+    op.drop_column("users", "region")
@@ -0,0 +1,27 @@
+"""Drop ix_leave_intervals_days
+
+The index served the max(days) lookup that bounded calendar range queries;
+they are now bounded by MAX_LEAVE_SPAN_DAYS, so nothing reads it.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("leave_intervals")}
+    if "ix_leave_intervals_days" in indexes:
+        op.drop_index("ix_leave_intervals_days", table_name="leave_intervals")
+
+
+def downgrade() -> None:
+    op.create_index("ix_leave_intervals_days", "leave_intervals", ["days"])
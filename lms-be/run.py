@@ -6,6 +6,7 @@ Simple script to run the LeaveXact backend application
 
 import uvicorn
 import os
+import logging
 import sys
 from pathlib import Path
 from dotenv import load_dotenv
@@ -46,6 +47,11 @@ def main():
     print("Press Ctrl+C to stop the server")
     print()
     
+    # Migrate and seed once here; the reloaded workers only check the schema version
+    logging.basicConfig(level=logging.INFO)
+    from app.bootstrap import bootstrap
+    bootstrap()
+    
     try:
         # Run the application
         uvicorn.run(
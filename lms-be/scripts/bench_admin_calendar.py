@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Admin Calendar Benchmark
+Times crud.get_employees_on_leave_by_date_range over long ranges on a large
+synthetic set of approved leaves, against the per-day loop it replaced.
+
+A throwaway SQLite database is filled with employees and approved leave
+requests spread over a few years. For each range length the query plus
+grouping is timed end to end, and the grouping alone is timed for both the
+current per-leave expansion (crud.group_leaves_by_date) and the previous
+algorithm (every day x every overlapping leave, re-localizing both dates).
+"""
+import sys
+import os
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+LEAVE_TYPES = ["ANNUAL", "SICK", "PERSONAL", "EMERGENCY"]
+
+
+def legacy_group_by_date(leave_requests, start_date: datetime, end_date: datetime) -> dict:
+    """The day x leave loop get_employees_on_leave_by_date_range used before."""
+    import pytz
+
+    calendar_data = {}
+    current_date = start_date
+    while current_date <= end_date:
+        date_str = current_date.strftime("%Y-%m-%d")
+        calendar_data[date_str] = []
+        for leave in leave_requests:
+            leave_start = leave.start_date
+            leave_end = leave.end_date
+            if leave_start.tzinfo is None:
+                leave_start = pytz.timezone('Asia/Kolkata').localize(leave_start)
+            if leave_end.tzinfo is None:
+                leave_end = pytz.timezone('Asia/Kolkata').localize(leave_end)
+            if leave_start.date() <= current_date.date() <= leave_end.date():
+                calendar_data[date_str].append({
+                    "employee_id": leave.employee.id,
+                    "employee_name": leave.employee.name,
+                    "employee_code": leave.employee.employee_id,
+                    "department": leave.employee.department,
+                    "leave_type": leave.leave_type,
+                    "leave_request_id": leave.id,
+                    "start_date": leave.start_date,
+                    "end_date": leave.end_date,
+                    "duration": leave.duration
+                })
+        current_date += timedelta(days=1)
+    return calendar_data
+
+
+def generate(employees: int, leaves: int, years: int, start: datetime) -> None:
+    from sqlalchemy import insert
+    from app.bootstrap import migrate
+    from app.database import engine
+    from app.models import User, LeaveRequest
+
+    migrate()
+    random.seed(42)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": user_id, "employee_id": f"EMP{user_id:06d}", "name": f"Employee {user_id}",
+             "email": f"employee{user_id}@bench.local", "password_hash": "x", "role": "EMPLOYEE",
+             "department": f"Department {user_id % 25}", "created_at": start}
+            for user_id in range(1, employees + 1)
+        ])
+        batch = []
+        for leave_id in range(1, leaves + 1):
+            begin = start + timedelta(days=random.randint(0, 365 * years - 1))
+            duration = random.choice([1, 1, 2, 3, 5, 10])
+            batch.append({
+                "id": leave_id, "employee_id": random.randint(1, employees), "leave_type": random.choice(LEAVE_TYPES),
+                "start_date": begin, "end_date": begin + timedelta(days=duration - 1), "duration": duration,
+                "reason": "Synthetic", "status": "APPROVED", "created_at": begin - timedelta(days=7)
+            })
+            if len(batch) == 10000:
+                connection.execute(insert(LeaveRequest), batch)
+                batch = []
+        if batch:
+            connection.execute(insert(LeaveRequest), batch)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run(args) -> None:
+    from sqlalchemy.orm import joinedload
+    from app import crud
+    from app.database import SessionLocal
+    from app.models import LeaveRequest, LeaveStatus
+
+    start = datetime(2024, 1, 1)
+    print(f"Generating {args.employees} employees and {args.leaves} approved leaves over {args.years} years...")
+    generate(args.employees, args.leaves, args.years, start)
+
+    print("=" * 80)
+    print(f"{'range':>8} {'leaves':>8} {'query+group ms':>15} {'group ms':>10} {'old loop ms':>12}")
+    for days in args.ranges:
+        end = start + timedelta(days=days - 1)
+        db = SessionLocal()
+        try:
+            calendar, total_ms = timed(crud.get_employees_on_leave_by_date_range, db, start, end)
+            leave_requests = db.query(LeaveRequest).options(joinedload(LeaveRequest.employee)).filter(
+                LeaveRequest.status == LeaveStatus.APPROVED,
+                LeaveRequest.start_date <= end,
+                LeaveRequest.end_date >= start
+            ).all()
+            grouped, group_ms = timed(crud.group_leaves_by_date, leave_requests, start, end)
+            if days <= args.legacy_max_days:
+                legacy, legacy_ms = timed(legacy_group_by_date, leave_requests, start, end)
+                assert {day: len(rows) for day, rows in legacy.items()} == {day: len(rows) for day, rows in grouped.items()}
+                legacy_text = f"{legacy_ms:>12.1f}"
+            else:
+                legacy_text = f"{'skipped':>12}"
+            print(f"{days:>8} {len(leave_requests):>8} {total_ms:>15.1f} {group_ms:>10.1f} {legacy_text}")
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the admin calendar date range grouping")
+    parser.add_argument("--employees", type=int, default=2000, help="Synthetic employees")
+    parser.add_argument("--leaves", type=int, default=100000, help="Approved leave requests")
+    parser.add_argument("--years", type=int, default=3, help="Years the leaves are spread over")
+    parser.add_argument("--ranges", type=int, nargs="+", default=[30, 90, 365, 731], help="Range lengths in days")
+    parser.add_argument("--legacy-max-days", type=int, default=90, help="Longest range to also time with the old loop")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="leavexact-calendar-"))
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+    try:
+        run(args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
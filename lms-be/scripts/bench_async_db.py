@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Async vs Sync Database Benchmark
+Compares requests/second of the hot read paths with ASYNC_DB_ENABLED off and on.
+
+Each mode runs in its own process against the same bootstrapped database,
+driving the ASGI app in-process with N concurrent clients (requires httpx).
+"""
+import sys
+import os
+import time
+import json
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+ENDPOINTS = ["/api/auth/me", "/api/leave/my-requests", "/api/leave/?limit=50"]
+
+
+async def run_clients(clients: int, requests_per_client: int) -> dict:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async with app.router.lifespan_context(app):
+            response = await client.post("/api/auth/login", json={"email": "sarah@leavexact.com", "password": "employee@123"})
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            errors = 0
+
+            async def worker(index: int):
+                nonlocal errors
+                for i in range(requests_per_client):
+                    endpoint = ENDPOINTS[(index + i) % len(ENDPOINTS)]
+                    response = await client.get(endpoint, headers=headers)
+                    if response.status_code != 200:
+                        errors += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker(i) for i in range(clients)))
+            elapsed = time.perf_counter() - start
+
+    total = clients * requests_per_client
+    return {"requests": total, "elapsed": elapsed, "rps": total / elapsed, "errors": errors}
+
+
+def run_mode(async_enabled: bool, clients: int, requests_per_client: int) -> dict:
+    # The async engine refuses the SQLite production profile, so both modes run without it
+    env = dict(os.environ, ASYNC_DB_ENABLED="true" if async_enabled else "false", SQLITE_PRODUCTION_PROFILE="false")
+    output = subprocess.check_output(
+        [sys.executable, __file__, "--child", "--clients", str(clients), "--requests", str(requests_per_client)],
+        env=env,
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database handlers")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per client")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_clients(args.clients, args.requests))))
+        sys.exit(0)
+
+    from app.bootstrap import is_schema_current, bootstrap
+    if not is_schema_current():
+        bootstrap()
+
+    print(f"{args.clients} concurrent clients x {args.requests} requests over {', '.join(ENDPOINTS)}")
+    print("=" * 64)
+    print(f"{'mode':>6} {'requests':>9} {'elapsed (s)':>12} {'req/s':>9} {'errors':>7}")
+    for async_enabled in (False, True):
+        result = run_mode(async_enabled, args.clients, args.requests)
+        mode = "async" if async_enabled else "sync"
+        print(f"{mode:>6} {result['requests']:>9} {result['elapsed']:>12.2f} {result['rps']:>9.1f} {result['errors']:>7}")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Password Hashing Benchmark
+Measures login (verify) throughput inline vs. through the hashing process pool
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.hashing import PasswordHasher, build_context
+
+
+async def run_logins(hasher: PasswordHasher, stored_hash: str, logins: int, concurrency: int) -> float:
+    """Verify `logins` passwords with `concurrency` in flight; returns elapsed seconds."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            assert await hasher.verify_async("employee@123", stored_hash)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    return time.perf_counter() - start
+
+
+def benchmark(rounds: int, logins: int, concurrency: int, max_workers: int):
+    stored_hash = build_context(rounds).hash("employee@123")
+    cores = os.cpu_count() or 1
+
+    print(f"pbkdf2_sha256 rounds={rounds}, logins={logins}, concurrency={concurrency}, cores={cores}")
+    print("=" * 64)
+    print(f"{'workers':>8} {'elapsed (s)':>12} {'logins/s':>10} {'logins/s/core':>14}")
+
+    for workers in [0] + [w for w in (1, 2, 4, 8, 16) if w <= max_workers]:
+        hasher = PasswordHasher(rounds=rounds, workers=workers)
+        # Warm the pool so process start-up is not measured
+        asyncio.run(run_logins(hasher, stored_hash, max(workers, 1), max(workers, 1)))
+        elapsed = asyncio.run(run_logins(hasher, stored_hash, logins, concurrency))
+        hasher.shutdown()
+
+        rate = logins / elapsed
+        used_cores = min(max(workers, 1), cores)
+        label = "inline" if workers == 0 else str(workers)
+        print(f"{label:>8} {elapsed:>12.2f} {rate:>10.1f} {rate / used_cores:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark login password verification throughput")
+    parser.add_argument("--rounds", type=int, default=29000, help="pbkdf2 rounds (work factor)")
+    parser.add_argument("--logins", type=int, default=200, help="Number of logins to verify")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent logins in flight")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest pool size to try")
+    args = parser.parse_args()
+
+    benchmark(args.rounds, args.logins, args.concurrency, args.max_workers)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Query Plan Benchmark
+Shows the SQLite plan and latency of the hot crud.py queries with and without
+the composite indexes declared on the models, on a large synthetic dataset.
+
+A synthetic database is generated once, then each mode runs in its own process
+on a fresh copy: "before" drops every index declared in a model's
+__table_args__, "after" keeps them all. Every SQL statement a crud call issues
+is captured and explained with EXPLAIN QUERY PLAN.
+"""
+import sys
+import os
+import time
+import json
+import random
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import subprocess
+from datetime import timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+LEAVE_TYPES = ["ANNUAL", "SICK", "PERSONAL", "EMERGENCY"]
+STATUSES = ["APPROVED"] * 7 + ["REJECTED"] * 2 + ["PENDING"]
+ACTIONS = ["leave_requested", "leave_approved", "leave_rejected", "employee_updated", "profile_updated"]
+
+
+def generate(employees: int, leaves_per_employee: int, audit_per_employee: int) -> None:
+    """Fill the (empty, migrated) database at DATABASE_URL with synthetic rows."""
+    from sqlalchemy import insert
+    from app.database import engine
+    from app.bootstrap import migrate
+    from app.models import User, LeaveRequest, AuditLog, LeaveInterval
+    from app.crud import rebuild_system_counters
+    from app.leave_calendar import day_start
+    from app.database import SessionLocal
+    from app.utils import get_current_time
+
+    migrate()
+    random.seed(42)
+    today = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    users = [
+        {
+            "id": user_id, "employee_id": f"EMP{user_id:06d}", "name": f"Employee {user_id}",
+            "email": f"employee{user_id}@bench.local", "password_hash": "x", "role": "EMPLOYEE",
+            "department": f"Department {user_id % 25}", "created_at": today
+        }
+        for user_id in range(1, employees + 1)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(User), users)
+
+    leave_id = 0
+    for first in range(1, employees + 1, 200):
+        leaves, intervals, audits = [], [], []
+        for user_id in range(first, min(first + 200, employees + 1)):
+            for _ in range(leaves_per_employee):
+                leave_id += 1
+                start = today + timedelta(days=random.randint(-900, 120))
+                duration = random.randint(1, 5)
+                status = random.choice(STATUSES)
+                leave_type = random.choice(LEAVE_TYPES)
+                leaves.append({
+                    "id": leave_id, "employee_id": user_id, "leave_type": leave_type,
+                    "start_date": start, "end_date": start + timedelta(days=duration - 1), "duration": duration,
+                    "reason": "Synthetic", "status": status, "created_at": start - timedelta(days=7)
+                })
+                if status == "APPROVED":
+                    intervals.append(
+                        {"employee_id": user_id, "leave_request_id": leave_id, "leave_type": leave_type,
+                         "start_date": day_start(start), "end_date": day_start(start) + timedelta(days=duration - 1),
+                         "days": duration, "created_at": start}
+                    )
+            first_leave = leave_id - leaves_per_employee + 1
+            for _ in range(audit_per_employee):
+                request_id = random.randint(first_leave, leave_id) if leaves_per_employee else None
+                audits.append(
+                    {"user_id": user_id, "action": random.choice(ACTIONS), "description": f"Synthetic entry for employee {user_id}",
+                     "details": {"leave_request_id": request_id, "employee_id": user_id}, "leave_request_id": request_id,
+                     "employee_id": user_id, "timestamp": today - timedelta(minutes=random.randint(0, 525600 * 2))}
+                )
+        with engine.begin() as connection:
+            connection.execute(insert(LeaveRequest), leaves)
+            if intervals:
+                connection.execute(insert(LeaveInterval), intervals)
+            connection.execute(insert(AuditLog), audits)
+
+    db = SessionLocal()
+    try:
+        rebuild_system_counters(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def scenarios(employees: int):
+    from app import crud
+    from app.models import LeaveStatus
+    from app.utils import get_current_time
+
+    today = get_current_time().replace(hour=0, minute=0, second=0, microsecond=0)
+    user_id = employees // 2
+    # (name, call, read_only)
+    return [
+        ("get_leave_requests(user, status)", lambda db: crud.get_leave_requests(db, user_id=user_id, status=LeaveStatus.APPROVED), True),
+        ("get_leave_requests(status)", lambda db: crud.get_leave_requests(db, status=LeaveStatus.PENDING), True),
+        ("get_employees_on_leave_by_date", lambda db: crud.get_employees_on_leave_by_date(db, today), True),
+        ("get_employees_on_leave_by_date_range", lambda db: crud.get_employees_on_leave_by_date_range(db, today, today + timedelta(days=6)), True),
+        ("get_upcoming_leaves", lambda db: crud.get_upcoming_leaves(db, days=30), True),
+        ("get_employee_calendar", lambda db: crud.get_employee_calendar(db, user_id, today - timedelta(days=365), today), True),
+        ("get_all_employees_calendar", lambda db: crud.get_all_employees_calendar(db, today, today + timedelta(days=6)), True),
+        ("get_leave_request_history", lambda db: crud.get_leave_request_history(db, user_id), True),
+        ("get_audit_logs(user)", lambda db: crud.get_audit_logs(db, user_id=user_id), True),
+        ("get_audit_logs_paginated(action)", lambda db: crud.get_audit_logs_paginated(db, limit=20, action="leave_approved"), True),
+        ("get_audit_logs_keyset(page 1)", lambda db: crud.get_audit_logs_keyset(db, limit=20), True),
+        ("get_system_summary", lambda db: crud.get_system_summary(db), True),
+        ("get_employees_analytics", lambda db: crud.get_employees_analytics(db, limit=50), True),
+        ("get_department_analytics", lambda db: crud.get_department_analytics(db), True),
+        ("remove_leave_calendar_entries", lambda db: crud.remove_leave_calendar_entries(db, user_id), False),
+        ("expire_old_pending_leaves", lambda db: crud.expire_old_pending_leaves(db), False),
+        ("delete_user", lambda db: crud.delete_user(db, user_id), False),
+    ]
+
+
+def declared_indexes():
+    """Indexes listed in the models' __table_args__ (not the single-column index=True ones)."""
+    from sqlalchemy import Index
+    from app.database import Base
+    import app.models  # noqa: F401 - registers the mappers walked below
+
+    for mapper in Base.registry.mappers:
+        for arg in getattr(mapper.class_, "__table_args__", ()):
+            if isinstance(arg, Index):
+                yield arg
+
+
+def run_child(indexes: bool, employees: int, repeat: int) -> dict:
+    from sqlalchemy import event, text
+    from app.database import engine, SessionLocal
+
+    with engine.begin() as connection:
+        if not indexes:
+            for index in declared_indexes():
+                index.drop(connection, checkfirst=True)
+        connection.execute(text("ANALYZE"))
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE", "WITH"):
+            captured.append((statement, parameters))
+
+    results = {}
+    for name, call, read_only in scenarios(employees):
+        timings = []
+        for _ in range(repeat if read_only else 1):
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            db = SessionLocal()
+            try:
+                start = time.perf_counter()
+                call(db)
+                timings.append((time.perf_counter() - start) * 1000)
+                db.rollback()
+            finally:
+                db.close()
+                event.remove(engine, "before_cursor_execute", capture)
+
+        plans = []
+        with engine.connect() as connection:
+            for statement, parameters in captured:
+                rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+                plans.append(" | ".join(row[-1] for row in rows))
+        results[name] = {"ms": sorted(timings)[len(timings) // 2], "plans": plans}
+    return results
+
+
+def run_mode(indexes: bool, source: Path, args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="leavexact-plans-"))
+    try:
+        database = workdir / "bench.db"
+        with sqlite3.connect(source) as src, sqlite3.connect(database) as dst:
+            src.backup(dst)
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--child", "run", "--indexes", "on" if indexes else "off",
+             "--employees", str(args.employees), "--repeat", str(args.repeat)],
+            env=child_env(database),
+        )
+        return json.loads(output.decode().strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def child_env(database: Path) -> dict:
+    return dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database}",
+        AUDIT_TOTAL_CACHE_TTL_SECONDS="0",
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explain the hot crud.py queries before and after the index migrations")
+    parser.add_argument("--employees", type=int, default=2000, help="Synthetic employees")
+    parser.add_argument("--leaves", type=int, default=50, help="Leave requests per employee")
+    parser.add_argument("--audit", type=int, default=250, help="Audit log entries per employee")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per read-only query (median is reported)")
+    parser.add_argument("--plans", action="store_true", help="Print every statement's plan, not just the first")
+    parser.add_argument("--child", choices=["generate", "run"], help=argparse.SUPPRESS)
+    parser.add_argument("--indexes", choices=["on", "off"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "generate":
+        generate(args.employees, args.leaves, args.audit)
+        sys.exit(0)
+    if args.child == "run":
+        print(json.dumps(run_child(args.indexes == "on", args.employees, args.repeat)))
+        sys.exit(0)
+
+    workdir = Path(tempfile.mkdtemp(prefix="leavexact-synthetic-"))
+    try:
+        source = workdir / "synthetic.db"
+        print(f"Generating {args.employees} employees, {args.employees * args.leaves} leave requests, "
+              f"{args.employees * args.audit} audit entries...")
+        subprocess.check_call(
+            [sys.executable, __file__, "--child", "generate", "--employees", str(args.employees),
+             "--leaves", str(args.leaves), "--audit", str(args.audit)],
+            env=child_env(source),
+        )
+        before = run_mode(False, source, args)
+        after = run_mode(True, source, args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print("=" * 100)
+    print(f"{'query':<38} {'before ms':>10} {'after ms':>10}")
+    for name in before:
+        print(f"{name:<38} {before[name]['ms']:>10.2f} {after[name]['ms']:>10.2f}")
+    print("=" * 100)
+    for name in before:
+        print(name)
+        count = None if args.plans else 1
+        for plan in before[name]["plans"][:count]:
+            print(f"  before: {plan}")
+        for plan in after[name]["plans"][:count]:
+            print(f"  after:  {plan}")
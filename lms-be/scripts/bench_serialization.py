@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Response Serialization Benchmark
+Times encoding 10k-row leave request and employee pages the way FastAPI does
+for a response_model against the fast path in app/serialization.py.
+
+- validated + json: validate every ORM row against the response model, dump
+  it to JSON-able Python and encode with the stdlib (the old path);
+- validated + orjson: the same with ORJSONResponse, the app's default;
+- constructed: model_construct from row tuples and one TypeAdapter.dump_json
+  (the list routes' path), plus MessagePack when msgpack is installed.
+
+Rows are synthetic, so no database is needed. The outputs of the validated and
+constructed paths are compared before timing.
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import orjson
+from pydantic import TypeAdapter
+from app.models import Gender, LeaveStatus, LeaveType, UserRole
+from app.schemas import LeaveRequestResponse, UserResponse
+from app.serialization import (
+    LEAVE_REQUEST_FIELDS, USER_FIELDS, adapter, leave_request_items, msgpack, user_items
+)
+
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "HR", "Finance", "Operations"]
+
+
+def user_row(index: int) -> dict:
+    created = datetime(2024, 1, 1) + timedelta(minutes=index)
+    return {
+        "name": f"Employee {index}", "email": f"employee{index}@example.com",
+        "department": random.choice(DEPARTMENTS), "role": UserRole.EMPLOYEE,
+        "gender": random.choice(list(Gender)), "region": None,
+        "id": index, "employee_id": f"EMP{index:05d}",
+        "annual_leave": random.randint(0, 20), "sick_leave": random.randint(0, 10),
+        "personal_leave": 5, "emergency_leave": 5, "maternity_leave": 0, "paternity_leave": 15,
+        "created_at": created, "updated_at": created + timedelta(days=30)
+    }
+
+
+def leave_row(index: int, employee: dict) -> dict:
+    start = datetime(2025, 1, 1) + timedelta(days=random.randint(0, 365))
+    return {
+        "leave_type": random.choice(list(LeaveType)), "start_date": start,
+        "end_date": start + timedelta(days=random.randint(0, 5)),
+        "reason": "Family function out of town", "id": index, "employee_id": employee["id"],
+        "duration": random.randint(1, 5), "status": random.choice(list(LeaveStatus)),
+        "admin_comment": None, "created_at": start - timedelta(days=7), "updated_at": None
+    }
+
+
+def build_pages(rows: int, seed: int):
+    random.seed(seed)
+    users = [user_row(index) for index in range(1, rows + 1)]
+    leaves = [leave_row(index, random.choice(users)) for index in range(1, rows + 1)]
+    employees = {user["id"]: user for user in users}
+
+    # ORM-like objects for the validated path, row tuples for the constructed path
+    user_objects = [SimpleNamespace(**user) for user in users]
+    leave_objects = [SimpleNamespace(**leave, employee=user_objects[leave["employee_id"] - 1]) for leave in leaves]
+    user_tuples = [tuple(user[name] for name in USER_FIELDS) for user in users]
+    leave_tuples = [
+        tuple(leave[name] for name in LEAVE_REQUEST_FIELDS) + tuple(employees[leave["employee_id"]][name] for name in USER_FIELDS)
+        for leave in leaves
+    ]
+    return {
+        "leave requests": (List[LeaveRequestResponse], leave_objects, leave_tuples, leave_request_items),
+        "employees": (List[UserResponse], user_objects, user_tuples, user_items),
+    }
+
+
+def validated(response_type, objects, encode):
+    type_adapter = TypeAdapter(response_type)
+    content = type_adapter.dump_python(type_adapter.validate_python(objects, from_attributes=True), mode="json")
+    return encode(content)
+
+
+def stdlib_json(content) -> bytes:
+    # What starlette's JSONResponse does
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def timed(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per method (best is reported)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"{'response':<16} {'method':<20} {'rows':>8} {'ms':>10} {'us/row':>8} {'bytes':>10}")
+    for name, (response_type, objects, tuples, items) in build_pages(args.rows, args.seed).items():
+        fast = adapter(response_type).dump_json(items(tuples))
+        assert json.loads(fast) == json.loads(validated(response_type, objects, stdlib_json)), name
+
+        methods = [
+            ("validated + json", lambda: validated(response_type, objects, stdlib_json)),
+            ("validated + orjson", lambda: validated(response_type, objects, orjson.dumps)),
+            ("constructed", lambda: adapter(response_type).dump_json(items(tuples))),
+        ]
+        if msgpack is not None:
+            methods.append(("constructed msgpack", lambda: msgpack.packb(adapter(response_type).dump_python(items(tuples), mode="json"))))
+        for method, function in methods:
+            seconds = timed(function, args.repeat)
+            size = len(function())
+            print(f"{name:<16} {method:<20} {args.rows:>8} {seconds * 1000:>10.1f} {seconds / args.rows * 1e6:>8.2f} {size:>10}")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Load Test
+Runs a mixed read/write workload with SQLITE_PRODUCTION_PROFILE off and on.
+
+Each mode runs in its own process on a fresh copy of the database, driving
+the ASGI app in-process with concurrent readers and writers (requires httpx).
+Without the profile the copy is switched back to the rollback journal.
+"""
+import sys
+import os
+import time
+import json
+import shutil
+import sqlite3
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+READ_ENDPOINTS = [
+    "/api/analytics/summary",
+    "/api/employees/?limit=50",
+    "/api/leave/calendar/my-calendar?start_date=2026-01-01&end_date=2026-12-31",
+]
+WRITERS = ["sarah@leavexact.com", "michael@leavexact.com", "emily@leavexact.com", "david@leavexact.com"]
+
+
+async def run_load(readers: int, writers: int, duration: float) -> dict:
+    import httpx
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async with app.router.lifespan_context(app):
+            async def login(email, password):
+                response = await client.post("/api/auth/login", json={"email": email, "password": password})
+                return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+            admin = await login("admin@leavexact.com", "admin@123")
+            employees = [await login(email, "employee@123") for email in WRITERS]
+            counts = {"reads": 0, "writes": 0, "errors": 0}
+            deadline = time.perf_counter() + duration
+
+            async def reader(index: int):
+                i = index
+                while time.perf_counter() < deadline:
+                    response = await client.get(READ_ENDPOINTS[i % len(READ_ENDPOINTS)], headers=admin)
+                    counts["reads" if response.status_code == 200 else "errors"] += 1
+                    i += 1
+
+            async def writer(index: int):
+                headers = employees[index % len(employees)]
+                i = 0
+                while time.perf_counter() < deadline:
+                    response = await client.put("/api/auth/profile", headers=headers, json={"name": f"Load Test {index}-{i}"})
+                    counts["writes" if response.status_code == 200 else "errors"] += 1
+                    i += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*[reader(i) for i in range(readers)], *[writer(i) for i in range(writers)])
+            elapsed = time.perf_counter() - start
+
+    return {**counts, "elapsed": elapsed}
+
+
+def run_mode(profile: bool, source: Path, args) -> dict:
+    workdir = Path(tempfile.mkdtemp(prefix="leavexact-bench-"))
+    try:
+        database = workdir / "bench.db"
+        with sqlite3.connect(source) as src, sqlite3.connect(database) as dst:
+            src.backup(dst)
+        if not profile:
+            with sqlite3.connect(database) as connection:
+                connection.execute("PRAGMA journal_mode=DELETE")
+
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{database}",
+            SQLITE_PRODUCTION_PROFILE="true" if profile else "false",
+        )
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--child", "--readers", str(args.readers),
+             "--writers", str(args.writers), "--duration", str(args.duration)],
+            env=env,
+        )
+        return json.loads(output.decode().strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the SQLite production profile")
+    parser.add_argument("--readers", type=int, default=32, help="Concurrent readers")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writers")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per mode")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_load(args.readers, args.writers, args.duration))))
+        sys.exit(0)
+
+    from sqlalchemy.engine import make_url
+    from app.config import settings
+    from app.bootstrap import is_schema_current, bootstrap
+    if not settings.DATABASE_URL.startswith("sqlite"):
+        sys.exit("DATABASE_URL must point at a SQLite database")
+    if not is_schema_current():
+        bootstrap()
+    source = Path(make_url(settings.DATABASE_URL).database)
+
+    print(f"{args.readers} readers + {args.writers} writers for {args.duration:.0f}s per mode")
+    print("=" * 64)
+    print(f"{'profile':>8} {'reads/s':>9} {'writes/s':>9} {'errors':>7}")
+    for profile in (False, True):
+        result = run_mode(profile, source, args)
+        label = "on" if profile else "off"
+        print(f"{label:>8} {result['reads'] / result['elapsed']:>9.1f} {result['writes'] / result['elapsed']:>9.1f} {result['errors']:>7}")
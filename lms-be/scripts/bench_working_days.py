@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Working Day Benchmark
+Times app.working_days over millions of random leave ranges against counting
+the days one by one.
+
+The prefix-sum calendar answers each range with two array lookups; the
+reference walks every day of the range and checks the weekend and the holiday
+index. A sample of ranges is checked against the reference before timing.
+"""
+import sys
+import time
+import random
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.holidays import HOLIDAY_INDEX
+from app.working_days import WORKING_DAYS, WEEKEND
+
+
+def day_by_day(start: date, end: date) -> int:
+    """Working days counted one day at a time."""
+    count = 0
+    day = start
+    while day <= end:
+        if day.weekday() not in WEEKEND and not HOLIDAY_INDEX.on(day):
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+def random_ranges(count: int, max_days: int, seed: int):
+    random.seed(seed)
+    first = HOLIDAY_INDEX.first_day
+    span = (HOLIDAY_INDEX.last_day - first).days
+    ranges = []
+    for _ in range(count):
+        start = first + timedelta(days=random.randint(0, span))
+        ranges.append((start, start + timedelta(days=random.randint(0, max_days - 1))))
+    return ranges
+
+
+def timed(function, ranges) -> float:
+    started = time.perf_counter()
+    for start, end in ranges:
+        function(start, end)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark working-day leave durations")
+    parser.add_argument("--ranges", type=int, default=2000000, help="Random ranges for the prefix-sum calendar")
+    parser.add_argument("--reference-ranges", type=int, default=100000, help="Ranges for the day-by-day count")
+    parser.add_argument("--max-days", type=int, default=30, help="Longest range in days")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ranges = random_ranges(args.ranges, args.max_days, args.seed)
+    for start, end in ranges[:min(len(ranges), 20000)]:
+        assert WORKING_DAYS.working_days(start, end) == day_by_day(start, end), (start, end)
+
+    print("=" * 80)
+    print(f"{'method':<14} {'ranges':>10} {'seconds':>10} {'ns/range':>10}")
+    for name, function, sample in [
+        ("prefix sums", WORKING_DAYS.working_days, ranges),
+        ("day by day", day_by_day, ranges[:args.reference_ranges]),
+    ]:
+        seconds = timed(function, sample)
+        print(f"{name:<14} {len(sample):>10} {seconds:>10.2f} {seconds / len(sample) * 1e9:>10.0f}")
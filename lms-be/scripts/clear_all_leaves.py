@@ -9,7 +9,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
-from app.models import User, LeaveRequest, AuditLog, LeaveCalendar
+from app.models import User, LeaveRequest, AuditLog, LeaveInterval
+from app.crud import rebuild_system_counters
 
 def clear_leaves():
     """Clear all leave requests, calendar entries, and reset balances"""
@@ -22,16 +23,16 @@ def clear_leaves():
         
         # Count before deletion
         leave_count = db.query(LeaveRequest).count()
-        calendar_count = db.query(LeaveCalendar).count()
+        calendar_count = db.query(LeaveInterval).count()
         audit_count = db.query(AuditLog).count()
         
         print(f"\nFound:")
         print(f"  - {leave_count} leave requests")
-        print(f"  - {calendar_count} calendar entries")
+        print(f"  - {calendar_count} calendar intervals")
         print(f"  - {audit_count} audit logs")
         
         # Delete all leave-related data
-        db.query(LeaveCalendar).delete()
+        db.query(LeaveInterval).delete()
         db.query(LeaveRequest).delete()
         db.query(AuditLog).delete()
         
@@ -57,6 +58,7 @@ def clear_leaves():
                 emp.maternity_leave = 0
                 emp.paternity_leave = 15
         
+        rebuild_system_counters(db)
         db.commit()
         
         print("\n✓ Deleted all leave requests")
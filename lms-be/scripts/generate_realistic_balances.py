@@ -23,14 +23,15 @@ import os
 from pathlib import Path
 from datetime import datetime, timedelta, date
 import random
-import json
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine
-from app.models import User, LeaveRequest, AuditLog, LeaveCalendar, LeaveType, LeaveStatus, Gender
+from app.models import User, LeaveRequest, AuditLog, LeaveInterval, LeaveType, LeaveStatus, Gender
+from app.crud import update_leave_calendar, rebuild_system_counters
+from app.working_days import leave_duration
 
 # ============================================================================
 # CONFIGURATION
@@ -271,7 +272,7 @@ def clear_existing_data(db: Session):
     """Clear all existing leave data and reset balances"""
     print("\n🧹 Clearing existing leave data...")
     
-    db.query(LeaveCalendar).delete()
+    db.query(LeaveInterval).delete()
     db.query(LeaveRequest).delete()
     db.query(AuditLog).delete()
     
@@ -365,6 +366,11 @@ def generate_leaves_for_employee(db: Session, employee: User, admin: User, profi
             start_date -= timedelta(days=shift_back)
             end_date = start_date + timedelta(days=duration - 1)
         
+        # Only working days in the range are charged
+        duration = leave_duration(start_date, end_date, employee.region)
+        if duration == 0:
+            continue
+        
         # Determine status - APPROVED to hit our target
         status = LeaveStatus.APPROVED
         admin_comment = random.choice(ADMIN_COMMENTS_APPROVED)
@@ -398,30 +404,21 @@ def generate_leaves_for_employee(db: Session, employee: User, admin: User, profi
         db.add(leave_request)
         db.flush()
         
-        # Create calendar entries for approved leaves
-        current = start_date
-        while current <= end_date:
-            calendar_entry = LeaveCalendar(
-                employee_id=employee.id,
-                leave_request_id=leave_request.id,
-                leave_date=datetime.combine(current, datetime.min.time()),
-                leave_type=leave_type,
-            )
-            db.add(calendar_entry)
-            current += timedelta(days=1)
+        # Add approved leaves to the calendar
+        update_leave_calendar(db, leave_request)
         
         # Create audit logs
         audit_request = AuditLog(
             user_id=employee.id,
             action="leave_requested",
             description=f"Submitted {leave_type.value} leave request for {duration} day(s)",
-            details=json.dumps({
+            details={
                 "leave_request_id": leave_request.id,
                 "leave_type": leave_type.value,
                 "start_date": start_date.isoformat(),
                 "end_date": end_date.isoformat(),
                 "duration": duration,
-            }),
+            },
             timestamp=created_at,
         )
         db.add(audit_request)
@@ -430,13 +427,13 @@ def generate_leaves_for_employee(db: Session, employee: User, admin: User, profi
             user_id=admin.id,
             action="leave_approved",
             description=f"Approved {leave_type.value} leave for {employee.name} ({duration} days)",
-            details=json.dumps({
+            details={
                 "leave_request_id": leave_request.id,
                 "employee_id": employee.id,
                 "employee_name": employee.name,
                 "leave_type": leave_type.value,
                 "duration": duration,
-            }),
+            },
             timestamp=updated_at,
         )
         db.add(audit_approve)
@@ -490,13 +487,13 @@ def generate_leaves_for_employee(db: Session, employee: User, admin: User, profi
             user_id=employee.id,
             action="leave_requested",
             description=f"Submitted {leave_type.value} leave request for {duration} day(s)",
-            details=json.dumps({
+            details={
                 "leave_request_id": leave_request.id,
                 "leave_type": leave_type.value,
                 "start_date": start_date.isoformat(),
                 "end_date": end_date.isoformat(),
                 "duration": duration,
-            }),
+            },
             timestamp=created_at,
         )
         db.add(audit_request)
@@ -543,13 +540,13 @@ def generate_leaves_for_employee(db: Session, employee: User, admin: User, profi
             user_id=employee.id,
             action="leave_requested",
             description=f"Submitted {leave_type.value} leave request for {duration} day(s)",
-            details=json.dumps({
+            details={
                 "leave_request_id": leave_request.id,
                 "leave_type": leave_type.value,
                 "start_date": start_date.isoformat(),
                 "end_date": end_date.isoformat(),
                 "duration": duration,
-            }),
+            },
             timestamp=created_at,
         )
         db.add(audit_request)
@@ -558,11 +555,11 @@ def generate_leaves_for_employee(db: Session, employee: User, admin: User, profi
             user_id=admin.id,
             action="leave_rejected",
             description=f"Rejected {leave_type.value} leave for {employee.name}",
-            details=json.dumps({
+            details={
                 "leave_request_id": leave_request.id,
                 "employee_name": employee.name,
                 "reason": admin_comment,
-            }),
+            },
             timestamp=updated_at,
         )
         db.add(audit_reject)
@@ -648,6 +645,7 @@ def run():
             print(f"   Balance → Annual: {remaining.get('annual', 0)} | Sick: {remaining.get('sick', 0)} | Personal: {remaining.get('personal', 0)} | Emergency: {remaining.get('emergency', 0)}")
         
         # Commit all changes
+        rebuild_system_counters(db)
         db.commit()
         
         # Step 4: Print summary
@@ -14,8 +14,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy.orm import Session
 from app.database import SessionLocal, engine
-from app.models import User, LeaveRequest, AuditLog, LeaveCalendar, LeaveType, LeaveStatus
-from app.crud import update_leave_calendar
+from app.models import User, LeaveRequest, AuditLog, LeaveType, LeaveStatus
+from app.crud import update_leave_calendar, rebuild_system_counters
+from app.working_days import leave_duration
 
 # Realistic leave reasons by type
 LEAVE_REASONS = {
@@ -84,38 +85,27 @@ ADMIN_COMMENTS = {
     ],
 }
 
-def get_random_date_range(start_from_days_ago=90, end_in_days=60):
-    """Generate random start and end dates"""
+def get_random_date_range(region=None, start_from_days_ago=90, end_in_days=60):
+    """Generate random start and end dates with at least one working day"""
     today = datetime.now().date()
     
-    # Random start date (can be past or future)
-    days_offset = random.randint(-start_from_days_ago, end_in_days)
-    start_date = today + timedelta(days=days_offset)
-    
-    # Random duration based on leave type
-    duration = random.choices(
-        [1, 2, 3, 5, 7, 10, 14],
-        weights=[30, 25, 20, 15, 5, 3, 2]
-    )[0]
-    
-    end_date = start_date + timedelta(days=duration - 1)
-    
-    return start_date, end_date, duration
-
-def create_leave_calendar_entries(db: Session, leave_request: LeaveRequest):
-    """Create calendar entries for each day of leave"""
-    current_date = leave_request.start_date.date() if isinstance(leave_request.start_date, datetime) else leave_request.start_date
-    end_date = leave_request.end_date.date() if isinstance(leave_request.end_date, datetime) else leave_request.end_date
-    
-    while current_date <= end_date:
-        calendar_entry = LeaveCalendar(
-            employee_id=leave_request.employee_id,
-            leave_request_id=leave_request.id,
-            leave_date=datetime.combine(current_date, datetime.min.time()),
-            leave_type=leave_request.leave_type,
-        )
-        db.add(calendar_entry)
-        current_date += timedelta(days=1)
+    while True:
+        # Random start date (can be past or future)
+        days_offset = random.randint(-start_from_days_ago, end_in_days)
+        start_date = today + timedelta(days=days_offset)
+        
+        # Random length based on leave type
+        length = random.choices(
+            [1, 2, 3, 5, 7, 10, 14],
+            weights=[30, 25, 20, 15, 5, 3, 2]
+        )[0]
+        
+        end_date = start_date + timedelta(days=length - 1)
+        
+        # Only working days in the range are charged
+        duration = leave_duration(start_date, end_date, region)
+        if duration:
+            return start_date, end_date, duration
 
 def create_audit_log(db: Session, user_id: int, action: str, description: str, details: dict, timestamp: datetime = None):
     """Create audit log entry"""
@@ -123,7 +113,7 @@ def create_audit_log(db: Session, user_id: int, action: str, description: str, d
         user_id=user_id,
         action=action,
         description=description,
-        details=str(details),
+        details=details,
         timestamp=timestamp if timestamp else datetime.now()
     )
     db.add(audit_log)
@@ -172,7 +162,7 @@ def populate_leaves(leaves_per_employee: int = 7):
                 leave_type = random.choices(leave_types, weights=weights)[0]
                 
                 # Get random dates
-                start_date, end_date, duration = get_random_date_range()
+                start_date, end_date, duration = get_random_date_range(employee.region)
                 
                 # Random reason
                 reason = random.choice(LEAVE_REASONS[leave_type])
@@ -299,12 +289,13 @@ def populate_leaves(leaves_per_employee: int = 7):
                         new_balance = max(0, current_balance - duration)
                         setattr(employee, f"{leave_type_str}_leave", new_balance)
                         
-                        # Create calendar entries
-                        create_leave_calendar_entries(db, leave_request)
+                        # Add to the calendar
+                        update_leave_calendar(db, leave_request)
                 
                 total_created += 1
                 print(f"  ✓ {leave_type.value} ({status.value}) - {start_date} to {end_date}")
         
+        rebuild_system_counters(db)
         db.commit()
         print("\n" + "=" * 80)
         print(f"✓ Successfully created {total_created} leave requests!")
@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models import User
+from app.crud import bump_versions, VERSION_USERS
 
 def reset_balances():
     """Reset all employee leave balances to default"""
@@ -48,6 +49,7 @@ def reset_balances():
                 emp.paternity_leave = 15
                 print(f"  ✓ Set male defaults: Annual=20, Sick=10, Personal=5, Emergency=5, Maternity=0, Paternity=15")
         
+        bump_versions(db, VERSION_USERS)
         db.commit()
         
         print("\n" + "=" * 80)
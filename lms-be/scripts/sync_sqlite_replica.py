@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+SQLite Replica Sync Script
+Periodically copies the primary SQLite database into a replica file so
+replica routing can be exercised locally.
+
+Usage:
+    python scripts/sync_sqlite_replica.py data/leavexact.db data/leavexact-replica.db --interval 2
+
+Then start the API with:
+    DATABASE_REPLICA_URLS='["sqlite:///./data/leavexact-replica.db"]' python run.py
+"""
+import sys
+import time
+import sqlite3
+import argparse
+from pathlib import Path
+
+
+def sync_once(primary: Path, replica: Path) -> float:
+    """Copy primary into replica with the online backup API; returns seconds taken."""
+    start = time.perf_counter()
+    with sqlite3.connect(f"file:{primary}?mode=ro", uri=True) as source, sqlite3.connect(replica) as target:
+        source.backup(target)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep a SQLite replica in sync with the primary database")
+    parser.add_argument("primary", type=Path, help="Primary database file")
+    parser.add_argument("replica", type=Path, help="Replica database file")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between syncs")
+    parser.add_argument("--once", action="store_true", help="Sync once and exit")
+    args = parser.parse_args()
+
+    if not args.primary.exists():
+        sys.exit(f"Primary database not found: {args.primary}")
+
+    print(f"Syncing {args.primary} -> {args.replica} every {args.interval}s (Ctrl+C to stop)")
+    try:
+        while True:
+            elapsed = sync_once(args.primary, args.replica)
+            print(f"  ✓ synced in {elapsed * 1000:.1f} ms")
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nStopped")
@@ -4,8 +4,9 @@ import { proxyRequest, getAuthHeader } from '@/lib/proxy';
 export async function GET(request: NextRequest) {
   try {
     const authHeader = getAuthHeader(request);
+    const { searchParams } = new URL(request.url);
     
-    const response = await proxyRequest('/api/analytics/departments', {
+    const response = await proxyRequest(`/api/analytics/departments?${searchParams.toString()}`, {
       method: 'GET',
       headers: authHeader ? { 'Authorization': authHeader } : {},
     });
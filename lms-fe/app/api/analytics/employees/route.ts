@@ -0,0 +1,24 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { proxyRequest, getAuthHeader } from '@/lib/proxy';
+
+export async function GET(request: NextRequest) {
+  try {
+    const authHeader = getAuthHeader(request);
+    const { searchParams } = new URL(request.url);
+    
+    const response = await proxyRequest(`/api/analytics/employees?${searchParams.toString()}`, {
+      method: 'GET',
+      headers: authHeader ? { 'Authorization': authHeader } : {},
+    });
+
+    const data = await response.json();
+    
+    return NextResponse.json(data, { status: response.status });
+  } catch (error) {
+    console.error('Get employees analytics proxy error:', error);
+    return NextResponse.json(
+      { detail: 'Failed to connect to backend' },
+      { status: 500 }
+    );
+  }
+}
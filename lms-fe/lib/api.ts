@@ -507,8 +507,37 @@ export const adminAPI = {
     }
     return res.json()
   },
-  getDepartmentAnalytics: async () => {
-    const res = await fetch("/api/analytics/departments", {
+  getEmployeesAnalytics: async (params?: {
+    page?: number
+    limit?: number
+    sort_by?: "approval_rate" | "days_taken" | "total_requests" | "name" | "employee_id"
+    order?: "asc" | "desc"
+    department?: string
+  }) => {
+    const queryParams = new URLSearchParams()
+    if (params?.page) queryParams.append('page', params.page.toString())
+    if (params?.limit) queryParams.append('limit', params.limit.toString())
+    if (params?.sort_by) queryParams.append('sort_by', params.sort_by)
+    if (params?.order) queryParams.append('order', params.order)
+    if (params?.department) queryParams.append('department', params.department)
+    
+    const url = `/api/analytics/employees${queryParams.toString() ? `?${queryParams}` : ''}`
+    const res = await fetch(url, {
+      headers: getAuthHeaders(),
+    })
+    if (!res.ok) {
+      const error = await res.json()
+      throw new Error(error.detail || "Failed to fetch employees analytics")
+    }
+    return res.json()
+  },
+  getDepartmentAnalytics: async (params?: { start_date?: string; end_date?: string }) => {
+    const queryParams = new URLSearchParams()
+    if (params?.start_date) queryParams.append('start_date', params.start_date)
+    if (params?.end_date) queryParams.append('end_date', params.end_date)
+    
+    const url = `/api/analytics/departments${queryParams.toString() ? `?${queryParams}` : ''}`
+    const res = await fetch(url, {
       headers: getAuthHeaders(),
     })
     if (!res.ok) {